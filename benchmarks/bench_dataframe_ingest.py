@@ -0,0 +1,68 @@
+"""
+Time ingesting a table of measurements a column at a time, against a row at a time.
+
+Run from the repository root::
+
+    python benchmarks/bench_dataframe_ingest.py [--rows N]
+
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gemd.entity.bounds import RealBounds
+from gemd.entity.object import MaterialRun
+from gemd.entity.template import ConditionTemplate, PropertyTemplate
+from gemd.ingest.dataframe import ingest_dataframe, TableColumn
+from gemd.ingest.table_example import ingest_table
+
+PRESSURE = PropertyTemplate("vapor pressure", bounds=RealBounds(0, 1e6, "Pa"))
+TEMPERATURE = ConditionTemplate("temperature", bounds=RealBounds(0, 1000, "K"))
+
+
+def make_table(rows):
+    """Make a table of vapor pressures in kPa at temperatures in Celsius."""
+    rng = np.random.RandomState(0)
+    return pd.DataFrame({
+        "vapor pressure": rng.uniform(0, 100, rows),
+        "temperature": rng.uniform(0, 200, rows)
+    })
+
+
+def timed(label, rows, func):
+    """Run a function once, and print how long it took and its throughput."""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    print("{:<32}{:10.3f} s {:14,.0f} rows / s".format(label, seconds, rows / seconds))
+    return result
+
+
+def main():
+    """Print the time and throughput of each step, and of the row-at-a-time example."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000, help="rows in the table")
+    args = parser.parse_args()
+
+    table = make_table(args.rows)
+    columns = {
+        "vapor pressure": TableColumn(PRESSURE, units="kPa"),
+        "temperature": TableColumn(TEMPERATURE, units="degC")
+    }
+    material = MaterialRun("sample")
+    result = timed("ingest_dataframe", args.rows,
+                   lambda: ingest_dataframe(table, columns, material=material))
+    timed("MeasurementColumns.as_dicts", args.rows, result.as_dicts)
+
+    # Building objects is the slow part, so time it, and the row-at-a-time example, on less
+    small = min(args.rows, 100000)
+    result = ingest_dataframe(table[:small], columns, material=MaterialRun("sample"))
+    timed("MeasurementColumns.to_runs", small, result.to_runs)
+    timed("ingest_table (row at a time)", small,
+          lambda: ingest_table(MaterialRun("sample"), table[:small]))
+
+
+if __name__ == "__main__":
+    main()
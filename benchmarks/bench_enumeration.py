@@ -0,0 +1,37 @@
+"""
+Time resolving enumerations, and constructing the objects whose setters resolve them.
+
+Run from the repository root::
+
+    python benchmarks/bench_enumeration.py [--number N]
+
+"""
+import argparse
+import timeit
+
+from gemd.entity.attribute import Property
+from gemd.entity.object import MaterialRun
+from gemd.enumeration import Origin, SampleType
+
+CASES = (
+    ("Origin.get_value('unknown')", lambda: Origin.get_value("unknown")),
+    ("Origin.get_value(Origin.COMPUTED)", lambda: Origin.get_value(Origin.COMPUTED)),
+    ("SampleType.get_enum('virtual')", lambda: SampleType.get_enum("virtual")),
+    ("Property(origin='computed')", lambda: Property("x", origin="computed")),
+    ("MaterialRun(sample_type='virtual')", lambda: MaterialRun("x", sample_type="virtual")),
+)
+
+
+def main():
+    """Print the best time per call and the throughput of each case."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="calls to time per repeat")
+    args = parser.parse_args()
+
+    for label, func in CASES:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=5)) / args.number
+        print("{:<37}{:8.2f} us {:12,.0f} / s".format(label, seconds * 1e6, 1 / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Time importing gemd modules and building the unit registry, each in a fresh interpreter.
+
+Run from the repository root::
+
+    python benchmarks/bench_import.py [--repeat N]
+
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULES = ("gemd", "gemd.json", "gemd.entity.value")
+
+_TIME_IMPORT = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+_TIME_REGISTRY = """
+import gemd.units, time
+gemd.units.set_registry_cache_dir({cache_dir!r})
+start = time.perf_counter()
+gemd.units.parse_units("kg")
+print(time.perf_counter() - start)
+"""
+
+
+def _time(code, repeat):
+    """Run code in fresh interpreters and return the median of the seconds it prints."""
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code])
+        times.append(float(output.decode("utf-8").split()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    """Print the median time of each import and of the first use of units."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="interpreters to time each in")
+    args = parser.parse_args()
+
+    for module in MODULES:
+        seconds = _time(_TIME_IMPORT.format(module=module), args.repeat)
+        print("import {:<30}{:8.1f} ms".format(module, seconds * 1000))
+
+    seconds = _time(_TIME_REGISTRY.format(cache_dir=None), args.repeat)
+    print("{:<37}{:8.1f} ms".format("first parse_units, no cache", seconds * 1000))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _time(_TIME_REGISTRY.format(cache_dir=cache_dir), 1)
+        seconds = _time(_TIME_REGISTRY.format(cache_dir=cache_dir), args.repeat)
+    print("{:<37}{:8.1f} ms".format("first parse_units, precompiled", seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
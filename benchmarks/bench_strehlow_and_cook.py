@@ -0,0 +1,54 @@
+"""
+Time each step of building and serializing the full Strehlow & Cook table.
+
+Run from the repository root::
+
+    python benchmarks/bench_strehlow_and_cook.py [--small] [--repeat N]
+
+"""
+import argparse
+import time
+
+from gemd.demo.strehlow_and_cook import FULL_TABLE, SMALL_TABLE, import_table, \
+    make_display_table, make_strehlow_objects, make_strehlow_table
+from gemd.json import GEMDJson
+
+
+def best(func, repeat):
+    """Run a function repeatedly, and return its result and its shortest time."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    """Print the shortest time of each step."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--small", action="store_true", help="use the small table instead")
+    parser.add_argument("--repeat", type=int, default=3, help="times to run each step")
+    args = parser.parse_args()
+
+    filename = SMALL_TABLE if args.small else FULL_TABLE
+    json = GEMDJson()
+    table, seconds = best(lambda: import_table(filename), args.repeat)
+    print("{:<28}{:8.3f} s  ({} rows)".format("import_table", seconds, len(table)))
+
+    compounds, seconds = best(lambda: make_strehlow_objects(table), args.repeat)
+    print("{:<28}{:8.3f} s".format("make_strehlow_objects", seconds))
+    strehlow_table, seconds = best(lambda: make_strehlow_table(compounds), args.repeat)
+    print("{:<28}{:8.3f} s".format("make_strehlow_table", seconds))
+    _, seconds = best(lambda: make_display_table(strehlow_table), args.repeat)
+    print("{:<28}{:8.3f} s".format("make_display_table", seconds))
+
+    dumped, seconds = best(lambda: json.dumps(compounds), args.repeat)
+    print("{:<28}{:8.3f} s  ({:,} characters)".format("dumps", seconds, len(dumped)))
+    for label, trusted in [("loads", False), ("loads (trusted)", True)]:
+        _, seconds = best(lambda: json.loads(dumped, trusted=trusted), args.repeat)
+        print("{:<28}{:8.3f} s".format(label, seconds))
+
+
+if __name__ == "__main__":
+    main()
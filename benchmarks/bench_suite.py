@@ -0,0 +1,249 @@
+"""
+Time the hot paths of serialization, traversal and validation, and compare them to baselines.
+
+Run from the repository root::
+
+    python benchmarks/bench_suite.py [--sizes small,medium,large] [--only TEXT]
+                                     [--repeat N] [--threshold FRACTION] [--record]
+
+The graph operations are timed on the cake (small), the full Strehlow & Cook table (medium)
+and synthetic histories (large), and the micro-benchmarks once. Each case is timed as the best
+of several repeats, and compared to the time stored for it in benchmarks/baselines.json. A
+case that got slower by more than the threshold is a regression, and any regression makes the
+exit status 1. Use --record to store the times of the cases that were run as the new
+baselines. Baselines are only comparable on a machine with the same processor, number of CPUs
+and minor version of Python as the one that recorded them, so on any other machine the times are
+reported without comparing them, and --record replaces all of the baselines and so must time
+every case.
+
+With the defaults, a run takes several minutes: substitute_objects on the large graph alone takes
+about 30 s per repeat, plus one more for calibration, so about 30 s x (1 + --repeat). Use --sizes
+and --only to time fewer cases.
+
+"""
+import argparse
+from collections import OrderedDict
+import json
+import os
+import platform
+import sys
+import timeit
+
+from gemd.demo.cake import make_cake
+from gemd.demo.strehlow_and_cook import FULL_TABLE, import_table, make_strehlow_objects
+from gemd.demo.synthetic import make_synthetic_histories
+from gemd.entity.attribute import Condition, Parameter, Property
+from gemd.entity.bounds import RealBounds
+from gemd.entity.object import IngredientRun, IngredientSpec, MaterialRun, MaterialSpec, \
+    MeasurementRun, MeasurementSpec, ProcessRun, ProcessSpec
+from gemd.entity.template import ConditionTemplate, MaterialTemplate, MeasurementTemplate, \
+    ParameterTemplate, ProcessTemplate, PropertyTemplate
+from gemd.entity.util import make_instance
+from gemd.json import GEMDJson
+from gemd.units import clear_parse_units_cache, parse_units
+from gemd.util import flatten, recursive_foreach, substitute_links, substitute_objects
+from gemd.validation import check_conformance, validate_values
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+SIZES = ("small", "medium", "large")
+
+
+def make_graph(size, large_entities):
+    """Make the material histories of a size, as a list of root material runs."""
+    if size == "small":
+        return [make_cake(seed=42)]
+    if size == "medium":
+        return make_strehlow_objects(import_table(FULL_TABLE))
+    return make_synthetic_histories(total_entities=large_entities, seed=0)
+
+
+def graph_cases(size, roots):
+    """Get the operations on a graph to time, by name."""
+    json = GEMDJson()
+    dumped = json.dumps(roots)
+    entities = []
+    recursive_foreach(roots, entities.append)
+    linked = [substitute_links(entity) for entity in entities]
+    index = {}
+    for entity in entities:
+        for scope, uid in entity.uids.items():
+            index[(scope.lower(), uid)] = entity
+
+    cases = OrderedDict()
+    cases["dumps"] = lambda: json.dumps(roots)
+    cases["loads"] = lambda: json.loads(dumped)
+    cases["loads (trusted)"] = lambda: json.loads(dumped, trusted=True)
+    cases["copy"] = lambda: json.copy(roots)
+    cases["flatten"] = lambda: flatten(roots)
+    cases["substitute_links"] = lambda: [substitute_links(entity) for entity in entities]
+    cases["substitute_objects"] = lambda: substitute_objects(linked, index)
+    cases["recursive_foreach"] = lambda: recursive_foreach(roots, lambda entity: None)
+    cases["make_instance"] = lambda: [make_instance(root.spec) for root in roots]
+    cases["validate_values"] = lambda: validate_values(roots)
+    cases["check_conformance"] = lambda: check_conformance(roots)
+    return OrderedDict(("{}/{}".format(size, name), func) for name, func in cases.items())
+
+
+def micro_cases():
+    """Get the operations on single values and objects to time, by name."""
+    kelvin = RealBounds(0, 1000, "K")
+    narrower = RealBounds(10, 100, "K")
+    celsius = RealBounds(10, 100, "degC")
+    template = PropertyTemplate("density", bounds=RealBounds(0, 100, "g/cm^3"))
+
+    def parse_uncached():
+        clear_parse_units_cache()
+        return parse_units("kg/m^3")
+
+    cases = OrderedDict()
+    cases["micro/parse_units (cached)"] = lambda: parse_units("kg/m^3")
+    cases["micro/parse_units (uncached)"] = parse_uncached
+    cases["micro/RealBounds.contains (same units)"] = lambda: kelvin.contains(narrower)
+    cases["micro/RealBounds.contains (converted)"] = lambda: kelvin.contains(celsius)
+    constructors = [
+        ("MaterialRun", lambda: MaterialRun("x")),
+        ("MaterialSpec", lambda: MaterialSpec("x")),
+        ("ProcessRun", lambda: ProcessRun("x")),
+        ("ProcessSpec", lambda: ProcessSpec("x")),
+        ("MeasurementRun", lambda: MeasurementRun("x")),
+        ("MeasurementSpec", lambda: MeasurementSpec("x")),
+        ("IngredientRun", lambda: IngredientRun()),
+        ("IngredientSpec", lambda: IngredientSpec(name="x")),
+        ("PropertyTemplate", lambda: PropertyTemplate("x", bounds=kelvin)),
+        ("ConditionTemplate", lambda: ConditionTemplate("x", bounds=kelvin)),
+        ("ParameterTemplate", lambda: ParameterTemplate("x", bounds=kelvin)),
+        ("MaterialTemplate", lambda: MaterialTemplate("x", properties=[template])),
+        ("MeasurementTemplate", lambda: MeasurementTemplate("x", properties=[template])),
+        ("ProcessTemplate", lambda: ProcessTemplate("x")),
+        ("Property", lambda: Property("x", template=template)),
+        ("Condition", lambda: Condition("x")),
+        ("Parameter", lambda: Parameter("x")),
+    ]
+    for name, func in constructors:
+        cases["micro/construct {}".format(name)] = func
+    return cases
+
+
+def best(func, repeat):
+    """Time a function, as the best time per call of several repeats of enough calls."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_seconds(seconds):
+    """Format a time with units that suit its size."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "{:8.2f} {:<2}".format(seconds / scale, unit)
+    return "{:8.2f} ns".format(seconds / 1e-9)
+
+
+def load_baselines(path):
+    """Read the stored baselines, or none if there are none yet."""
+    if not os.path.exists(path):
+        return {"machine": {}, "results": {}}
+    with open(path, "r") as fp:
+        return json.load(fp)
+
+
+def machine():
+    """Describe the machine and interpreter that times were measured with, in detail."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def same_machine(recorded, current):
+    """Check that times from two machines are comparable, ignoring patch versions and kernels."""
+    def key(description):
+        python = str(description.get("python", "")).split(".")[:2]
+        return description.get("processor"), description.get("cpus"), python
+    return key(recorded) == key(current)
+
+
+def main():
+    """Time the cases, and print a report of how they compare to the baselines."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help="comma-separated graph sizes to time (default: all)")
+    parser.add_argument("--only", default="", help="only time cases whose names contain this")
+    parser.add_argument("--no-micro", action="store_true", help="skip the micro-benchmarks")
+    parser.add_argument("--large-entities", type=int, default=20000,
+                        help="runs and specs in the large synthetic graph")
+    parser.add_argument("--repeat", type=int, default=3, help="repeats of each case")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown, as a fraction, that counts as a regression")
+    parser.add_argument("--baselines", default=BASELINES, help="the file of baselines")
+    parser.add_argument("--record", action="store_true",
+                        help="store the times as the new baselines")
+    args = parser.parse_args()
+
+    sizes = [size for size in args.sizes.split(",") if size]
+    unknown = set(sizes) - set(SIZES)
+    if unknown:
+        parser.error("unknown sizes: {}".format(", ".join(sorted(unknown))))
+
+    stored = load_baselines(args.baselines)
+    baselines = stored["results"]
+    comparable = not baselines or same_machine(stored["machine"], machine())
+    if not comparable:
+        if args.record and (args.only or args.no_micro or set(sizes) != set(SIZES)):
+            parser.error("--record on a different machine replaces all of the baselines, "
+                         "so it can't be combined with --sizes, --only or --no-micro")
+        print("Baselines were recorded on {}, not this machine; skipping the comparison.\n"
+              .format(stored["machine"]))
+
+    print("{:<44}{:>11}{:>11}{:>9}  {}".format("case", "baseline", "current", "change", ""))
+    results = OrderedDict()
+    regressions = []
+    groups = [(size, lambda size=size: graph_cases(
+        size, make_graph(size, args.large_entities))) for size in sizes]
+    if not args.no_micro:
+        groups.append(("micro", micro_cases))
+    for _, make_cases in groups:
+        cases = make_cases()
+        for name, func in cases.items():
+            if args.only not in name:
+                continue
+            seconds = best(func, args.repeat)
+            results[name] = seconds
+            baseline = baselines.get(name) if comparable else None
+            if baseline is None:
+                print("{:<44}{:>11}{:>11}".format(name, "-", format_seconds(seconds)))
+                continue
+            change = seconds / baseline - 1
+            status = ""
+            if change > args.threshold:
+                status = "REGRESSION"
+                regressions.append(name)
+            elif change < -args.threshold:
+                status = "improved"
+            print("{:<44}{:>11}{:>11}{:>+8.0%}  {}".format(
+                name, format_seconds(baseline), format_seconds(seconds), change, status))
+
+    if args.record:
+        if not comparable:
+            # Times from different machines don't belong in the same file, and every case
+            # was timed, so none are lost
+            baselines = {}
+        baselines.update(results)
+        stored = {"machine": machine(), "results": OrderedDict(sorted(baselines.items()))}
+        with open(args.baselines, "w") as fp:
+            json.dump(stored, fp, indent=2)
+            fp.write("\n")
+        print("\nRecorded {} baselines in {}".format(len(results), args.baselines))
+
+    if regressions:
+        print("\n{} regression(s) beyond {:.0%}: {}".format(
+            len(regressions), args.threshold, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""Columnar containers and tables for large, homogeneous datasets."""
+# flake8: noqa
+from .measurement_columns import MeasurementColumns, AttributeColumn
+from .table import ColumnDefinition, TableBuilder
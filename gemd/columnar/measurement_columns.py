@@ -0,0 +1,437 @@
+"""Columnar storage for many measurements of the same kind."""
+from collections import OrderedDict
+import uuid
+
+import numpy as np
+
+from gemd.entity.attribute.condition import Condition
+from gemd.entity.attribute.parameter import Parameter
+from gemd.entity.attribute.property import Property
+from gemd.entity.base_entity import BaseEntity
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object.measurement_run import MeasurementRun
+from gemd.entity.object.measurement_spec import MeasurementSpec
+from gemd.entity.template_lookup import template_keys
+from gemd.entity.value.nominal_real import NominalReal
+from gemd.entity.value.normal_real import NormalReal
+from gemd.enumeration import Origin
+from gemd.units import parse_units, conversion_plan
+
+_attribute_classes = {
+    "properties": Property,
+    "conditions": Condition,
+    "parameters": Parameter
+}
+
+# origins are stored as small integer codes into this list
+_origins = [origin.value for origin in Origin]
+_origin_codes = {value: code for code, value in enumerate(_origins)}
+
+
+def _link_dict(obj):
+    """Serialize an entity or link as a link dictionary, or pass None through."""
+    if obj is None:
+        return None
+    if isinstance(obj, BaseEntity):
+        obj = LinkByUID.from_entity(obj)
+    return obj.as_dict()
+
+
+def _same_template(first, second):
+    """Check that two attribute templates, or links to them, are the same template."""
+    if first is second:
+        return True
+    if first is None or second is None:
+        return False
+    return not set(template_keys(first)).isdisjoint(template_keys(second))
+
+
+class AttributeColumn(object):
+    """
+    One real-valued attribute of every measurement in a :class:`MeasurementColumns`.
+
+    Each value is stored as a mean and standard deviation in the column's units.
+    A standard deviation of NaN corresponds to a
+    :class:`~gemd.entity.value.nominal_real.NominalReal` and anything else to a
+    :class:`~gemd.entity.value.normal_real.NormalReal`.
+
+    Parameters
+    ----------
+    kind: str
+        Which attributes of the measurement this is one of: "properties", "conditions"
+        or "parameters".
+    name: str
+        The name of the attribute.
+    mean: array-like of float
+        The nominal value or mean of the attribute for each measurement.
+    std: array-like of float, optional
+        The standard deviation of the attribute for each measurement, NaN for nominal values.
+        Defaults to all nominal values.
+    units: str, optional
+        The units of the values. Defaults to dimensionless.
+    origin: str, Origin or array-like of those, optional
+        The origin of the attribute, either shared by all measurements or for each of them.
+        Defaults to "unknown."
+    template: AttributeTemplate or LinkByUID, optional
+        The template of the attribute.
+    present: array-like of bool, optional
+        Which measurements have this attribute. Defaults to those with a mean that is not NaN.
+
+    """
+
+    def __init__(self, kind, name, mean, std=None, units='', origin=Origin.UNKNOWN,
+                 template=None, present=None):
+        if kind not in _attribute_classes:
+            raise ValueError("kind must be one of {}: {}".format(
+                sorted(_attribute_classes), kind))
+        self.kind = kind
+        self.name = name
+        self.template = template
+        self.units = parse_units(units)
+
+        self.mean = np.asarray(mean, dtype=np.float64)
+        if std is None:
+            self.std = np.full(self.mean.shape, np.nan)
+        else:
+            self.std = np.asarray(std, dtype=np.float64)
+        if isinstance(origin, (str, Origin)):
+            codes = np.full(self.mean.shape, _origin_codes[Origin.get_value(origin)])
+        else:
+            codes = [_origin_codes[Origin.get_value(x)] for x in origin]
+        self.origin = np.asarray(codes, dtype=np.uint8)
+        if present is None:
+            self.present = ~np.isnan(self.mean)
+        else:
+            self.present = np.asarray(present, dtype=bool)
+
+        if not (self.mean.shape == self.std.shape == self.origin.shape == self.present.shape):
+            raise ValueError(
+                "All of the arrays in column '{}' must be the same shape".format(name))
+        if self.mean.ndim != 1:
+            raise ValueError("Column '{}' must be one-dimensional".format(name))
+
+    def __len__(self):
+        return len(self.mean)
+
+    @property
+    def origins(self):
+        """Get the origin of each measurement's attribute, as strings."""
+        return [_origins[code] for code in self.origin.tolist()]
+
+    def value(self, i):
+        """
+        Get the value for one measurement.
+
+        Parameters
+        ----------
+        i: int
+            The index of the measurement.
+
+        Returns
+        -------
+        NominalReal, NormalReal or None
+            The value of this attribute for measurement `i`, or None if it isn't present.
+
+        """
+        if not self.present[i]:
+            return None
+        mean = float(self.mean[i])
+        std = float(self.std[i])
+        if std != std:  # NaN
+            return NominalReal(nominal=mean, units=self.units)
+        return NormalReal(mean=mean, std=std, units=self.units)
+
+
+class MeasurementColumns(object):
+    """
+    Columnar storage for many measurement runs that share a template.
+
+    Rather than holding a :class:`~gemd.entity.object.measurement_run.MeasurementRun` per
+    measurement, each with a list of attribute objects wrapping value objects, every real-valued
+    attribute is held in an :class:`AttributeColumn` of NumPy arrays, so analytics over the whole
+    dataset can be vectorized.
+    Per-measurement metadata (names, uids, tags, notes, materials and sources) are held in lists.
+
+    Requires numpy.
+
+    Parameters
+    ----------
+    size: int
+        The number of measurements.
+    spec: MeasurementSpec or LinkByUID, optional
+        The spec shared by all of the measurements.
+    template: MeasurementTemplate or LinkByUID, optional
+        The template of the measurements. Defaults to the spec's template.
+
+    """
+
+    def __init__(self, size, spec=None, template=None):
+        self.size = size
+        self.spec = spec
+        if template is None and isinstance(spec, MeasurementSpec):
+            template = spec.template
+        self.template = template
+
+        self.names = [None] * size
+        self.uids = [{} for _ in range(size)]
+        self.tags = [[] for _ in range(size)]
+        self.notes = [None] * size
+        self.materials = [None] * size
+        self.sources = [None] * size
+
+        self._columns = OrderedDict()
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def columns(self):
+        """Get all of the attribute columns, in the order they were added."""
+        return list(self._columns.values())
+
+    def add_column(self, kind, name, mean, std=None, units='', origin=Origin.UNKNOWN,
+                   template=None, present=None):
+        """
+        Add an attribute to every measurement.
+
+        If no template is given, the matching attribute template from this object's
+        measurement template is used, if there is one.
+        See :class:`AttributeColumn` for a description of the arguments.
+
+        Returns
+        -------
+        AttributeColumn
+            The new column.
+
+        """
+        if (kind, name) in self._columns:
+            raise ValueError("There is already a column for {} '{}'".format(kind, name))
+        if template is None:
+            template = self._attribute_template(kind, name)
+        column = AttributeColumn(kind, name, mean, std=std, units=units, origin=origin,
+                                 template=template, present=present)
+        if len(column) != self.size:
+            raise ValueError("Column '{}' has {} rows, but there are {} measurements".format(
+                name, len(column), self.size))
+        self._columns[(kind, name)] = column
+        return column
+
+    def column(self, name, kind=None):
+        """
+        Get an attribute column by name or attribute template.
+
+        Parameters
+        ----------
+        name: str, AttributeTemplate or LinkByUID
+            The name of the attribute, or its template or a link to its template. Templates
+            are matched by their unique identifiers as well as by identity, so an equal copy
+            of a template, such as one that was loaded again, finds its column.
+        kind: str, optional
+            "properties", "conditions" or "parameters", if the name is ambiguous.
+
+        Returns
+        -------
+        AttributeColumn
+            The matching column.
+
+        """
+        if isinstance(name, (BaseEntity, LinkByUID)):
+            keys = set(template_keys(name))
+            matches = [col for col in self._columns.values() if col.template is not None]
+            matches = [col for col in matches if not keys.isdisjoint(template_keys(col.template))]
+        else:
+            matches = [col for (col_kind, col_name), col in self._columns.items()
+                       if col_name == name and kind in (None, col_kind)]
+        if len(matches) != 1:
+            raise KeyError("Expected exactly one column for {}, found {}".format(
+                name, len(matches)))
+        return matches[0]
+
+    def _attribute_template(self, kind, name):
+        """Find the attribute template with a given name in the measurement template."""
+        if not isinstance(self.template, BaseEntity):
+            return None
+        for attr_template, _ in getattr(self.template, kind):
+            if getattr(attr_template, "name", None) == name:
+                return attr_template
+        return None
+
+    @classmethod
+    def from_runs(cls, runs):
+        """
+        Build columns from measurement runs.
+
+        All of the runs must share a spec, and all of their attributes must be
+        :class:`~gemd.entity.value.nominal_real.NominalReal` or
+        :class:`~gemd.entity.value.normal_real.NormalReal` values without notes or file links.
+        Attributes of the same kind and name form a column, and must have the same template.
+        Values are converted to the units of the first value in their column.
+
+        Parameters
+        ----------
+        runs: List[MeasurementRun]
+            The measurement runs.
+
+        Returns
+        -------
+        MeasurementColumns
+            The measurements in columnar form.
+
+        """
+        runs = list(runs)
+        spec = runs[0].spec if runs else None
+        if any(run.spec is not spec and run.spec != spec for run in runs):
+            raise ValueError("All of the measurement runs must share a spec")
+        result = cls(len(runs), spec=spec)
+
+        cells = OrderedDict()
+        for i, run in enumerate(runs):
+            if run.file_links:
+                raise ValueError("File links on measurement runs are not supported")
+            result.names[i] = run.name
+            result.uids[i] = dict(run.uids)
+            result.tags[i] = list(run.tags)
+            result.notes[i] = run.notes
+            result.materials[i] = run.material
+            result.sources[i] = run.source
+            for kind in _attribute_classes:
+                for attr in getattr(run, kind):
+                    if attr.notes is not None or attr.file_links:
+                        raise ValueError(
+                            "Notes and file links on attributes are not supported")
+                    if not isinstance(attr.value, (NominalReal, NormalReal)):
+                        raise ValueError("Only real values can be stored in columns, "
+                                         "not {}".format(type(attr.value).__name__))
+                    key = (kind, attr.name)
+                    if key in cells and i in cells[key]["rows"]:
+                        raise ValueError("Measurement run '{}' has more than one {} named "
+                                         "'{}'".format(run.name, kind, attr.name))
+                    cell = cells.setdefault(key, {"template": attr.template, "rows": {}})
+                    if not _same_template(cell["template"], attr.template):
+                        raise ValueError("The {} named '{}' have different templates, so they "
+                                         "can't share a column".format(kind, attr.name))
+                    cell["rows"][i] = attr
+
+        for (kind, name), cell in cells.items():
+            mean = np.full(len(runs), np.nan)
+            std = np.full(len(runs), np.nan)
+            origin = [Origin.UNKNOWN] * len(runs)
+            present = np.zeros(len(runs), dtype=bool)
+            column_units = None
+            for i, attr in cell["rows"].items():
+                value = attr.value
+                if column_units is None:
+                    column_units = value.units
+                if isinstance(value, NormalReal):
+                    mean[i], std[i] = value.mean, value.std
+                else:
+                    mean[i] = value.nominal
+                if value.units != column_units:
+                    scale, offset = conversion_plan(value.units, column_units)
+                    # a spread only scales, even between affine units such as degC and degF
+                    mean[i], std[i] = scale * mean[i] + offset, scale * std[i]
+                origin[i] = attr.origin
+                present[i] = True
+            result.add_column(kind, name, mean, std=std, units=column_units, origin=origin,
+                              template=cell["template"], present=present)
+        return result
+
+    def to_runs(self):
+        """
+        Build a measurement run for each measurement.
+
+        Returns
+        -------
+        List[MeasurementRun]
+            The measurement runs, in order.
+
+        """
+        # Pull each column out of numpy once, rather than one element at a time
+        columns = [(column, column.mean.tolist(), column.std.tolist(), column.origins,
+                    column.present.tolist()) for column in self._columns.values()]
+        runs = []
+        for i in range(self.size):
+            attributes = {kind: [] for kind in _attribute_classes}
+            for column, mean, std, origins, present in columns:
+                if not present[i]:
+                    continue
+                if std[i] != std[i]:  # NaN
+                    value = NominalReal(nominal=mean[i], units=column.units)
+                else:
+                    value = NormalReal(mean=mean[i], std=std[i], units=column.units)
+                attributes[column.kind].append(
+                    _attribute_classes[column.kind](name=column.name,
+                                                    template=column.template,
+                                                    origin=origins[i],
+                                                    value=value))
+            runs.append(MeasurementRun(name=self.names[i], spec=self.spec,
+                                       material=self.materials[i],
+                                       uids=dict(self.uids[i]), tags=list(self.tags[i]),
+                                       notes=self.notes[i], source=self.sources[i],
+                                       **attributes))
+        return runs
+
+    def as_dicts(self):
+        """
+        Serialize every measurement directly into its thin GEMD JSON form.
+
+        The result for each measurement is the same as ``json.loads(thin_dumps(run))`` for the
+        equivalent measurement run, but no gemd objects are built along the way.
+        Any measurement without a uid is assigned one.
+
+        Returns
+        -------
+        List[dict]
+            One dictionary per measurement, with links in place of references to other entities.
+
+        """
+        spec = _link_dict(self.spec)
+        columns = []
+        for column in self._columns.values():
+            columns.append((
+                column,
+                _link_dict(column.template),
+                column.mean.tolist(),
+                column.std.tolist(),
+                column.origins,
+                column.present.tolist()
+            ))
+
+        result = []
+        for i in range(self.size):
+            if not self.uids[i]:
+                self.uids[i] = {"auto": str(uuid.uuid4())}
+            attributes = {kind: [] for kind in _attribute_classes}
+            for column, template, mean, std, origins, present in columns:
+                if not present[i]:
+                    continue
+                if std[i] != std[i]:  # NaN
+                    value = {"nominal": mean[i], "type": NominalReal.typ, "units": column.units}
+                else:
+                    value = {"mean": mean[i], "std": std[i], "type": NormalReal.typ,
+                             "units": column.units}
+                attributes[column.kind].append({
+                    "file_links": [],
+                    "name": column.name,
+                    "notes": None,
+                    "origin": origins[i],
+                    "template": template,
+                    "type": _attribute_classes[column.kind].typ,
+                    "value": value
+                })
+            source = self.sources[i]
+            result.append({
+                "conditions": attributes["conditions"],
+                "file_links": [],
+                "material": _link_dict(self.materials[i]),
+                "name": self.names[i],
+                "notes": self.notes[i],
+                "parameters": attributes["parameters"],
+                "properties": attributes["properties"],
+                "source": source.as_dict() if source is not None else None,
+                "spec": spec,
+                "tags": list(self.tags[i]),
+                "type": MeasurementRun.typ,
+                "uids": dict(self.uids[i])
+            })
+        return result
@@ -0,0 +1,331 @@
+"""Turn material histories into tables, with a column for each attribute of interest."""
+from collections import OrderedDict
+from math import sqrt
+import re
+
+import numpy as np
+
+from gemd.entity.base_entity import BaseEntity
+from gemd.entity.bounds.categorical_bounds import CategoricalBounds
+from gemd.entity.bounds.composition_bounds import CompositionBounds
+from gemd.entity.bounds.integer_bounds import IntegerBounds
+from gemd.entity.bounds.real_bounds import RealBounds
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import IngredientRun, IngredientSpec, MaterialRun, MaterialSpec, \
+    MeasurementRun, MeasurementSpec, ProcessRun, ProcessSpec
+from gemd.entity.object.has_attributes import HasAttributes
+from gemd.entity.value import DiscreteCategorical, EmpiricalFormula, NominalCategorical, \
+    NominalComposition, NominalInteger, NominalReal, NormalReal, UniformInteger, UniformReal
+from gemd.units import IncompatibleUnitsError, UndefinedUnitError, UNIT_PARSE_ERRORS, \
+    convert_array, parse_units
+
+# The type of object that each step of a path goes to, from each type of object
+_STEPS = {
+    (MaterialRun, "process"): ProcessRun,
+    (MaterialRun, "spec"): MaterialSpec,
+    (MaterialRun, "measurements"): MeasurementRun,
+    (ProcessRun, "spec"): ProcessSpec,
+    (ProcessRun, "ingredients"): IngredientRun,
+    (IngredientRun, "material"): MaterialRun,
+    (IngredientRun, "spec"): IngredientSpec,
+    (MeasurementRun, "spec"): MeasurementSpec,
+    (MaterialSpec, "process"): ProcessSpec,
+    (ProcessSpec, "ingredients"): IngredientSpec,
+    (IngredientSpec, "material"): MaterialSpec
+}
+
+# The steps that pick one of a list of objects by name
+_NAMED_STEPS = {"measurements", "ingredients"}
+
+_STEP = re.compile(r"\s*(\w+)\s*(?:\[([^\]]*)\])?\s*(/|$)")
+
+
+def _mean(value):
+    """Get the nominal value, mean or midpoint of a value, and its units."""
+    typ = type(value)
+    if typ is NominalReal:
+        return value.nominal, value.units
+    if typ is NormalReal:
+        return value.mean, value.units
+    if typ is UniformReal:
+        return 0.5 * (value.lower_bound + value.upper_bound), value.units
+    if typ is NominalInteger:
+        return value.nominal, ''
+    if typ is UniformInteger:
+        return 0.5 * (value.lower_bound + value.upper_bound), ''
+    return None
+
+
+def _std(value):
+    """Get the standard deviation of a value with a distribution, and its units."""
+    typ = type(value)
+    if typ is NormalReal:
+        return value.std, value.units
+    if typ is UniformReal:
+        return (value.upper_bound - value.lower_bound) / sqrt(12), value.units
+    if typ is UniformInteger:
+        count = value.upper_bound - value.lower_bound + 1
+        return sqrt((count * count - 1) / 12.0), ''
+    return None
+
+
+def _category(value):
+    """Get the category of a categorical value, or its most likely category."""
+    typ = type(value)
+    if typ is NominalCategorical:
+        return value.category
+    if typ is DiscreteCategorical and value.probabilities:
+        return max(value.probabilities, key=value.probabilities.get)
+    return None
+
+
+def _formula(value):
+    """Get the formula of a compositional value."""
+    typ = type(value)
+    if typ is EmpiricalFormula:
+        return value.formula
+    if typ is NominalComposition:
+        return "".join("{}{:g}".format(component, quantity)
+                       for component, quantity in sorted(value.quantities.items()))
+    return None
+
+
+# How each statistic is taken of a value, and the bounds of the templates that it applies to
+_STATISTICS = {
+    "mean": (_mean, (RealBounds, IntegerBounds)),
+    "std": (_std, (RealBounds, IntegerBounds)),
+    "category": (_category, (CategoricalBounds,)),
+    "formula": (_formula, (CompositionBounds,))
+}
+
+# The statistics that are numbers with units, rather than strings
+_REAL_STATISTICS = {"mean", "std"}
+
+
+class ColumnDefinition(object):
+    """
+    A column of a table of material histories: a statistic of one attribute along one path.
+
+    Parameters
+    ----------
+    key: str, AttributeTemplate or LinkByUID
+        The attribute, by name, template or link to its template, as taken by
+        :meth:`~gemd.entity.object.has_attributes.HasAttributes.get_attribute`.
+    path: str, optional
+        The way from the root material run of each history to the object with the attribute,
+        as steps separated by slashes. A step is one of "process", "spec", "material",
+        ``measurements[<name>]`` or ``ingredients[<name>]``, the last two picking the first
+        measurement or ingredient with that name. For example,
+        ``"process/ingredients[Flour]/material/measurements[Density]"``.
+        Defaults to the spec of the root material run.
+    statistic: str, optional
+        What to take of the value of the attribute: "mean" (the nominal value, mean or
+        midpoint), "std" (the standard deviation), "category" (the category, or the most
+        likely one) or "formula". Defaults to "mean".
+    units: str, optional
+        The units of a mean or standard deviation. Defaults to the units of the bounds of
+        the template, and must be given if the attribute isn't keyed by a template.
+    name: str, optional
+        The name of the column. Defaults to the name of the attribute and the statistic.
+
+    """
+
+    def __init__(self, key, path="spec", statistic="mean", units=None, name=None):
+        if statistic not in _STATISTICS:
+            raise ValueError("statistic must be one of {}: {}".format(
+                sorted(_STATISTICS), statistic))
+        if not isinstance(key, (str, BaseEntity, LinkByUID)):
+            raise TypeError("An attribute is keyed by name, template or link, "
+                            "not {}".format(type(key).__name__))
+        self.key = key
+        self.path = path
+        self.statistic = statistic
+        self.units = units
+        if name is None:
+            if isinstance(key, str):
+                name = key
+            elif isinstance(key, LinkByUID):
+                name = key.id
+            else:
+                name = key.name
+            name = "{} ({})".format(name, statistic)
+        self.name = name
+
+
+class TableBuilder(object):
+    """
+    Build a table from material histories, with a row per history and a column per definition.
+
+    The column definitions are compiled once: their paths are parsed and checked against the
+    types of object along them, their statistics against the bounds of their templates, and
+    columns that share a path are grouped so that each history walks each path only once.
+    Attributes are found through the index of each object (see
+    :meth:`~gemd.entity.object.has_attributes.HasAttributes.get_attribute`), and means and
+    standard deviations are converted to the units of their columns an array at a time.
+
+    Parameters
+    ----------
+    columns: List[ColumnDefinition]
+        The columns of the table, in order. Their names must be unique.
+
+    Raises
+    ------
+    ValueError
+        If a path or statistic doesn't fit, or the units of a column can't be determined or
+        aren't recognized.
+
+    """
+
+    def __init__(self, columns):
+        columns = list(columns)
+        names = [column.name for column in columns]
+        if len(set(names)) != len(names):
+            raise ValueError("Column names must be unique: {}".format(names))
+        self.columns = columns
+        self._units = [_column_units(column) for column in columns]
+        self._paths = OrderedDict()
+        for index, column in enumerate(columns):
+            self._paths.setdefault(_compile_path(column.path), []).append(index)
+
+    def build(self, materials):
+        """
+        Evaluate the columns across material histories.
+
+        The histories are evaluated in this process, one after another.
+
+        Parameters
+        ----------
+        materials: List[MaterialRun]
+            The root material run of each history, which is a row of the table.
+
+        Returns
+        -------
+        OrderedDict[str, numpy.ndarray]
+            The values of each column, by name. Means and standard deviations are floats in the
+            units of the column, and categories and formulas are objects. Missing values,
+            including values that the statistic doesn't apply to, are NaN or None.
+
+        Raises
+        ------
+        ValueError
+            If the units of a value can't be converted to the units of its column.
+
+        """
+        cells = [[] for _ in self.columns]
+        for material in materials:
+            for path, indices in self._paths.items():
+                obj = _walk(material, path)
+                for index in indices:
+                    column = self.columns[index]
+                    attribute = obj.get_attribute(column.key) if obj is not None else None
+                    if attribute is None or attribute.value is None:
+                        cells[index].append(None)
+                    else:
+                        cells[index].append(_STATISTICS[column.statistic][0](attribute.value))
+
+        table = OrderedDict()
+        for index, column in enumerate(self.columns):
+            table[column.name] = self._column_array(index, cells[index])
+        return table
+
+    def build_dataframe(self, materials):
+        """
+        Evaluate the columns across material histories into a DataFrame.
+
+        Takes the same arguments as :meth:`build`. Requires pandas.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A row per history and a column per definition.
+
+        """
+        import pandas as pd
+        table = self.build(materials)
+        return pd.DataFrame(table, columns=list(table))
+
+    def _column_array(self, index, cells):
+        """Turn the cells of a column into an array, converting magnitudes to its units."""
+        column = self.columns[index]
+        if column.statistic not in _REAL_STATISTICS:
+            result = np.empty(len(cells), dtype=object)
+            result[:] = cells
+            return result
+
+        result = np.full(len(cells), np.nan)
+        rows_by_units = {}
+        for row, cell in enumerate(cells):
+            if cell is not None:
+                rows_by_units.setdefault(cell[1], []).append(row)
+        for units, rows in rows_by_units.items():
+            magnitudes = [cells[row][0] for row in rows]
+            try:
+                result[rows] = convert_array(magnitudes, units, self._units[index],
+                                             difference=column.statistic == "std")
+            except (IncompatibleUnitsError, UndefinedUnitError):
+                raise ValueError("Column '{}' has values in units '{}', which can't be "
+                                 "converted to '{}'".format(column.name, units,
+                                                            self._units[index]))
+        return result
+
+
+def _compile_path(path):
+    """Parse a path into its steps, checking that each step goes somewhere."""
+    steps = []
+    typ = MaterialRun
+    position = 0
+    while position < len(path):
+        match = _STEP.match(path, position)
+        if match is None:
+            raise ValueError("Couldn't parse path '{}' at position {}".format(path, position))
+        field, name, _ = match.groups()
+        target = _STEPS.get((typ, field))
+        if target is None:
+            raise ValueError("A {} in path '{}' has no step '{}'".format(
+                typ.__name__, path, field))
+        if (field in _NAMED_STEPS) != (name is not None):
+            raise ValueError("Step '{}' in path '{}' {} a name in brackets".format(
+                field, path, "needs" if field in _NAMED_STEPS else "can't have"))
+        steps.append((field, name))
+        typ = target
+        position = match.end()
+    if not issubclass(typ, HasAttributes):
+        raise ValueError("Path '{}' ends at a {}, which has no attributes".format(
+            path, typ.__name__))
+    return tuple(steps)
+
+
+def _column_units(column):
+    """Work out the units that the values of a column are converted to."""
+    bounds = getattr(column.key, "bounds", None)
+    if bounds is not None and not isinstance(bounds, _STATISTICS[column.statistic][1]):
+        raise ValueError("Statistic '{}' of column '{}' doesn't apply to {}".format(
+            column.statistic, column.name, type(bounds).__name__))
+    if column.units is not None:
+        try:
+            parse_units(column.units)
+        except UNIT_PARSE_ERRORS as err:
+            raise ValueError("The units '{}' of column '{}' aren't recognized: {}".format(
+                column.units, column.name, err))
+        return column.units
+    if column.statistic not in _REAL_STATISTICS:
+        return None
+    if isinstance(bounds, RealBounds):
+        return bounds.default_units
+    if isinstance(bounds, IntegerBounds):
+        return ''
+    raise ValueError("The units of column '{}' must be given, since it isn't keyed by a "
+                     "template with bounds".format(column.name))
+
+
+def _walk(obj, path):
+    """Follow a path from a material run, to the object at its end or None if it is missing."""
+    for field, name in path:
+        if not isinstance(obj, BaseEntity):
+            # A link, or a step that wasn't there
+            return None
+        obj = getattr(obj, field)
+        if name is not None:
+            obj = next((item for item in obj
+                        if isinstance(item, BaseEntity) and item.name == name), None)
+    return obj if isinstance(obj, HasAttributes) else None
@@ -0,0 +1,176 @@
+"""Tests of columnar measurement storage."""
+import json
+
+import numpy as np
+import pytest
+
+from gemd.columnar import MeasurementColumns, AttributeColumn
+from gemd.entity.attribute import Property, Condition, Parameter
+from gemd.entity.bounds import RealBounds
+from gemd.entity.file_link import FileLink
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import MaterialRun, MeasurementRun, MeasurementSpec
+from gemd.entity.source.performed_source import PerformedSource
+from gemd.entity.template import MeasurementTemplate, PropertyTemplate, ConditionTemplate
+from gemd.entity.value import NominalReal, NormalReal, NominalInteger
+from gemd.enumeration import Origin
+from gemd.json import GEMDJson
+
+
+def _make_runs():
+    """Make a few measurements that share a spec."""
+    density = PropertyTemplate("density", bounds=RealBounds(0, 100, "g/cm^3"))
+    temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 1000, "K"))
+    spec = MeasurementSpec("density measurement", template=MeasurementTemplate(
+        "density", properties=[density], conditions=[temperature]))
+    material = MaterialRun("sample", uids={"id": "sample"})
+
+    runs = []
+    for i in range(3):
+        run = MeasurementRun("run {}".format(i), spec=spec, material=material,
+                             uids={"id": str(i)}, tags=["tag"], notes="notes",
+                             source=PerformedSource(performed_by="me"))
+        run.properties.append(Property("density", template=density, origin="measured",
+                                       value=NormalReal(1.0 + i, 0.1, "g/cm^3")))
+        if i != 1:
+            run.conditions.append(Condition("temperature", template=temperature,
+                                            value=NominalReal(300.0 + i, "K")))
+        runs.append(run)
+    # A different unit is converted to that of the column
+    runs[2].conditions[0].value = NominalReal(30.0, "degC")
+    runs[2].properties[0].value = NormalReal(3000.0, 100.0, "kg/m^3")
+    runs[2].parameters.append(Parameter("speed", value=NominalReal(3, "m/s")))
+    return runs
+
+
+def test_round_trip():
+    """Test that measurement runs survive conversion to and from columns."""
+    runs = _make_runs()
+    columns = MeasurementColumns.from_runs(runs)
+    assert len(columns) == 3
+    assert len(columns.columns) == 3
+
+    density = columns.column("density")
+    assert density is columns.column(runs[0].properties[0].template)
+    # Templates are also found by their uids, as copies of them or links to them
+    template = runs[0].properties[0].template
+    template.add_uid("id", "density")
+    assert columns.column(GEMDJson().copy(template)) is density
+    assert columns.column(LinkByUID("ID", "density")) is density
+    with pytest.raises(KeyError):
+        columns.column(LinkByUID("id", "temperature"))
+    np.testing.assert_allclose(density.mean, [1.0, 2.0, 3.0])
+    np.testing.assert_allclose(density.std, [0.1, 0.1, 0.1])
+    assert density.origins == ["measured"] * 3
+
+    temperature = columns.column("temperature", kind="conditions")
+    assert temperature.present.tolist() == [True, False, True]
+    np.testing.assert_allclose(temperature.mean[[0, 2]], [300.0, 303.15])
+
+    copies = columns.to_runs()
+    assert [run.name for run in copies] == [run.name for run in runs]
+    assert copies[0].properties[0].value == runs[0].properties[0].value
+    assert copies[2].properties[0].value.units == "gram / centimeter ** 3"
+    assert copies[0].conditions[0].template is runs[0].conditions[0].template
+    assert copies[1].conditions == []
+    assert copies[2].parameters[0].value == NominalReal(3, "m/s")
+    assert copies[0].material is runs[0].material
+    assert runs[0].material.measurements[-1] is copies[-1]
+
+
+def test_as_dicts():
+    """Test that direct serialization matches serializing measurement runs."""
+    columns = MeasurementColumns.from_runs(_make_runs())
+    expected = [json.loads(GEMDJson().thin_dumps(run)) for run in columns.to_runs()]
+    assert columns.as_dicts() == expected
+
+    # uids are assigned if they are missing
+    columns.uids[0] = {}
+    assert "auto" in columns.as_dicts()[0]["uids"]
+
+
+def test_build_columns():
+    """Test building columns directly from arrays."""
+    temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 1000, "K"))
+    template = MeasurementTemplate("thermal", conditions=[temperature])
+    spec = MeasurementSpec("thermal", template=template)
+    columns = MeasurementColumns(4, spec=spec)
+    assert columns.template is template
+
+    column = columns.add_column("conditions", "temperature", [1, 2, np.nan, 4], units="K",
+                                origin=["measured", Origin.COMPUTED, "unknown", "measured"])
+    assert column.template is temperature
+    assert column.present.tolist() == [True, True, False, True]
+    assert column.origins[1] == "computed"
+    assert column.value(0) == NominalReal(1.0, "K") and column.value(2) is None
+    assert AttributeColumn("properties", "x", [1.0], std=[0.5]).value(0).std == 0.5
+    assert columns.add_column("properties", "unknown", np.zeros(4)).template is None
+
+    runs = columns.to_runs()
+    assert runs[0].conditions[0].value == NominalReal(1.0, "K")
+    assert runs[2].conditions == []
+
+    with pytest.raises(ValueError):
+        columns.add_column("conditions", "temperature", np.zeros(4))
+    with pytest.raises(ValueError):
+        columns.add_column("conditions", "pressure", np.zeros(3))
+    with pytest.raises(KeyError):
+        columns.column("nothing")
+
+    # No template to look up attribute templates in
+    assert MeasurementColumns(1).add_column("properties", "x", [1]).template is None
+
+
+def test_invalid_columns():
+    """Test that malformed columns are rejected."""
+    with pytest.raises(ValueError):
+        AttributeColumn("metadata", "x", [1.0])
+    with pytest.raises(ValueError):
+        AttributeColumn("properties", "x", [1.0, 2.0], std=[1.0])
+    with pytest.raises(ValueError):
+        AttributeColumn("properties", "x", [[1.0]])
+
+
+def test_unsupported_runs():
+    """Test that measurement runs that can't be represented as columns are rejected."""
+    runs = _make_runs()
+    runs[1].spec = MeasurementSpec("another spec")
+    with pytest.raises(ValueError):
+        MeasurementColumns.from_runs(runs)
+
+    runs = _make_runs()
+    runs[0].file_links = [FileLink("file", "url")]
+    with pytest.raises(ValueError):
+        MeasurementColumns.from_runs(runs)
+
+    runs = _make_runs()
+    runs[0].properties[0].notes = "A note"
+    with pytest.raises(ValueError):
+        MeasurementColumns.from_runs(runs)
+
+    runs = _make_runs()
+    runs[0].properties.append(Property("count", value=NominalInteger(1)))
+    with pytest.raises(ValueError):
+        MeasurementColumns.from_runs(runs)
+
+    runs = _make_runs()
+    runs[0].properties.append(Property("density", template=runs[0].properties[0].template,
+                                       value=NominalReal(1, "g/cm^3")))
+    with pytest.raises(ValueError, match="more than one"):
+        MeasurementColumns.from_runs(runs)
+
+    # Attributes with the same name but different templates don't share a column
+    runs = _make_runs()
+    runs[1].properties[0].template = PropertyTemplate("density", bounds=RealBounds(0, 1, ""))
+    with pytest.raises(ValueError, match="different templates"):
+        MeasurementColumns.from_runs(runs)
+    runs[1].properties[0].template = None
+    with pytest.raises(ValueError, match="different templates"):
+        MeasurementColumns.from_runs(runs)
+    # but a link to the same template does
+    runs[0].properties[0].template.add_uid("id", "density")
+    runs[1].properties[0].template = LinkByUID("id", "density")
+    assert MeasurementColumns.from_runs(runs).column("density").template \
+        is runs[0].properties[0].template
+
+    assert len(MeasurementColumns.from_runs([])) == 0
@@ -0,0 +1,177 @@
+"""Test building tables from material histories."""
+import numpy as np
+import pytest
+
+from gemd.columnar.table import ColumnDefinition, TableBuilder
+from gemd.demo.cake import make_cake
+from gemd.entity.attribute import Condition, Parameter, Property, PropertyAndConditions
+from gemd.entity.bounds import CategoricalBounds, CompositionBounds, IntegerBounds, RealBounds
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import IngredientRun, IngredientSpec, MaterialRun, MaterialSpec, \
+    MeasurementRun, ProcessRun
+from gemd.entity.template import ConditionTemplate, ParameterTemplate, PropertyTemplate
+from gemd.entity.value import DiscreteCategorical, EmpiricalFormula, NominalCategorical, \
+    NominalComposition, NominalInteger, NominalReal, NormalReal, UniformInteger, UniformReal
+
+density_template = PropertyTemplate("Density", bounds=RealBounds(0, 100, "g/cm^3"))
+temperature_template = ConditionTemplate("Temperature", bounds=RealBounds(0, 1000, "K"))
+color_template = PropertyTemplate("Color", bounds=CategoricalBounds(["red", "blue"]))
+count_template = ParameterTemplate("Count", bounds=IntegerBounds(0, 10))
+formula_template = PropertyTemplate("Formula", bounds=CompositionBounds(["Si", "O"]))
+
+
+def _history(density, temperature=None, color=None, count=None, formula=None, name="sample"):
+    """Make a material made from an ingredient, which has a measurement of its density."""
+    ingredient_material = MaterialRun("powder")
+    measurement = MeasurementRun("Density", material=ingredient_material,
+                                 properties=[Property("Density", value=density,
+                                                      template=density_template)])
+    if temperature is not None:
+        measurement.conditions.append(Condition("Temperature", value=temperature,
+                                                template=temperature_template))
+    if color is not None:
+        measurement.properties.append(Property("Color", value=color, template=color_template))
+
+    process = ProcessRun("pressing")
+    if count is not None:
+        process.parameters.append(Parameter("Count", value=count, template=count_template))
+    IngredientRun(material=ingredient_material, process=process,
+                  spec=IngredientSpec(name="powder input"))
+
+    spec = MaterialSpec(name)
+    if formula is not None:
+        spec.properties.append(PropertyAndConditions(
+            property=Property("Formula", value=formula, template=formula_template)))
+    return MaterialRun(name, spec=spec, process=process)
+
+
+measured = "process/ingredients[powder input]/material/measurements[Density]"
+
+
+def test_statistics():
+    """Test each statistic of each kind of value, with unit conversion and missing values."""
+    histories = [
+        _history(NominalReal(1.5, "g/cm^3"), temperature=NominalReal(25, "degC"),
+                 color=NominalCategorical("red"), count=NominalInteger(3),
+                 formula=EmpiricalFormula("SiO2")),
+        _history(NormalReal(1000, 100, "kg/m^3"), temperature=NormalReal(300, 2, "K"),
+                 color=DiscreteCategorical({"red": 0.25, "blue": 0.75}),
+                 count=UniformInteger(1, 3), formula=NominalComposition({"Si": 1, "O": 2})),
+        _history(UniformReal(1, 2, "g/cm^3"), color=DiscreteCategorical(),
+                 count=NominalInteger(1)),
+        _history(None, temperature=NominalCategorical("hot"))
+    ]
+    builder = TableBuilder([
+        ColumnDefinition(density_template, path=measured),
+        ColumnDefinition(density_template, path=measured, statistic="std"),
+        ColumnDefinition(temperature_template, path=measured, units="degC"),
+        ColumnDefinition(temperature_template, path=measured, statistic="std", units="mK"),
+        ColumnDefinition("Color", path=measured, statistic="category"),
+        ColumnDefinition(count_template, path="process"),
+        ColumnDefinition(count_template, path="process", statistic="std", name="spread"),
+        ColumnDefinition(formula_template, statistic="formula")
+    ])
+    table = builder.build(histories)
+
+    assert list(table) == ["Density (mean)", "Density (std)", "Temperature (mean)",
+                           "Temperature (std)", "Color (category)", "Count (mean)", "spread",
+                           "Formula (formula)"]
+    np.testing.assert_allclose(table["Density (mean)"], [1.5, 1.0, 1.5, np.nan])
+    np.testing.assert_allclose(table["Density (std)"], [np.nan, 0.1, 1 / np.sqrt(12), np.nan])
+    np.testing.assert_allclose(table["Temperature (mean)"], [25, 26.85, np.nan, np.nan])
+    np.testing.assert_allclose(table["Temperature (std)"], [np.nan, 2000, np.nan, np.nan])
+    assert list(table["Color (category)"]) == ["red", "blue", None, None]
+    np.testing.assert_allclose(table["Count (mean)"], [3, 2, 1, np.nan])
+    np.testing.assert_allclose(table["spread"], [np.nan, np.sqrt(8 / 12), np.nan, np.nan])
+    assert list(table["Formula (formula)"]) == ["SiO2", "O2Si1", None, None]
+
+    # Histories are independent, so tables of parts of them put together are the same
+    parts = [builder.build(histories[:1]), builder.build(histories[1:3]),
+             builder.build(histories[3:])]
+    for name, values in table.items():
+        joined = np.concatenate([part[name] for part in parts])
+        assert joined.dtype == values.dtype
+        if values.dtype == object:
+            assert list(joined) == list(values)
+        else:
+            np.testing.assert_allclose(joined, values)
+
+    frame = builder.build_dataframe(histories)
+    assert list(frame.columns) == list(table)
+    assert frame.shape == (4, 8)
+
+
+def test_missing_objects():
+    """Test that paths through links and missing objects give missing values."""
+    linked = MaterialRun("linked", process=LinkByUID("id", "process"))
+    unmeasured = _history(NominalReal(1, "g/cm^3"))
+    unmeasured.process.ingredients[0].material.measurements[0].material = None
+    builder = TableBuilder([ColumnDefinition(density_template, path=measured),
+                            ColumnDefinition(count_template, path="process"),
+                            ColumnDefinition("Density", path=measured, statistic="formula")])
+    table = builder.build([linked, unmeasured, _history(NominalReal(2, "g/cm^3"))])
+    np.testing.assert_allclose(table["Density (mean)"], [np.nan, np.nan, 2])
+    np.testing.assert_allclose(table["Count (mean)"], [np.nan, np.nan, np.nan])
+    # A statistic that doesn't apply to a value is missing
+    assert list(table["Density (formula)"]) == [None, None, None]
+
+    # Unresolved links among ingredients and measurements are skipped
+    linked_items = _history(NominalReal(3, "g/cm^3"))
+    linked_items.process.ingredients.insert(0, LinkByUID("id", "ingredient"))
+    linked_items.process.ingredients[1].material.measurements.insert(
+        0, LinkByUID("id", "measurement"))
+    only_links = MaterialRun("only links", process=ProcessRun("pressing"))
+    only_links.process.ingredients.append(LinkByUID("id", "ingredient"))
+    table = builder.build([linked_items, only_links])
+    np.testing.assert_allclose(table["Density (mean)"], [3, np.nan])
+
+    empty = builder.build([])
+    assert empty["Density (mean)"].shape == (0,)
+    assert TableBuilder([ColumnDefinition("Color", path=measured, statistic="category")]) \
+        .build([])["Color (category)"].dtype == object
+
+
+def test_cake():
+    """Test a table of a few columns from deep in the cake's history."""
+    cake = make_cake()
+    baked = "process/ingredients[Baked Cake input]/material"
+    builder = TableBuilder([
+        ColumnDefinition("Cooking time", path=baked + "/process", units="minute"),
+        ColumnDefinition("Toothpick test", path=baked + "/measurements[Baking doneness]",
+                         statistic="category"),
+        ColumnDefinition("Tastiness", path="measurements[Final Taste]", units=""),
+        ColumnDefinition("Tastiness", path="spec/process", units="", name="Planned taste")
+    ])
+    table = builder.build([cake, cake])
+    assert table["Cooking time (mean)"][0] > 0
+    assert list(table["Toothpick test (category)"]) == ["crumbs"] * 2
+    assert table["Tastiness (mean)"][0] > 0
+    assert np.isnan(table["Planned taste"][0])
+
+
+def test_invalid_columns():
+    """Test that columns that don't fit are rejected when they are compiled."""
+    with pytest.raises(ValueError):
+        ColumnDefinition("Density", statistic="median")
+    with pytest.raises(TypeError):
+        ColumnDefinition(1.0)
+    with pytest.raises(ValueError):
+        TableBuilder([ColumnDefinition(density_template, path=measured)] * 2)
+    with pytest.raises(ValueError):
+        TableBuilder([ColumnDefinition("Density", path=measured)])
+    with pytest.raises(ValueError):
+        TableBuilder([ColumnDefinition(density_template, path=measured, statistic="category")])
+    for path in ["", "process/ingredients[powder input]", "process/material",
+                 "measurements", "spec[name]", "process//spec", "spec/+"]:
+        with pytest.raises(ValueError):
+            TableBuilder([ColumnDefinition(density_template, path=path)])
+
+    builder = TableBuilder([ColumnDefinition(density_template, path=measured)])
+    with pytest.raises(ValueError, match="can't be converted"):
+        builder.build([_history(NominalReal(1, "K"))])
+    assert ColumnDefinition(LinkByUID("id", "density"), units="").name == "density (mean)"
+
+    # Units are parsed when the table builder is made, rather than when it is built
+    for bad_units in ("bogus", "kg/", "((m", "1/0"):
+        with pytest.raises(ValueError, match="aren't recognized"):
+            TableBuilder([ColumnDefinition(density_template, path=measured, units=bad_units)])
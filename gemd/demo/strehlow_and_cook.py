@@ -1,9 +1,10 @@
 """Demo representing Strehlow & Cook bandgap data with data concepts."""
-from gemd.entity.util import make_instance
-
 from gemd.entity.object.process_spec import ProcessSpec
+from gemd.entity.object.process_run import ProcessRun
 from gemd.entity.object.material_spec import MaterialSpec
+from gemd.entity.object.material_run import MaterialRun
 from gemd.entity.object.measurement_spec import MeasurementSpec
+from gemd.entity.object.measurement_run import MeasurementRun
 
 from gemd.entity.template.process_template import ProcessTemplate
 from gemd.entity.template.material_template import MaterialTemplate
@@ -189,9 +190,72 @@ def make_templates(template_scope=DEMO_TEMPLATE_SCOPE):
     return tmpl
 
 
+# 2 categories in the PIF need to be split to avoid repeat Attribute Templates in a Run
+_SPLIT_NAMES = {
+    'Phase': 'Crystal system',
+    'Transition': 'Bands'
+}
+
+_ORIGINS = {
+    'EXPERIMENTAL': Origin.MEASURED,
+    'COMPUTATIONAL': Origin.COMPUTED
+}
+
+
+def _real_value(prop):
+    """Mapping method for RealBounds."""
+    scalar = prop['scalars'][0]
+    if 'uncertainty' in scalar:
+        return NormalReal(mean=float(scalar['value']),
+                          units=prop['units'],
+                          std=float(scalar['uncertainty'])
+                          )
+    return NominalReal(nominal=float(scalar['value']),
+                       units=prop['units']
+                       )
+
+
+def _categorical_value(prop):
+    """Mapping method for CategoricalBounds."""
+    return NominalCategorical(category=prop['scalars'][0]['value'])
+
+
+def _attribute_builders(tmpl):
+    """
+    Work out how to build the attribute for each template name, once for the whole table.
+
+    :param tmpl: the templates from make_templates
+    :return: a dict from template name to (whether it's a property, attribute class, template,
+        value mapper)
+    """
+    value_mappers = {
+        RealBounds: _real_value,
+        CategoricalBounds: _categorical_value
+    }
+    attribute_classes = {
+        PropertyTemplate: Property,
+        ConditionTemplate: Condition
+    }
+    builders = dict()
+    for name, template in tmpl.items():
+        if type(template) in attribute_classes and type(template.bounds) in value_mappers:
+            builders[name] = (type(template) is PropertyTemplate,
+                              attribute_classes[type(template)],
+                              template,
+                              value_mappers[type(template.bounds)])
+    return builders
+
+
 def make_strehlow_objects(table=None, template_scope=DEMO_TEMPLATE_SCOPE):
-    """Make a table with Strehlow & Cook data."""
+    """
+    Make a table with Strehlow & Cook data.
+
+    The way to build each attribute is looked up once per template rather than once per cell,
+    and each run is constructed with all of its attributes at once, which keeps building the
+    full table fast; see benchmarks/bench_strehlow_and_cook.py.
+    """
     tmpl = make_templates(template_scope)
+    builders = _attribute_builders(tmpl)
 
     if table is None:
         table = import_table()
@@ -201,97 +265,79 @@ def make_strehlow_objects(table=None, template_scope=DEMO_TEMPLATE_SCOPE):
                                template=tmpl["Band gap measurement"]
                                )
 
-    def real_mapper(prop):
-        """Mapping methods for RealBounds."""
-        if 'uncertainty' in prop['scalars'][0]:
-            val = NormalReal(mean=float(prop['scalars'][0]['value']),
-                             units=prop['units'],
-                             std=float(prop['scalars'][0]['uncertainty'])
-                             )
-        else:
-            val = NominalReal(nominal=float(prop['scalars'][0]['value']),
-                              units=prop['units']
-                              )
-        return val
-
-    content_map = {
-        RealBounds: real_mapper,
-        CategoricalBounds: lambda prop: NominalCategorical(category=prop['scalars'][0]['value']),
-        type(None): lambda bnd: 'Label'
-    }
-
     datapoints = []
     compounds = dict()
     for row in table:
         formula = formula_clean(row['chemicalFormula'])
-        if formula not in compounds:
-            compounds[formula] = MaterialSpec(
+        spec = compounds.get(formula)
+        if spec is None:
+            spec = MaterialSpec(
                 name=formula_latex(formula),
                 template=tmpl["Chemical"],
                 process=ProcessSpec(name="Sample preparation",
                                     template=tmpl["Sample preparation"]
                                     ))
-        spec = compounds[formula]
-        run = make_instance(spec)
-        datapoints.append(run)
-
-        if not spec.properties:
-            spec.properties.append(
+            formula_template = spec.template.properties[0][0]
+            spec.properties = [
                 PropertyAndConditions(
-                    property=Property(name=spec.template.properties[0][0].name,
+                    property=Property(name=formula_template.name,
                                       value=EmpiricalFormula(formula=formula),
-                                      template=spec.template.properties[0][0])
-                ))
-
-        msr = make_instance(msr_spec)
-        msr.material = run
-
-        # 2 categories in the PIF need to be split to avoid repeat Attribute Templates in a Run
-        name_map = {
-            'Phase': 'Crystal system',
-            'Transition': 'Bands'
-        }
-        origin_map = {
-            'EXPERIMENTAL': Origin.MEASURED,
-            'COMPUTATIONAL': Origin.COMPUTED
-        }
+                                      template=formula_template)
+                )]
+            compounds[formula] = spec
+
+        # The same runs that make_instance(spec) would make
+        run = MaterialRun(name=spec.name,
+                          spec=spec,
+                          process=ProcessRun(name=spec.process.name, spec=spec.process)
+                          )
+        datapoints.append(run)
+
+        properties = []
+        conditions = []
         seen = set()  # Some conditions come in from multiple properties on the same object
         for prop in row['properties']:
-            origin = origin_map.get(prop.get('dataType', None), Origin.UNKNOWN)
+            origin = _ORIGINS.get(prop.get('dataType', None), Origin.UNKNOWN)
             if 'method' in prop:
                 method = 'Method: ' + prop['method']['name']
             else:
                 method = 'Method: unreported'
             for attr in [prop] + prop.get('conditions', []):
-                if attr['name'] in seen:
+                name = attr['name']
+                if name in seen:
                     # Early return if it's a repeat
                     continue
-                seen.add(attr['name'])
+                seen.add(name)
 
-                template = tmpl[attr['name']]
                 # Figure out if we need to split this column
-                if attr['name'] in name_map:
-                    value = attr['scalars'][0]['value']
-                    if value not in template.bounds.categories:
-                        template = tmpl[name_map[attr['name']]]
-
-                # Move into GEMD structure
-                if type(template) == PropertyTemplate:
-                    msr.properties.append(
-                        Property(name=template.name,
-                                 template=template,
-                                 value=content_map[type(template.bounds)](attr),
-                                 origin=origin,
-                                 notes=method
-                                 ))
-                elif type(template) == ConditionTemplate:
-                    msr.conditions.append(
-                        Condition(name=template.name,
-                                  template=template,
-                                  value=content_map[type(template.bounds)](attr),
-                                  origin=origin,
-                                  notes=method
-                                  ))
+                if name in _SPLIT_NAMES:
+                    if attr['scalars'][0]['value'] not in tmpl[name].bounds.categories:
+                        name = _SPLIT_NAMES[name]
+
+                # Move into GEMD structure, skipping known templates that have no builder
+                builder = builders.get(name)
+                if builder is None:
+                    if name not in tmpl:
+                        raise KeyError(name)
+                    continue
+                is_property, attribute_class, template, value_mapper = builder
+                attribute = attribute_class(name=template.name,
+                                            template=template,
+                                            value=value_mapper(attr),
+                                            origin=origin,
+                                            notes=method
+                                            )
+                if is_property:
+                    properties.append(attribute)
+                else:
+                    conditions.append(attribute)
+
+        MeasurementRun(name=msr_spec.name,
+                       spec=msr_spec,
+                       material=run,
+                       properties=properties,
+                       conditions=conditions
+                       )
 
     return datapoints
 
@@ -362,17 +408,17 @@ def make_strehlow_table(compounds):
 
     for comp in compounds:
         row = [comp.spec.name]
-        x = list(filter(lambda y: y.name == chem_tmpl.name, comp.spec.properties))
-        if x:
-            row.append(x[0].value)
+        x = comp.spec.get_attribute(chem_tmpl.name)
+        if x is not None:
+            row.append(x.value)
         else:
             row.append(None)
 
+        measurement = comp.measurements[0]
         for term in terms:
-            x = list(filter(lambda y: y.name == term,
-                            comp.measurements[0].properties + comp.measurements[0].conditions))
-            if x:
-                row.append(x[0].value)
+            x = measurement.get_attribute(term)
+            if x is not None:
+                row.append(x.value)
             else:
                 row.append(None)
 
@@ -0,0 +1,286 @@
+"""Generate synthetic material histories of any size from the cake templates."""
+import gc
+import random
+
+from gemd.demo.cake import DEMO_SCOPE, make_cake_templates
+from gemd.entity.attribute import Condition, Parameter, Property, PropertyAndConditions
+from gemd.entity.bounds import CategoricalBounds, CompositionBounds, IntegerBounds, RealBounds
+from gemd.entity.object import ProcessSpec, ProcessRun, MaterialSpec, MaterialRun, \
+    MeasurementSpec, MeasurementRun, IngredientSpec, IngredientRun
+from gemd.entity.template import MeasurementTemplate
+from gemd.entity.value import NominalInteger, NominalReal, NormalReal, NominalCategorical, \
+    NominalComposition, EmpiricalFormula
+from gemd.enumeration.origin import Origin
+
+SYNTHETIC_SCOPE = DEMO_SCOPE + '-synthetic'
+
+# The attributes of the synthetic measurements cycle through these templates
+_MEASURED = [
+    ("properties", "Tastiness"),
+    ("conditions", "Sample Mass"),
+    ("properties", "Toothpick test"),
+    ("parameters", "Expected Sample Mass"),
+    ("properties", "Color"),
+    ("conditions", "Cooking time"),
+    ("properties", "Chemical Formula"),
+    ("conditions", "Oven temperature"),
+    ("properties", "Nutritional Information"),
+    ("parameters", "Oven temperature setting")
+]
+
+_ATTRIBUTE_CLASSES = {
+    "properties": Property,
+    "conditions": Condition,
+    "parameters": Parameter
+}
+
+_FORMULAS = ["NaCl", "C12H22O11", "H2O", "NaHCO3", "C6H12O6", "CaCO3"]
+
+
+def make_synthetic_templates(tmpl=None):
+    """
+    Add a template for the synthetic measurements to the cake templates.
+
+    :param tmpl: the templates from make_cake_templates, which are made if not given
+    :return: the templates, with a "Synthetic Analysis" that allows every measured attribute
+    """
+    if tmpl is None:
+        tmpl = make_cake_templates()
+    if "Synthetic Analysis" not in tmpl:
+        kinds = {kind: [tmpl[key] for measured_kind, key in _MEASURED if measured_kind == kind]
+                 for kind in _ATTRIBUTE_CLASSES}
+        tmpl["Synthetic Analysis"] = MeasurementTemplate(
+            name="Synthetic analysis",
+            description="A test of whatever a synthetic material needs testing for",
+            **kinds
+        )
+        tmpl["Synthetic Analysis"].add_uid(DEMO_SCOPE + "-template", "Synthetic Analysis")
+    return tmpl
+
+
+def synthetic_history_size(depth=2, branching=3, measurements_per_material=1):
+    """
+    Count the objects in synthetic material histories of a given shape.
+
+    :param depth: the number of levels of processing between the raw materials and the root
+    :param branching: the number of ingredients of each process that isn't a procurement
+    :param measurements_per_material: the number of measurements of each material
+    :return: a tuple of the number of runs in each history and the number of specs that all of
+        the histories share
+    """
+    materials = sum(branching ** level for level in range(depth + 1))
+    runs = materials * (3 + measurements_per_material) - 1
+    specs = 3 * materials - 1 + measurements_per_material
+    return runs, specs
+
+
+def make_synthetic_histories(num_histories=1, depth=2, branching=3, measurements_per_material=1,
+                             attributes_per_measurement=3, total_entities=None, seed=None,
+                             tmpl=None):
+    """
+    Make synthetic material histories, as a standard workload of a chosen size.
+
+    Each history is a tree of materials. The root is a dessert, baked from `branching`
+    intermediates, each mixed from `branching` more, down to raw materials that are bought,
+    `depth` levels below the root. Every material has `measurements_per_material`
+    measurements, whose attributes cycle through the cake's attribute templates with random
+    values in bounds. The specs are shared by all histories, as a recipe would be, and each
+    history has its own runs. Every object has a unique id in the SYNTHETIC_SCOPE scope, and
+    the same arguments always make the same histories.
+
+    :param num_histories: the number of histories to make
+    :param depth: the number of levels of processing between the raw materials and the root
+    :param branching: the number of ingredients of each process that isn't a procurement
+    :param measurements_per_material: the number of measurements of each material
+    :param attributes_per_measurement: the number of attributes of each measurement
+    :param total_entities: if given, make as many histories as fit in this many runs and specs,
+        in place of num_histories, but at least one; see synthetic_history_size
+    :param seed: the seed of the random values
+    :param tmpl: the templates from make_synthetic_templates, which are made if not given
+    :return: the root material run of each history
+    """
+    if depth < 1 or branching < 1:
+        raise ValueError("depth and branching must be positive: {}, {}".format(depth, branching))
+    if measurements_per_material < 0 or attributes_per_measurement < 0:
+        raise ValueError("There can't be a negative number of measurements or attributes")
+    if total_entities is not None:
+        runs, specs = synthetic_history_size(depth, branching, measurements_per_material)
+        num_histories = max(1, (total_entities - specs) // runs)
+
+    rng = random.Random(seed)
+    tmpl = make_synthetic_templates(tmpl)
+    nodes, measurement_specs = _make_synthetic_specs(tmpl, depth, branching,
+                                                     measurements_per_material)
+    measured = [(kind, tmpl[key], _value_maker(key, tmpl[key].bounds)) for kind, key in _MEASURED]
+
+    # Nothing made here is garbage, so collecting while millions of objects are made is wasted
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return _make_runs(nodes, measurement_specs, measured, tmpl["Oven temperature"],
+                          num_histories, attributes_per_measurement, rng)
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _make_runs(nodes, measurement_specs, measured, oven, num_histories,
+               attributes_per_measurement, rng):
+    """Make the runs of each history, from the specs of each material in the tree."""
+    uid_count = 0
+    histories = []
+    for _ in range(num_histories):
+        processes = []
+        for parent, material_spec, ingredient_spec in nodes:
+            uid_count += 1
+            process = ProcessRun(name=material_spec.process.name,
+                                 spec=material_spec.process,
+                                 uids={SYNTHETIC_SCOPE: str(uid_count)}
+                                 )
+            uid_count += 1
+            material = MaterialRun(name=material_spec.name,
+                                   spec=material_spec,
+                                   process=process,
+                                   uids={SYNTHETIC_SCOPE: str(uid_count)}
+                                   )
+            processes.append(process)
+            if parent is None:
+                process.conditions.append(Condition(
+                    name=oven.name,
+                    template=oven,
+                    origin=Origin.MEASURED,
+                    value=NominalReal(nominal=round(rng.gauss(350, 5), 1), units='degF')))
+                histories.append(material)
+            else:
+                uid_count += 1
+                IngredientRun(material=material,
+                              process=processes[parent],
+                              spec=ingredient_spec,
+                              mass_fraction=NormalReal(
+                                  mean=ingredient_spec.mass_fraction.nominal * rng.uniform(
+                                      0.95, 1.05),
+                                  std=0.01,
+                                  units=''),
+                              uids={SYNTHETIC_SCOPE: str(uid_count)}
+                              )
+
+            for number, measurement_spec in enumerate(measurement_specs):
+                attributes = {kind: [] for kind in _ATTRIBUTE_CLASSES}
+                for position in range(attributes_per_measurement):
+                    cycle, offset = divmod(number + position, len(measured))
+                    kind, template, make_value = measured[offset]
+                    name = template.name
+                    if cycle:
+                        # Repeats of an attribute are numbered
+                        name = "{} {}".format(name, cycle + 1)
+                    attributes[kind].append(_ATTRIBUTE_CLASSES[kind](
+                        name=name,
+                        template=template,
+                        origin=Origin.MEASURED,
+                        value=make_value(rng)))
+                uid_count += 1
+                MeasurementRun(name=measurement_spec.name,
+                               spec=measurement_spec,
+                               material=material,
+                               uids={SYNTHETIC_SCOPE: str(uid_count)},
+                               **attributes
+                               )
+    return histories
+
+
+def _make_synthetic_specs(tmpl, depth, branching, measurements_per_material):
+    """
+    Make the specs that every synthetic history shares.
+
+    :return: a list with a tuple of the index of the parent, the material spec and the
+        ingredient spec of each material, breadth first from the root, and a list of the
+        measurement specs of each material
+    """
+    dessert = MaterialSpec(
+        name="Abstract Synthetic Dessert",
+        template=tmpl["Dessert"],
+        process=ProcessSpec(
+            name="Baking Synthetic Dessert, in General",
+            template=tmpl["Baking in an oven"],
+            parameters=[Parameter(name="Oven temperature setting",
+                                  template=tmpl["Oven temperature setting"],
+                                  origin=Origin.SPECIFIED,
+                                  value=NominalReal(nominal=350, units='degF'))]
+        ),
+        properties=[PropertyAndConditions(Property(name="Tastiness",
+                                                   template=tmpl["Tastiness"],
+                                                   origin=Origin.SPECIFIED,
+                                                   value=NominalInteger(7)))]
+    )
+    nodes = [(None, dessert, None)]
+    # The position of each material in the tree, such as "2.1" for the first ingredient of
+    # the second ingredient of the root
+    paths = [""]
+    labels = tmpl["Mixing"].allowed_labels
+    levels = [[0]]
+    for level in range(1, depth + 1):
+        levels.append([])
+        for parent in levels[level - 1]:
+            parent_spec = nodes[parent][1]
+            for child in range(branching):
+                path = "{}{}".format(paths[parent] + "." if parent else "", child + 1)
+                if level < depth:
+                    material_spec = MaterialSpec(
+                        name="Abstract Intermediate {}".format(path),
+                        template=tmpl["Generic Material"],
+                        process=ProcessSpec(name="Mixing Intermediate {}".format(path),
+                                            template=tmpl["Mixing"])
+                    )
+                else:
+                    material_spec = MaterialSpec(
+                        name="Abstract Raw Material {}".format(path),
+                        template=tmpl["Generic Material"],
+                        process=ProcessSpec(name="Buying Raw Material {}".format(path),
+                                            template=tmpl["Procurement"])
+                    )
+                label = "precursor" if parent == 0 else labels[child % len(labels)]
+                ingredient_spec = IngredientSpec(
+                    name="{} input".format(material_spec.name.replace("Abstract ", "")),
+                    material=material_spec,
+                    process=parent_spec.process,
+                    labels=[label],
+                    mass_fraction=NominalReal(nominal=1.0 / branching, units='')
+                )
+                levels[level].append(len(nodes))
+                nodes.append((parent, material_spec, ingredient_spec))
+                paths.append(path)
+
+    measurement_specs = [MeasurementSpec(name="Synthetic analysis {}".format(number + 1),
+                                         template=tmpl["Synthetic Analysis"])
+                         for number in range(measurements_per_material)]
+
+    for index, (_, material_spec, ingredient_spec) in enumerate(nodes):
+        material_spec.add_uid(SYNTHETIC_SCOPE, "material spec {}".format(index))
+        material_spec.process.add_uid(SYNTHETIC_SCOPE, "process spec {}".format(index))
+        if ingredient_spec is not None:
+            ingredient_spec.add_uid(SYNTHETIC_SCOPE, "ingredient spec {}".format(index))
+    for measurement_spec in measurement_specs:
+        measurement_spec.add_uid(SYNTHETIC_SCOPE, measurement_spec.name)
+    return nodes, measurement_specs
+
+
+def _value_maker(key, bounds):
+    """Get a function of a random number generator that makes a value within some bounds."""
+    if isinstance(bounds, RealBounds):
+        low = bounds.lower_bound + 0.25 * (bounds.upper_bound - bounds.lower_bound)
+        high = bounds.lower_bound + 0.75 * (bounds.upper_bound - bounds.lower_bound)
+        std = 0.01 * (bounds.upper_bound - bounds.lower_bound)
+        return lambda rng: NormalReal(mean=round(rng.uniform(low, high), 3), std=std,
+                                      units=bounds.default_units)
+    if isinstance(bounds, IntegerBounds):
+        return lambda rng: NominalInteger(rng.randint(bounds.lower_bound, bounds.upper_bound))
+    if isinstance(bounds, CategoricalBounds):
+        categories = sorted(bounds.categories)
+        return lambda rng: NominalCategorical(rng.choice(categories))
+    if isinstance(bounds, CompositionBounds) and key == "Chemical Formula":
+        return lambda rng: EmpiricalFormula(rng.choice(_FORMULAS))
+    if isinstance(bounds, CompositionBounds):
+        components = sorted(bounds.components)
+        return lambda rng: NominalComposition({component: round(rng.uniform(0, 10), 2)
+                                               for component in rng.sample(components, 3)})
+    raise TypeError("No synthetic values within {}".format(type(bounds).__name__))
@@ -3,15 +3,16 @@ from gemd.json import dumps, load
 from gemd.demo.measurement_example import make_demo_measurements
 
 
-def test_measurement_example():
+def test_measurement_example(tmp_path):
     """Simple driver to populate flex_measurements.json and validate that it has contents."""
     num_measurements = 4
     results = make_demo_measurements(num_measurements, extra_tags={"demo"})
 
-    with open("flex_measurements.json", "w") as f:
+    path = tmp_path / "flex_measurements.json"
+    with open(str(path), "w") as f:
         f.write(dumps(results, indent=2))
 
-    with open("flex_measurements.json", "r") as f:
+    with open(str(path), "r") as f:
         copy = load(f)
 
     assert len(copy) == len(results)
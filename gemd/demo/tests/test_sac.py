@@ -1,6 +1,11 @@
 """Test Strehlow & Cook demo."""
+import copy
+
+import pytest
+
 from gemd.demo.strehlow_and_cook import make_strehlow_table, make_strehlow_objects, \
     minimal_subset, import_table
+from gemd.entity.util import make_instance
 import gemd.json as je
 import json
 
@@ -31,3 +36,31 @@ def test_sac():
 
     # Verify that the serialization trick for mocking a structured table works
     json.dumps(json.loads(je.dumps(sac_tbl))["object"], indent=2)
+
+
+def test_sac_runs_match_instances():
+    """Each material run has the same shape as one made by make_instance from its spec."""
+    for run in make_strehlow_objects(import_table()):
+        instance = make_instance(run.spec)
+        assert run.name == instance.name
+        assert run.process.name == instance.process.name
+        assert run.process.spec is run.spec.process
+        assert len(run.measurements) == 1
+        measurement = run.measurements[0]
+        assert measurement.spec.name == measurement.name == "Band gap"
+        assert measurement.material is run
+        assert measurement.properties
+
+
+def test_sac_skips_attributes_without_builders():
+    """Attributes whose templates can't be built from a record are left off, not an error."""
+    row = copy.deepcopy(import_table()[0])
+    row["properties"].append({"name": "Formula", "scalars": [{"value": "LiF"}]})
+    run, = make_strehlow_objects([row])
+    names = [attribute.name for attribute in run.measurements[0].properties]
+    assert "Band gap" in names and "Formula" not in names
+
+    # but attributes without a template are
+    row["properties"].append({"name": "Hardness", "scalars": [{"value": 3}]})
+    with pytest.raises(KeyError):
+        make_strehlow_objects([row])
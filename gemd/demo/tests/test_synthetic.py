@@ -0,0 +1,75 @@
+"""Test the synthetic data generator."""
+from collections import Counter
+
+import pytest
+
+from gemd.demo.synthetic import make_synthetic_histories, make_synthetic_templates, \
+    synthetic_history_size
+from gemd.entity.object import MaterialRun, MeasurementRun
+from gemd.entity.template.attribute_template import AttributeTemplate
+from gemd.json import dumps, loads
+from gemd.util import recursive_foreach
+from gemd.validation import check_conformance, validate_values
+
+
+def test_shape():
+    """Test that the histories have the shape and size that were asked for."""
+    histories = make_synthetic_histories(3, depth=2, branching=2, measurements_per_material=2,
+                                         attributes_per_measurement=12, seed=1)
+    assert len(histories) == 3
+    assert all(isinstance(history, MaterialRun) for history in histories)
+
+    entities = []
+    recursive_foreach(histories, entities.append)
+    names = [type(entity).__name__ for entity in entities]
+    counts = Counter("run" if name.endswith("Run") else "spec" if name.endswith("Spec")
+                     else "template" for name in names)
+    runs, specs = synthetic_history_size(depth=2, branching=2, measurements_per_material=2)
+    assert counts["run"] == 3 * runs
+    assert counts["spec"] == specs
+
+    root = histories[0]
+    assert [ingredient.labels for ingredient in root.process.ingredients] == \
+        [["precursor"], ["precursor"]]
+    leaf = root.process.ingredients[1].material.process.ingredients[0].material
+    assert leaf.name == "Abstract Raw Material 2.1"
+    assert leaf.process.template.name == "Procurement"
+    assert leaf.process.ingredients == []
+
+    measurement = root.measurements[1]
+    assert isinstance(measurement, MeasurementRun)
+    attributes = measurement.properties + measurement.conditions + measurement.parameters
+    assert len(attributes) == 12
+    assert measurement.get_attribute("Sample Mass 2") is not None
+
+    # Every object has a unique id of its own
+    uids = [uid for entity in entities if not isinstance(entity, AttributeTemplate)
+            for uid in entity.uids.items()]
+    assert len(uids) == len(set(uids))
+
+
+def test_valid_and_reproducible():
+    """Test that the histories conform to their templates and depend only on the seed."""
+    tmpl = make_synthetic_templates()
+    histories = make_synthetic_histories(2, measurements_per_material=3, seed=7, tmpl=tmpl)
+    assert not validate_values(histories)
+    assert not check_conformance(histories)
+
+    again = make_synthetic_histories(2, measurements_per_material=3, seed=7)
+    assert dumps(again) == dumps(histories)
+    other = make_synthetic_histories(2, measurements_per_material=3, seed=8, tmpl=tmpl)
+    assert dumps(other) != dumps(histories)
+
+    copy = loads(dumps(histories[0]))
+    assert copy == histories[0]
+
+
+def test_total_entities():
+    """Test sizing the workload by its total number of runs and specs."""
+    runs, specs = synthetic_history_size(depth=3, branching=3)
+    assert len(make_synthetic_histories(total_entities=specs + 10 * runs + 1, depth=3)) == 10
+    assert len(make_synthetic_histories(total_entities=1, depth=3)) == 1
+    with pytest.raises(ValueError):
+        make_synthetic_histories(depth=0)
+    with pytest.raises(ValueError):
+        make_synthetic_histories(attributes_per_measurement=-1)
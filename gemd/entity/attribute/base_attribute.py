@@ -31,6 +31,8 @@ class BaseAttribute(DictSerializable):
 
     """
 
+    _trusted_lists = {"file_links": (FileLink, None)}
+
     def __init__(self, name=None, template=None, origin="unknown", value=None, notes=None,
                  file_links=None):
         if name is None:
@@ -21,6 +21,8 @@ class PropertyAndConditions(DictSerializable):
 
     typ = "property_and_conditions"
 
+    _trusted_lists = {"conditions": (Condition, None)}
+
     def __init__(self, property=None, conditions=None):
         self._property = None
         self.property = property
@@ -1,6 +1,8 @@
 """Base class for all entities."""
+from collections.abc import Mapping
+
 from gemd.entity.dict_serializable import DictSerializable
-from gemd.entity.case_insensitive_dict import CaseInsensitiveDict
+from gemd.entity.case_insensitive_dict import CompactCaseInsensitiveDict
 
 
 class BaseEntity(DictSerializable):
@@ -22,6 +24,8 @@ class BaseEntity(DictSerializable):
 
     typ = "base"
 
+    _trusted_setters = ("uids",)
+
     def __init__(self, uids, tags):
         self._tags = None
         self.tags = tags
@@ -51,11 +55,13 @@ class BaseEntity(DictSerializable):
     @uids.setter
     def uids(self, uids):
         if uids is None:
-            self._uids = CaseInsensitiveDict()
-        elif isinstance(uids, dict):
-            self._uids = CaseInsensitiveDict(**uids)
+            self._uids = CompactCaseInsensitiveDict()
+        elif isinstance(uids, CompactCaseInsensitiveDict):
+            self._uids = uids.copy()
+        elif isinstance(uids, Mapping):
+            self._uids = CompactCaseInsensitiveDict(uids)
         else:
-            self._uids = CaseInsensitiveDict(**{uids[0]: uids[1]})
+            self._uids = CompactCaseInsensitiveDict(((uids[0], uids[1]),))
 
     def add_uid(self, scope, uid):
         """
@@ -16,6 +16,8 @@ class CategoricalBounds(BaseBounds):
 
     typ = "categorical_bounds"
 
+    _trusted_setters = ("categories",)
+
     def __init__(self, categories=None):
         self._categories = None
         self.categories = categories
@@ -16,6 +16,8 @@ class CompositionBounds(BaseBounds):
 
     typ = "composition_bounds"
 
+    _trusted_setters = ("components",)
+
     def __init__(self, components=None):
         self._components = None
         self.components = components
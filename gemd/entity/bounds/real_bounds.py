@@ -21,8 +21,16 @@ class RealBounds(BaseBounds):
 
     typ = "real_bounds"
 
+    # Kept out of the instance __dict__ so that it isn't serialized
+    __slots__ = ("_converted",)
+
     def __init__(self, lower_bound=None, upper_bound=None, default_units=None):
+        # Endpoints converted to other units, or (None, None) if the units are incompatible
+        self._converted = {}
+
+        self._lower_bound = None
         self.lower_bound = lower_bound
+        self._upper_bound = None
         self.upper_bound = upper_bound
 
         self._default_units = None
@@ -37,6 +45,29 @@ class RealBounds(BaseBounds):
         if self.upper_bound < self.lower_bound:
             raise ValueError("Upper bound must be greater than or equal to lower bound")
 
+    def _init_trusted(self):
+        self._converted = {}
+
+    @property
+    def lower_bound(self):
+        """Get the lower endpoint."""
+        return self._lower_bound
+
+    @lower_bound.setter
+    def lower_bound(self, lower_bound):
+        self._lower_bound = lower_bound
+        self._converted.clear()
+
+    @property
+    def upper_bound(self):
+        """Get the upper endpoint."""
+        return self._upper_bound
+
+    @upper_bound.setter
+    def upper_bound(self, upper_bound):
+        self._upper_bound = upper_bound
+        self._converted.clear()
+
     @property
     def default_units(self):
         """Get default units."""
@@ -48,6 +79,7 @@ class RealBounds(BaseBounds):
             raise ValueError("Real bounds must have units. "
                              "Use an empty string for a dimensionless quantity.")
         self._default_units = units.parse_units(default_units)
+        self._converted.clear()
 
     def contains(self, bounds: BaseBounds) -> bool:
         """
@@ -82,6 +114,9 @@ class RealBounds(BaseBounds):
         """
         Convert the bounds to the target unit system, or None if not possible.
 
+        Results, including incompatible units, are remembered for each target unit until the
+        bounds or their units change.
+
         Parameters
         ----------
         target_units: str
@@ -93,11 +128,14 @@ class RealBounds(BaseBounds):
             A tuple of the (lower_bound, upper_bound) in the target units.
 
         """
-        try:
-            lower_bound = units.convert_units(
-                self.lower_bound, self.default_units, target_units)
-            upper_bound = units.convert_units(
-                self.upper_bound, self.default_units, target_units)
-            return lower_bound, upper_bound
-        except units.IncompatibleUnitsError:
-            return None, None
+        converted = self._converted.get(target_units)
+        if converted is None:
+            try:
+                converted = (
+                    units.convert_units(self.lower_bound, self.default_units, target_units),
+                    units.convert_units(self.upper_bound, self.default_units, target_units)
+                )
+            except units.IncompatibleUnitsError:
+                converted = None, None
+            self._converted[target_units] = converted
+        return converted
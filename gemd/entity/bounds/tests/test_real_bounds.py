@@ -1,6 +1,10 @@
 """Test RealBounds."""
+import pickle
+from copy import deepcopy
+
 import pytest
 
+import gemd.units as units
 from gemd.entity.bounds.integer_bounds import IntegerBounds
 from gemd.entity.bounds.real_bounds import RealBounds
 
@@ -53,3 +57,41 @@ def test_type_mismatch():
     assert not bounds.contains(None)
     with pytest.raises(TypeError):
         bounds.contains([.33, .66])
+
+
+def test_converted_bounds_cache(monkeypatch):
+    """Test that converted endpoints are remembered until the bounds change."""
+    calls = []
+
+    def counting_convert(*args):
+        calls.append(args)
+        return convert(*args)
+
+    convert = units.convert_units
+    monkeypatch.setattr(units, "convert_units", counting_convert)
+
+    bounds = RealBounds(lower_bound=0, upper_bound=100, default_units="degC")
+    fahrenheit = RealBounds(lower_bound=33, upper_bound=200, default_units="degF")
+    meters = RealBounds(lower_bound=0, upper_bound=1, default_units="m")
+    for _ in range(3):
+        assert bounds.contains(fahrenheit)
+        assert not bounds.contains(meters)
+    assert len(calls) == 3  # two endpoints in degF, and a failure to convert to meters
+
+    bounds.upper_bound = 50
+    assert not bounds.contains(fahrenheit)
+    bounds.lower_bound = -50
+    bounds.upper_bound = 500
+    assert bounds.contains(fahrenheit)
+    bounds.default_units = "m"
+    assert not bounds.contains(fahrenheit)
+    assert bounds.contains(meters)
+    bounds.default_units = "degC"
+
+    # The cache isn't part of the serialized bounds, and copies are independent
+    assert set(bounds.as_dict()) == {"lower_bound", "upper_bound", "default_units", "type"}
+    for copy in (deepcopy(bounds), pickle.loads(pickle.dumps(bounds))):
+        assert copy == bounds
+        copy.upper_bound = 50
+        assert not copy.contains(fahrenheit)
+        assert bounds.contains(fahrenheit)
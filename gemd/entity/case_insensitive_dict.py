@@ -1,3 +1,7 @@
+"""Case-insensitive mappings, used to hold unique identifiers."""
+from sys import intern
+
+
 class CaseInsensitiveDict(dict):
     """
     A dictionary in which the keys are case-insensitive.
@@ -74,3 +78,119 @@ class CaseInsensitiveDict(dict):
             raise ValueError(
                 "Key '{}' already exists in dict with different case: '{}'".format(key, prev))
         self.lowercase_dict[key.lower()] = key
+
+
+class CompactCaseInsensitiveDict(dict):
+    """
+    A compact dictionary in which the keys are case-insensitive.
+
+    It behaves like :class:`CaseInsensitiveDict`, including refusing keys that differ from an
+    existing key only by case, but is designed for the handful of unique identifiers that an
+    entity carries. It doesn't keep a second dictionary of lower-cased keys, or an instance
+    dictionary, and keys are interned. A key given in the case it was stored in is found by
+    hashing; any other case is found by scanning the keys, which is fast for the few keys
+    these dictionaries hold.
+
+    Parameters
+    ----------
+    seq: iterable or mapping, optional
+        The key-value pairs of the dictionary. Can either be a mapping object with (key, value)
+        pairs, or an iterable of tuples of the form (key, value).
+    **kwargs: keyword args, optional
+        An alternative way of initializing the dictionary with key-value pairs.
+
+    """
+
+    __slots__ = ()
+
+    def __init__(self, seq=None, **kwargs):
+        super().__init__()
+        self.update(seq, **kwargs)
+
+    def _stored_key(self, key: str):
+        """Get the key as it is stored, whatever the case of `key`, or None if it is absent."""
+        if dict.__contains__(self, key):
+            return key
+        lower = key.lower()
+        for stored in dict.__iter__(self):
+            if stored.lower() == lower:
+                return stored
+        return None
+
+    def __getitem__(self, key: str):
+        stored = self._stored_key(key)
+        if stored is None:
+            raise KeyError(key)
+        return dict.__getitem__(self, stored)
+
+    def get(self, key: str, default=None):
+        """
+        Get the value for a given case-insensitive key.
+
+        Parameters
+        ----------
+        key: str
+            The key to look up (possibly with a different casing).
+
+        default: Any
+            The result to return if the key is not present.
+
+        Returns
+        -------
+        Any
+            The value associated with the case-insensitive version of `key`, or `default`
+            if `key` is not present.
+
+        """
+        stored = self._stored_key(key)
+        return default if stored is None else dict.__getitem__(self, stored)
+
+    def __setitem__(self, key: str, value):
+        stored = self._stored_key(key)
+        if stored is not None and stored != key:
+            raise ValueError(
+                "Key '{}' already exists in dict with different case: '{}'".format(key, stored))
+        dict.__setitem__(self, intern(key), value)
+
+    def __delitem__(self, key: str):
+        stored = self._stored_key(key)
+        if stored is None:
+            raise KeyError(key)
+        dict.__delitem__(self, stored)
+
+    def __contains__(self, key: str):
+        return self._stored_key(key) is not None
+
+    def pop(self, key: str, *default):
+        """Remove a key, whatever its case, and return its value, as for a dict."""
+        stored = self._stored_key(key)
+        return dict.pop(self, key if stored is None else stored, *default)
+
+    def setdefault(self, key: str, default=None):
+        """Get the value of a key, whatever its case, setting it first if it is absent."""
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, seq=None, **kwargs):
+        """Add key-value pairs, checking each key as :meth:`__setitem__` does."""
+        if seq:
+            pairs = seq.items() if hasattr(seq, "keys") else seq
+            for key, value in pairs:
+                self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    @property
+    def lowercase_dict(self):
+        """Get a dictionary from each lower-cased key to the key as it was given."""
+        return {key.lower(): key for key in dict.__iter__(self)}
+
+    def copy(self):
+        """Make a shallow copy of the dictionary."""
+        result = CompactCaseInsensitiveDict()
+        dict.update(result, self)
+        return result
+
+    def __reduce__(self):
+        return CompactCaseInsensitiveDict, (dict(self),)
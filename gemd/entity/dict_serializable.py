@@ -4,10 +4,19 @@ from logging import getLogger
 import json
 import inspect
 
+from gemd.entity.valid_list import ValidList
+
 # There are some weird (probably resolvable) errors during object cloning if this is an
 # instance variable of DictSerializable.
 logger = getLogger(__name__)
 
+# The names of the constructor arguments of each class, which are slow to introspect
+_init_arg_names = {}
+# The attribute that stores each field of each class, for loading trusted data
+_trusted_attributes = {}
+# The content type and trigger of each field of each class that holds a ValidList
+_trusted_list_fields = {}
+
 
 class DictSerializable(ABC):
     """A base class for objects that can be represented as a dictionary and serialized."""
@@ -15,6 +24,17 @@ class DictSerializable(ABC):
     typ = NotImplemented
     skip = set()
 
+    # Subclasses that don't declare __slots__ still get an instance __dict__
+    __slots__ = ()
+
+    # Fields whose setters still run when loading trusted data, because they convert the
+    # serialized form or keep other objects in step
+    _trusted_setters = ()
+
+    # Fields that hold a ValidList, by name, with its content type and the name of the
+    # attribute that holds its trigger, or None. Each class only declares its own fields.
+    _trusted_lists = {}
+
     @classmethod
     def from_dict(cls, d):
         """
@@ -31,7 +51,7 @@ class DictSerializable(ABC):
             The deserialized object.
 
         """
-        expected_arg_names = inspect.getfullargspec(cls.__init__).args
+        expected_arg_names = cls._init_arg_names()
         kwargs = {}
         for name, arg in d.items():
             if name in expected_arg_names:
@@ -44,6 +64,95 @@ class DictSerializable(ABC):
         # but all of its children will use from_dict like this.
         return cls(**kwargs)
 
+    @classmethod
+    def from_trusted_dict(cls, d):
+        """
+        Reconstitute the object from a dictionary of fields that are already known to be valid.
+
+        The constructor and most setters are skipped, and each field is stored directly in
+        the attribute behind it, so no values are checked or converted. Lists that the setters
+        would make into a ValidList still are, with the same content type and trigger, but
+        their elements aren't checked as they are added. Only the setters of the fields in
+        `_trusted_setters` run, after all of the other fields are stored, so that links to and
+        from other objects are restored.
+        Only use this for data that gemd itself has written.
+
+        Parameters
+        ----------
+        d: dict
+            The object as a dictionary of key-value pairs that correspond to the object's fields.
+
+        Returns
+        -------
+        DictSerializable
+            The deserialized object.
+
+        """
+        obj = cls.__new__(cls)
+        obj._init_trusted()
+        # Every class with fields has an instance __dict__, which is faster to fill than setattr
+        state = obj.__dict__
+        attributes = cls._trusted_attribute_names()
+        lists = cls._trusted_list_fields()
+        deferred = []
+        for name, arg in d.items():
+            attribute = attributes.get(name)
+            if attribute is None:
+                if name != 'type':
+                    logger.warning('Ignoring unexpected keyword argument in {}: {}'.format(
+                        cls.__name__, name))
+            elif name in cls._trusted_setters:
+                state[attribute] = None
+                deferred.append((name, arg))
+            elif name in lists and isinstance(arg, list):
+                content_type, trigger = lists[name]
+                values = ValidList([], content_type,
+                                   None if trigger is None else getattr(obj, trigger))
+                list.extend(values, arg)
+                state[attribute] = values
+            else:
+                state[attribute] = arg
+        for name, arg in deferred:
+            setattr(obj, name, arg)
+        return obj
+
+    def _init_trusted(self):
+        """Initialize the state that isn't serialized, before trusted fields are stored."""
+
+    @classmethod
+    def _trusted_attribute_names(cls):
+        """Get the attribute behind each constructor argument, which is private for properties."""
+        attributes = _trusted_attributes.get(cls)
+        if attributes is None:
+            attributes = {}
+            for name in cls._init_arg_names() - {"self"}:
+                if isinstance(getattr(cls, name, None), property):
+                    attributes[name] = "_" + name
+                else:
+                    attributes[name] = name
+            _trusted_attributes[cls] = attributes
+        return attributes
+
+    @classmethod
+    def _trusted_list_fields(cls):
+        """Get the content type and trigger of each ValidList field, from every base class."""
+        fields = _trusted_list_fields.get(cls)
+        if fields is None:
+            fields = {}
+            for klass in reversed(cls.__mro__):
+                fields.update(vars(klass).get("_trusted_lists", {}))
+            _trusted_list_fields[cls] = fields
+        return fields
+
+    @classmethod
+    def _init_arg_names(cls):
+        """Get the names of the constructor arguments, which are looked up once per class."""
+        names = _init_arg_names.get(cls)
+        if names is None:
+            names = frozenset(inspect.getfullargspec(cls.__init__).args)
+            _init_arg_names[cls] = names
+        return names
+
     def as_dict(self):
         """
         Convert the object to a dictionary.
@@ -1,4 +1,5 @@
 """A unique id that stands in for a data object."""
+import sys
 import uuid
 
 from gemd.entity.dict_serializable import DictSerializable
@@ -8,6 +9,10 @@ class LinkByUID(DictSerializable):
     """
     Link object, which replaces pointers to other entities before serialization and writing.
 
+    Links are immutable and compare and hash by their normalized (lower-case) scope and id,
+    so they can be used as dictionary keys and set members.
+    The scope is stored as given so that it round-trips through serialization unchanged.
+
     Parameters
     ----------
     scope: str
@@ -19,14 +24,93 @@ class LinkByUID(DictSerializable):
 
     typ = "link_by_uid"
 
+    # Links are the most numerous objects in large serialized graphs, so keep them small
+    __slots__ = ("_scope", "_normalized_scope", "_id")
+
     def __init__(self, scope, id):
         # TODO: parse to make sure it's valid
-        self.scope = scope
-        self.id = id
+        if not isinstance(scope, str):
+            raise TypeError("The scope of a LinkByUID must be a string, not {}: {}".format(
+                type(scope).__name__, scope))
+        object.__setattr__(self, "_scope", sys.intern(scope))
+        object.__setattr__(self, "_normalized_scope", sys.intern(scope.lower()))
+        object.__setattr__(self, "_id", id)
+
+    @property
+    def scope(self):
+        """Get the scope, with its original case."""
+        return self._scope
+
+    @property
+    def id(self):
+        """Get the unique identifier."""
+        return self._id
+
+    @property
+    def key(self):
+        """
+        Get the normalized key of this link.
+
+        Returns
+        -------
+        tuple (str, str)
+            The (lower-case scope, id) pair, which is also the key used in object indices.
+
+        """
+        return self._normalized_scope, self._id
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LinkByUID objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("LinkByUID objects are immutable")
+
+    def __eq__(self, other):
+        if isinstance(other, LinkByUID):
+            return self._id == other._id and self._normalized_scope == other._normalized_scope
+        return False
+
+    def __hash__(self):
+        return hash((self._normalized_scope, self._id))
+
+    def __reduce__(self):
+        return LinkByUID, (self._scope, self._id)
 
     def __repr__(self):
         return str({"scope": self.scope, "uid": self.id})
 
+    @classmethod
+    def from_dict(cls, d):
+        """
+        Reconstitute the link from a dictionary.
+
+        Parameters
+        ----------
+        d: dict
+            A dictionary with "scope" and "id" keys, and optionally a "type" key.
+
+        Returns
+        -------
+        LinkByUID
+            The deserialized link.
+
+        """
+        if len(d) == 2 and "scope" in d and "id" in d:
+            return cls(d["scope"], d["id"])
+        return super().from_dict(d)
+
+    def as_dict(self):
+        """
+        Convert the link to a dictionary.
+
+        Returns
+        -------
+        dict
+            A dictionary with "type", "scope" and "id".
+
+        """
+        return {"type": self.typ, "scope": self.scope, "id": self.id}
+
     @classmethod
     def from_entity(cls, entity, name="auto"):
         """
@@ -28,6 +28,8 @@ class BaseObject(BaseEntity):
 
     """
 
+    _trusted_lists = {"file_links": (FileLink, None)}
+
     def __init__(self, name=None, uids=None, tags=None, notes=None, file_links=None):
         BaseEntity.__init__(self, uids, tags)
         self.notes = notes
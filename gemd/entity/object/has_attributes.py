@@ -0,0 +1,169 @@
+"""For entities that can look up their attributes by name or template."""
+from copy import deepcopy
+import weakref
+
+from gemd.entity.attribute.property_and_conditions import PropertyAndConditions
+from gemd.entity.base_entity import BaseEntity
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.template_lookup import template_keys
+
+# The fields that hold attributes, in the order that they are searched
+_ATTRIBUTE_FIELDS = ("_properties", "_conditions", "_parameters")
+
+
+class HasAttributes(object):
+    """
+    Mixin-trait for entities that can look up their attributes by name or template.
+
+    Lookups go through an index of the attributes by name and by template, which is built on
+    the first lookup. Adding or replacing an attribute in one of the lists invalidates the index
+    through the trigger of the list, and each attribute found through the index is checked to
+    still be where the index says it is and to still have the name or template it was found
+    by, so removals and changes in place are caught as well. A lookup that misses scans the
+    attributes for one that was renamed or given another template in place, or a template
+    whose unique identifiers have changed, and only then rebuilds the index.
+    """
+
+    # Kept out of the instance __dict__ so that it isn't serialized
+    __slots__ = ("_attribute_index",)
+
+    def get_attribute(self, key):
+        """
+        Look up an attribute by its name or its template.
+
+        Properties are searched before conditions, and conditions before parameters, and the
+        first match is returned. For a material spec, the properties are those of its
+        property-and-conditions.
+
+        Parameters
+        ----------
+        key: str, AttributeTemplate or LinkByUID
+            The name of the attribute, or its template or a link to its template.
+
+        Returns
+        -------
+        BaseAttribute
+            The first attribute with that name or template, or None if there is none.
+
+        """
+        index = getattr(self, "_attribute_index", None)
+        if index is None:
+            index = self._build_attribute_index()
+        if isinstance(key, str):
+            entry = index[0].get(key)
+            if entry is None:
+                if any(attribute.name != name for attribute, name, _ in index[3]):
+                    # An attribute has been renamed in place since the index was built
+                    entry = self._build_attribute_index()[0].get(key)
+            elif not (_is_current(entry) and entry[3].name == key):
+                # It was removed, moved or renamed in place, so the index is out of date
+                entry = self._build_attribute_index()[0].get(key)
+        elif isinstance(key, (BaseEntity, LinkByUID)):
+            entry = _lookup_template(index[1], key)
+            if entry is None:
+                if any(template.uids != uids for template, uids in index[2]) or \
+                        any(attribute.template is not template
+                            for attribute, _, template in index[3]):
+                    # Attributes have been given other templates, or templates unique
+                    # identifiers, since the index was built
+                    entry = _lookup_template(self._build_attribute_index()[1], key)
+            elif not (_is_current(entry) and _same_template(entry[3].template, key)):
+                # It was removed, moved or given another template in place
+                entry = _lookup_template(self._build_attribute_index()[1], key)
+        else:
+            raise TypeError("An attribute is looked up by name, template or link, "
+                            "not {}".format(type(key).__name__))
+        return None if entry is None else entry[3]
+
+    def __getstate__(self):
+        # The index is keyed by the identities of templates, which copies don't share, so
+        # copies build their own
+        return self.__dict__
+
+    @property
+    def _attribute_trigger(self):
+        """Get a trigger for the lists of attributes, which invalidates the index."""
+        return _AttributesChanged(self)
+
+    def _attributes_changed(self):
+        """Invalidate the index of the attributes, such as when a list of them is replaced."""
+        self._attribute_index = None
+
+    def _build_attribute_index(self):
+        """
+        Index the attributes by name, and by the identity and unique ids of their templates.
+
+        The name and template that each attribute had, and the unique ids that each template
+        had, are kept as well, to tell when they change.
+        """
+        by_name = {}
+        by_template = {}
+        uids = {}
+        attributes = []
+        for field in _ATTRIBUTE_FIELDS:
+            values = getattr(self, field, None)
+            if values is None:
+                continue
+            for position, element in enumerate(values):
+                attribute = element
+                if isinstance(attribute, PropertyAndConditions):
+                    attribute = attribute.property
+                entry = (values, position, element, attribute)
+                by_name.setdefault(attribute.name, entry)
+                template = attribute.template
+                attributes.append((attribute, attribute.name, template))
+                if template is None:
+                    continue
+                for key in template_keys(template):
+                    by_template.setdefault(key, entry)
+                if isinstance(template, BaseEntity):
+                    uids.setdefault(id(template), (template, template.uids.copy()))
+        self._attribute_index = (by_name, by_template, list(uids.values()), attributes)
+        return self._attribute_index
+
+
+class _AttributesChanged(object):
+    """
+    The trigger of the lists of attributes of an object, which invalidates its index.
+
+    It only holds a weak reference to the object, so that the object and its lists don't form
+    a reference cycle.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        self._owner = weakref.ref(owner)
+
+    def __call__(self, *_):
+        owner = self._owner()
+        if owner is not None:
+            owner._attributes_changed()
+
+    def __deepcopy__(self, memo):
+        # The copy of a list belongs to the copy of the object, which is already in the memo
+        return _AttributesChanged(deepcopy(self._owner(), memo))
+
+
+def _is_current(entry):
+    """Check that an attribute in the index is still in its list, at the same position."""
+    values, position, element, _ = entry
+    return position < len(values) and values[position] is element
+
+
+def _same_template(template, key):
+    """Check that a template is the template or link it was looked up by."""
+    if template is key:
+        return True
+    if template is None:
+        return False
+    return not set(template_keys(template)).isdisjoint(template_keys(key))
+
+
+def _lookup_template(by_template, template):
+    """Find the entry of the attribute of a template or a link to one in the index."""
+    for key in template_keys(template):
+        entry = by_template.get(key)
+        if entry is not None:
+            return entry
+    return None
@@ -1,11 +1,14 @@
 """For entities that have conditions."""
 from gemd.entity.attribute.condition import Condition
-from gemd.entity.setters import validate_list
+from gemd.entity.object.has_attributes import HasAttributes
+from gemd.entity.setters import validate_list, validate_attribute_templates
 
 
-class HasConditions(object):
+class HasConditions(HasAttributes):
     """Mixin-trait for entities that include conditions."""
 
+    _trusted_lists = {"conditions": (Condition, "_attribute_trigger")}
+
     def __init__(self, conditions):
         self._conditions = None
         self.conditions = conditions
@@ -17,4 +20,28 @@ class HasConditions(object):
 
     @conditions.setter
     def conditions(self, conditions):
-        self._conditions = validate_list(conditions, Condition)
+        self._conditions = validate_list(conditions, Condition, trigger=self._attribute_trigger)
+        self._attributes_changed()
+
+    def add_conditions(self, conditions, check_template=False):
+        """
+        Append a batch of conditions, validating them together.
+
+        Parameters
+        ----------
+        conditions: Iterable[Condition]
+            The conditions to append.
+        check_template: bool
+            Whether to check that the template of each condition is one that the template of this
+            object allows. Default: False
+
+        Returns
+        -------
+        None
+            The conditions are appended if they are all valid; otherwise none of them are.
+
+        """
+        conditions = list(conditions)
+        if check_template:
+            validate_attribute_templates(conditions, self.template, "conditions")
+        self.conditions.extend(conditions)
@@ -1,11 +1,14 @@
 """For entities that have parameters."""
 from gemd.entity.attribute.parameter import Parameter
-from gemd.entity.setters import validate_list
+from gemd.entity.object.has_attributes import HasAttributes
+from gemd.entity.setters import validate_list, validate_attribute_templates
 
 
-class HasParameters(object):
+class HasParameters(HasAttributes):
     """Mixin-trait for entities that include parameters."""
 
+    _trusted_lists = {"parameters": (Parameter, "_attribute_trigger")}
+
     def __init__(self, parameters):
         self._parameters = None
         self.parameters = parameters
@@ -17,4 +20,28 @@ class HasParameters(object):
 
     @parameters.setter
     def parameters(self, parameters):
-        self._parameters = validate_list(parameters, Parameter)
+        self._parameters = validate_list(parameters, Parameter, trigger=self._attribute_trigger)
+        self._attributes_changed()
+
+    def add_parameters(self, parameters, check_template=False):
+        """
+        Append a batch of parameters, validating them together.
+
+        Parameters
+        ----------
+        parameters: Iterable[Parameter]
+            The parameters to append.
+        check_template: bool
+            Whether to check that the template of each parameter is one that the template of this
+            object allows. Default: False
+
+        Returns
+        -------
+        None
+            The parameters are appended if they are all valid; otherwise none of them are.
+
+        """
+        parameters = list(parameters)
+        if check_template:
+            validate_attribute_templates(parameters, self.template, "parameters")
+        self.parameters.extend(parameters)
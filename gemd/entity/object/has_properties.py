@@ -1,11 +1,14 @@
 """For entities that have properties."""
 from gemd.entity.attribute.property import Property
-from gemd.entity.setters import validate_list
+from gemd.entity.object.has_attributes import HasAttributes
+from gemd.entity.setters import validate_list, validate_attribute_templates
 
 
-class HasProperties(object):
+class HasProperties(HasAttributes):
     """Mixin-trait for entities that include properties."""
 
+    _trusted_lists = {"properties": (Property, "_attribute_trigger")}
+
     def __init__(self, properties):
         self._properties = None
         self.properties = properties
@@ -17,4 +20,28 @@ class HasProperties(object):
 
     @properties.setter
     def properties(self, properties):
-        self._properties = validate_list(properties, Property)
+        self._properties = validate_list(properties, Property, trigger=self._attribute_trigger)
+        self._attributes_changed()
+
+    def add_properties(self, properties, check_template=False):
+        """
+        Append a batch of properties, validating them together.
+
+        Parameters
+        ----------
+        properties: Iterable[Property]
+            The properties to append.
+        check_template: bool
+            Whether to check that the template of each property is one that the template of this
+            object allows. Default: False
+
+        Returns
+        -------
+        None
+            The properties are appended if they are all valid; otherwise none of them are.
+
+        """
+        properties = list(properties)
+        if check_template:
+            validate_attribute_templates(properties, self.template, "properties")
+        self.properties.extend(properties)
@@ -49,6 +49,9 @@ class IngredientSpec(BaseObject, HasQuantities):
 
     typ = "ingredient_spec"
 
+    _trusted_setters = BaseObject._trusted_setters + ("process",)
+    _trusted_lists = {"labels": (str, None)}
+
     def __init__(self, material=None, process=None, name=None, labels=None,
                  mass_fraction=None, volume_fraction=None, number_fraction=None,
                  absolute_quantity=None,
@@ -42,6 +42,8 @@ class MaterialRun(BaseObject):
 
     typ = "material_run"
 
+    _trusted_setters = BaseObject._trusted_setters + ("process",)
+
     skip = {"_measurements"}
 
     def __init__(self, name=None, spec=None, process=None, sample_type="unknown",
@@ -57,6 +59,9 @@ class MaterialRun(BaseObject):
         self.process = process
         self.sample_type = sample_type
 
+    def _init_trusted(self):
+        self._measurements = []
+
     @property
     def process(self):
         """Get the originating process run."""
@@ -1,10 +1,11 @@
 from gemd.entity.attribute.property_and_conditions import PropertyAndConditions
 from gemd.entity.object.base_object import BaseObject
+from gemd.entity.object.has_attributes import HasAttributes
 from gemd.entity.object.has_template import HasTemplate
-from gemd.entity.setters import validate_list
+from gemd.entity.setters import validate_list, validate_attribute_templates
 
 
-class MaterialSpec(BaseObject, HasTemplate):
+class MaterialSpec(BaseObject, HasTemplate, HasAttributes):
     """
     A material specification.
 
@@ -38,6 +39,9 @@ class MaterialSpec(BaseObject, HasTemplate):
 
     typ = "material_spec"
 
+    _trusted_setters = BaseObject._trusted_setters + ("process",)
+    _trusted_lists = {"properties": (PropertyAndConditions, "_attribute_trigger")}
+
     def __init__(self, name=None, template=None,
                  properties=None, process=None, uids=None, tags=None,
                  notes=None, file_links=None):
@@ -56,7 +60,32 @@ class MaterialSpec(BaseObject, HasTemplate):
 
     @properties.setter
     def properties(self, properties):
-        self._properties = validate_list(properties, PropertyAndConditions)
+        self._properties = validate_list(properties, PropertyAndConditions,
+                                         trigger=self._attribute_trigger)
+        self._attributes_changed()
+
+    def add_properties(self, properties, check_template=False):
+        """
+        Append a batch of property-and-conditions, validating them together.
+
+        Parameters
+        ----------
+        properties: Iterable[PropertyAndConditions]
+            The property-and-conditions to append.
+        check_template: bool
+            Whether to check that the template of each property is one that the template of
+            this material spec allows. Default: False
+
+        Returns
+        -------
+        None
+            The properties are appended if they are all valid; otherwise none of them are.
+
+        """
+        properties = list(properties)
+        if check_template:
+            validate_attribute_templates(properties, self.template, "properties")
+        self.properties.extend(properties)
 
     @property
     def process(self):
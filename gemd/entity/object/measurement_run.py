@@ -49,6 +49,8 @@ class MeasurementRun(BaseObject, HasConditions, HasProperties, HasParameters, Ha
 
     typ = "measurement_run"
 
+    _trusted_setters = BaseObject._trusted_setters + ("material",)
+
     def __init__(self, name=None, spec=None, material=None,
                  properties=None, conditions=None, parameters=None,
                  uids=None, tags=None, notes=None, file_links=None, source=None):
@@ -68,6 +68,10 @@ class ProcessRun(BaseObject, HasConditions, HasParameters, HasSource):
         self.spec = spec
         self._output_material = None
 
+    def _init_trusted(self):
+        self._ingredients = []
+        self._output_material = None
+
     @property
     def output_material(self):
         """Get the output material run."""
@@ -68,6 +68,10 @@ class ProcessSpec(BaseObject, HasParameters, HasConditions, HasTemplate):
 
         HasTemplate.__init__(self, template=template)
 
+    def _init_trusted(self):
+        self._ingredients = []
+        self._output_material = None
+
     @property
     def ingredients(self):
         """Get the list of input ingredient specs."""
@@ -1,8 +1,14 @@
 """Tests of the material spec object."""
 import pytest
 
+from gemd.entity.attribute.property import Property
+from gemd.entity.attribute.property_and_conditions import PropertyAndConditions
+from gemd.entity.bounds.categorical_bounds import CategoricalBounds
 from gemd.entity.object.process_spec import ProcessSpec
 from gemd.entity.object.material_spec import MaterialSpec
+from gemd.entity.template.material_template import MaterialTemplate
+from gemd.entity.template.property_template import PropertyTemplate
+from gemd.entity.value.nominal_real import NominalReal
 
 
 def test_process_reassignment():
@@ -26,3 +32,30 @@ def test_invalid_assignment():
         MaterialSpec("name", process=["Process 1", "Process 2"])
     with pytest.raises(TypeError):
         MaterialSpec("name", template=MaterialSpec("another spec"))
+
+
+def test_add_properties():
+    """Test appending a batch of property-and-conditions."""
+    color = PropertyTemplate("color", bounds=CategoricalBounds(["red", "blue"]))
+    shape = PropertyTemplate("shape", bounds=CategoricalBounds(["round", "square"]))
+    spec = MaterialSpec("spec", template=MaterialTemplate("template", properties=[color]))
+
+    spec.add_properties([PropertyAndConditions(Property("color", template=color))],
+                        check_template=True)
+    with pytest.raises(ValueError):
+        spec.add_properties([PropertyAndConditions(Property("shape", template=shape))],
+                            check_template=True)
+    with pytest.raises(TypeError):
+        spec.add_properties([Property("color", template=color)])
+    spec.add_properties([PropertyAndConditions(Property("shape", template=shape))])
+    assert [prop.name for prop in spec.properties] == ["color", "shape"]
+
+
+def test_get_attribute():
+    """Test that the properties of the property-and-conditions of a spec are looked up."""
+    density = Property("Density", value=NominalReal(2, "g/cm^3"))
+    spec = MaterialSpec(properties=[PropertyAndConditions(property=density)])
+    assert spec.get_attribute("Density") is density
+    assert spec.get_attribute("Color") is None
+    spec.properties.append(PropertyAndConditions(property=Property("Color")))
+    assert spec.get_attribute("Color").name == "Color"
@@ -1,4 +1,7 @@
 """Tests of the measurement run object."""
+from copy import copy as shallow_copy, deepcopy
+import weakref
+
 import pytest
 from uuid import uuid4
 
@@ -10,6 +13,10 @@ from gemd.entity.attribute.parameter import Parameter
 from gemd.entity.attribute.property import Property
 from gemd.entity.source.performed_source import PerformedSource
 from gemd.entity.template.measurement_template import MeasurementTemplate
+from gemd.entity.template.condition_template import ConditionTemplate
+from gemd.entity.template.parameter_template import ParameterTemplate
+from gemd.entity.template.property_template import PropertyTemplate
+from gemd.entity.bounds.real_bounds import RealBounds
 from gemd.entity.value.nominal_real import NominalReal
 from gemd.entity.file_link import FileLink
 from gemd.entity.link_by_uid import LinkByUID
@@ -132,3 +139,163 @@ def test_template_access():
 
     meas.spec = LinkByUID.from_entity(spec)
     assert meas.template is None
+
+
+def test_add_attributes():
+    """Test appending batches of attributes, optionally checking their templates."""
+    bounds = RealBounds(0, 1000, "K")
+    temperature = ConditionTemplate("temperature", bounds=bounds, uids={"id": "temperature"})
+    pressure = ConditionTemplate("pressure", bounds=RealBounds(0, 10, "bar"))
+    density = PropertyTemplate("density", bounds=RealBounds(0, 10, "g/cm^3"))
+    speed = ParameterTemplate("speed", bounds=RealBounds(0, 10, "m/s"))
+    template = MeasurementTemplate("template", conditions=[temperature],
+                                   properties=[[LinkByUID("id", "density"), density.bounds]],
+                                   parameters=[speed])
+    measurement = MeasurementRun("measurement", spec=MeasurementSpec("spec", template=template))
+
+    # Templates may match by identity or by unique identifier, and attributes need none
+    copy = ConditionTemplate("temperature", bounds=bounds, uids={"ID": "temperature"})
+    measurement.add_conditions((Condition("T{}".format(i), template=temperature)
+                                for i in range(3)), check_template=True)
+    measurement.add_conditions([Condition("T", template=copy), Condition("untemplated")],
+                               check_template=True)
+    assert [cond.name for cond in measurement.conditions] == ["T0", "T1", "T2", "T", "untemplated"]
+
+    # A failed batch appends nothing, and every offending attribute is reported
+    with pytest.raises(ValueError, match="P1, P2"):
+        measurement.add_conditions([Condition("P1", template=pressure),
+                                    Condition("T3", template=temperature),
+                                    Condition("P2", template=pressure)], check_template=True)
+    with pytest.raises(TypeError):
+        measurement.add_conditions([Condition("T3"), Property("density")], check_template=True)
+    assert len(measurement.conditions) == 5
+    measurement.add_conditions([Condition("P", template=pressure)])
+    assert len(measurement.conditions) == 6
+
+    density.add_uid("id", "density")
+    measurement.add_properties([Property("density", template=density),
+                                Property("density", template=LinkByUID("id", "density"))],
+                               check_template=True)
+    with pytest.raises(ValueError):
+        measurement.add_properties([Property("density", template=LinkByUID("id", "other"))],
+                                   check_template=True)
+    measurement.add_parameters([Parameter("speed", template=speed)], check_template=True)
+    assert len(measurement.properties) == 2
+    assert len(measurement.parameters) == 1
+
+    # Templates can't be checked without an object template
+    measurement.spec = LinkByUID("id", "spec")
+    measurement.add_conditions([Condition("P", template=pressure)], check_template=True)
+    measurement.spec = MeasurementSpec("spec", template=LinkByUID("id", "template"))
+    measurement.add_conditions([Condition("P", template=pressure)], check_template=True)
+    assert len(measurement.conditions) == 8
+
+
+def test_get_attribute():
+    """Test looking up attributes by name, template and link, as they change."""
+    temp_template = ConditionTemplate("Temperature", bounds=RealBounds(0, 1000, "K"),
+                                      uids={"my_id": "temp"})
+    density = Property("Density", value=NominalReal(2, "g/cm^3"))
+    temperature = Condition("Temperature", value=NominalReal(300, "K"), template=temp_template)
+    measurement = MeasurementRun(properties=[density], conditions=[temperature])
+
+    assert measurement.get_attribute("Density") is density
+    assert measurement.get_attribute("Temperature") is temperature
+    assert measurement.get_attribute(temp_template) is temperature
+    assert measurement.get_attribute(LinkByUID("MY_ID", "temp")) is temperature
+    assert measurement.get_attribute("Pressure") is None
+    assert measurement.get_attribute(LinkByUID("my_id", "pressure")) is None
+    with pytest.raises(TypeError):
+        measurement.get_attribute(7)
+
+    # Properties come before conditions, and earlier attributes before later ones
+    shadow = Property("Temperature", value=NominalReal(301, "K"))
+    measurement.properties.append(shadow)
+    assert measurement.get_attribute("Temperature") is shadow
+    measurement.properties.insert(0, Property("Density", value=NominalReal(3, "g/cm^3")))
+    assert measurement.get_attribute("Density").value.nominal == 3
+    measurement.properties[0] = density
+    assert measurement.get_attribute("Density") is density
+
+    # Removing and replacing attributes
+    measurement.properties.remove(shadow)
+    assert measurement.get_attribute("Temperature") is temperature
+    measurement.conditions = []
+    assert measurement.get_attribute("Temperature") is None
+    assert measurement.get_attribute(temp_template) is None
+    measurement.add_conditions([temperature])
+    assert measurement.get_attribute(temp_template) is temperature
+
+    # Renames and new template uids are picked up
+    temperature.name = "Temp"
+    assert measurement.get_attribute("Temp") is temperature
+    assert measurement.get_attribute("Temperature") is None
+    density.name = "Dense"
+    assert measurement.get_attribute("Dense") is density
+    assert measurement.get_attribute("Density") is None
+    density.name = "Density"
+    temp_template.add_uid("other", "t")
+    assert measurement.get_attribute(LinkByUID("other", "t")) is temperature
+
+    # A template hit is checked against the attribute's current template
+    other_template = ConditionTemplate("Temp", bounds=RealBounds(0, 1000, "K"))
+    assert measurement.get_attribute(temp_template) is temperature
+    temperature.template = other_template
+    assert measurement.get_attribute(temp_template) is None
+    assert measurement.get_attribute(LinkByUID("my_id", "temp")) is None
+    assert measurement.get_attribute(other_template) is temperature
+    temperature.template = None
+    assert measurement.get_attribute(other_template) is None
+    # Like a rename, a template set in place is found by straight away
+    temperature.template = temp_template
+    assert measurement.get_attribute(temp_template) is temperature
+
+    # Misses don't rebuild the index unless an attribute or template changed in place
+    index = measurement._attribute_index
+    assert measurement.get_attribute(other_template) is None
+    assert measurement.get_attribute(LinkByUID("my_id", "missing")) is None
+    assert measurement.get_attribute("Pressure") is None
+    assert measurement._attribute_index is index
+    temp_template.add_uid("third", "t3")
+    assert measurement.get_attribute(LinkByUID("third", "t3")) is temperature
+    assert measurement._attribute_index is not index
+
+    parameter = Parameter("Speed", template=LinkByUID("my_id", "speed"))
+    measurement.parameters.append(parameter)
+    assert measurement.get_attribute(LinkByUID("my_id", "speed")) is parameter
+
+    # The index isn't serialized, and follows lists loaded from trusted data
+    assert "attribute_index" not in measurement.as_dict()
+    copy = loads(dumps(measurement), trusted=True)
+    assert copy.get_attribute("Density") == density
+    copy.properties.append(Property("Hardness"))
+    assert copy.get_attribute("Hardness").name == "Hardness"
+    copy.properties[0] = Property("Replaced")
+    assert copy.get_attribute("Replaced").name == "Replaced"
+    assert copy.get_attribute("Density") is copy.properties[1]
+    hardness = copy.properties.pop()
+    assert copy.get_attribute("Hardness") is None
+    copy.properties.append(Property("Stiffness"))
+    assert copy.get_attribute("Stiffness").name == "Stiffness"
+    del copy.properties[0]
+    assert copy.get_attribute("Replaced") is None
+    copy.properties.extend([hardness])
+    assert copy.get_attribute("Hardness") is hardness
+
+    # Deep copies have their own index, and the lists don't keep the object alive
+    unidentified = PropertyTemplate("Hardness", bounds=RealBounds(0, 10, ""))
+    measurement.properties.append(Property("Hardness", template=unidentified))
+    assert measurement.get_attribute(unidentified) is measurement.properties[-1]
+    duplicate = deepcopy(measurement)
+    assert duplicate.get_attribute(duplicate.properties[-1].template) is duplicate.properties[-1]
+    assert duplicate.get_attribute(unidentified) is None
+    measurement.properties.pop()
+    assert shallow_copy(measurement).get_attribute("Density") is density
+
+    duplicate = deepcopy(measurement)
+    duplicate.properties.append(Property("Hardness"))
+    assert duplicate.get_attribute("Hardness") is duplicate.properties[-1]
+    assert measurement.get_attribute("Hardness") is None
+    reference = weakref.ref(duplicate)
+    del duplicate
+    assert reference() is None
@@ -1,4 +1,5 @@
 """Methods for setting and validating."""
+from gemd.entity.template_lookup import template_keys, template_tables
 from gemd.entity.valid_list import ValidList
 
 
@@ -58,3 +59,44 @@ def validate_str(obj):
         return obj.decode("utf-8")
     except AttributeError:
         return obj
+
+
+def validate_attribute_templates(attributes, object_template, kind):
+    """
+    Check that the attribute templates used by a batch of attributes are allowed.
+
+    An attribute template is allowed if the object template lists it among its `kind`
+    attribute templates, either as the same object or by a shared unique identifier.
+    Attributes without templates are always allowed, and nothing can be checked if the object
+    template is missing or is only a link.
+
+    Parameters
+    ----------
+    attributes: List[BaseAttribute]
+        The attributes to check.
+    object_template: BaseTemplate or LinkByUID
+        The template of the object the attributes belong to.
+    kind: str
+        The kind of attribute, which is the name of the object template's list of
+        (attribute template, bounds) pairs: "properties", "conditions" or "parameters".
+
+    Raises
+    ------
+    ValueError
+        If any of the attributes has a template that is not allowed; all of them are named.
+
+    """
+    allowed = template_tables(object_template, {}).get(kind)
+    if allowed is None:
+        return
+
+    disallowed = []
+    for attribute in attributes:
+        # Anything that isn't an attribute is left for the type validation to reject
+        template = getattr(attribute, "template", None)
+        if template is None or any(key in allowed for key in template_keys(template)):
+            continue
+        disallowed.append(attribute.name)
+    if disallowed:
+        raise ValueError("Templates of these {} are not allowed by object template '{}': {}"
+                         .format(kind, object_template.name, ", ".join(disallowed)))
@@ -46,6 +46,8 @@ class ProcessTemplate(BaseTemplate, HasConditionTemplates, HasParameterTemplates
 
     typ = "process_template"
 
+    _trusted_lists = {"allowed_names": (str, None), "allowed_labels": (str, None)}
+
     def __init__(self, name=None, description=None,
                  conditions=None, parameters=None,
                  allowed_names=None, allowed_labels=None,
@@ -0,0 +1,54 @@
+"""Lookup tables of the attribute templates that object templates allow, and their keys."""
+from gemd.entity.link_by_uid import LinkByUID
+
+ATTRIBUTE_KINDS = ("properties", "conditions", "parameters")
+
+
+def template_tables(object_template, cache):
+    """
+    Get the attribute templates an object template allows, and the bounds it applies to them.
+
+    The result maps each kind of attribute the object template constrains to a dict from the
+    identity and unique identifiers of the allowed attribute templates to their bounds.
+    Kinds of attribute that the object template can't constrain are left out.
+    The result is remembered for each object template in `cache`.
+
+    Parameters
+    ----------
+    object_template: BaseTemplate, LinkByUID or None
+        The template of an object.
+    cache: dict
+        Tables that have already been built, keyed by the identity of their object template.
+
+    Returns
+    -------
+    Dict[str, dict]
+        The lookup table for each kind of attribute, which is empty if the object template
+        is missing or only a link.
+
+    """
+    if object_template is None or isinstance(object_template, LinkByUID):
+        return {}
+    tables = cache.get(id(object_template))
+    if tables is None:
+        tables = {}
+        for kind in ATTRIBUTE_KINDS:
+            if not hasattr(object_template, kind):
+                continue
+            table = tables[kind] = {}
+            for template, bounds in getattr(object_template, kind) or ():
+                if isinstance(template, LinkByUID):
+                    table[template.key] = bounds
+                else:
+                    table[id(template)] = bounds
+                    for scope, uid in template.uids.items():
+                        table[(scope.lower(), uid)] = bounds
+        cache[id(object_template)] = tables
+    return tables
+
+
+def template_keys(template):
+    """Get the keys that an attribute template or a link to it has in a lookup table."""
+    if isinstance(template, LinkByUID):
+        return [template.key]
+    return [id(template)] + [(scope.lower(), uid) for scope, uid in template.uids.items()]
@@ -1,20 +1,25 @@
 """Tests of the case-insensitive dictionary class."""
+import json
+import pickle
+from copy import deepcopy
+
 import pytest
 
-from gemd.entity.case_insensitive_dict import CaseInsensitiveDict
+from gemd.entity.case_insensitive_dict import CaseInsensitiveDict, CompactCaseInsensitiveDict
 from gemd.entity.object.process_run import ProcessRun
 from gemd.json import loads, dumps
 
 
-def test_case_sensitivity():
+@pytest.mark.parametrize("dict_class", [CaseInsensitiveDict, CompactCaseInsensitiveDict])
+def test_case_sensitivity(dict_class):
     """Test some basic setting and getting operations."""
     # If two keys are the same up to case, the dictionary is invalid.
     bad_data = {'A': 1, 'a': 2}
     with pytest.raises(ValueError):
-        CaseInsensitiveDict(**bad_data)
+        dict_class(**bad_data)
 
     data = {'key1': 'value1', 'key2': 2}
-    data_dict = CaseInsensitiveDict(**data)
+    data_dict = dict_class(**data)
     data_dict['kEY3'] = "three"  # A new key-value pair can be added.
     data_dict['key2'] = 22  # An existing can be overridden by the exact same key.
 
@@ -48,11 +53,72 @@ def test_serde():
     assert process_copy.uids['foo'] == process_copy.uids['Foo']
 
 
-def test_contains():
+@pytest.mark.parametrize("dict_class", [CaseInsensitiveDict, CompactCaseInsensitiveDict])
+def test_contains(dict_class):
     """Test checking whether or not a case insensitive dict contains a key."""
     data = {'Key': 'value'}
-    data_dict = CaseInsensitiveDict(**data)
+    data_dict = dict_class(**data)
     for k in ('key', 'Key', 'KEY'):
         assert k in data_dict
 
     assert 'not_a_key' not in data_dict
+
+
+def test_compact_dict():
+    """Test the parts of the compact dictionary that a dict would otherwise provide."""
+    data_dict = CompactCaseInsensitiveDict([('Scope', 'one')], other='two')
+    assert data_dict == {'Scope': 'one', 'other': 'two'}
+    assert {'Scope': 'one', 'other': 'two'} == data_dict
+    assert repr(data_dict) == repr({'Scope': 'one', 'other': 'two'})
+    assert list(data_dict.items()) == [('Scope', 'one'), ('other', 'two')]
+    assert data_dict.lowercase_dict == {'scope': 'Scope', 'other': 'other'}
+
+    # Copies don't share changes
+    for copy in (data_dict.copy(), deepcopy(data_dict), pickle.loads(pickle.dumps(data_dict))):
+        assert copy == data_dict
+        copy['new'] = 'three'
+        assert 'new' not in data_dict
+
+    del data_dict['SCOPE']
+    assert list(data_dict) == ['other']
+    with pytest.raises(KeyError):
+        del data_dict['scope']
+    data_dict['sCoPe'] = 'four'  # The old case of a deleted key isn't remembered
+    assert data_dict['scope'] == 'four'
+    assert len(data_dict) == 2
+    assert len(CompactCaseInsensitiveDict()) == 0
+
+
+def test_entity_uids():
+    """Test that entities copy uids into a compact dictionary however they are given."""
+    uids = CompactCaseInsensitiveDict(Foo='1')
+    process = ProcessRun("A process", uids=uids)
+    assert isinstance(process.uids, CompactCaseInsensitiveDict)
+    process.add_uid('bar', '2')
+    assert 'bar' not in uids
+
+    assert ProcessRun("Another process", uids=('Foo', '1')).uids['foo'] == '1'
+    assert ProcessRun("Another process", uids=process.uids).uids == process.uids
+    with pytest.raises(ValueError):
+        process.add_uid('FOO', '3')
+
+
+def test_compact_dict_is_a_dict():
+    """Test that code written for dicts still works with entity uids."""
+    process = ProcessRun("A process", uids={'Foo': '1'})
+    uids = process.uids
+    assert isinstance(uids, dict)
+    assert json.dumps(uids) == '{"Foo": "1"}'
+    assert dict(uids) == {**uids} == {'Foo': '1'}
+    assert type(uids.copy()) is CompactCaseInsensitiveDict
+
+    # dict methods that take keys ignore case, and check new keys
+    assert uids.setdefault('FOO', '2') == '1'
+    uids.update([('bar', '2')], baz='3')
+    with pytest.raises(ValueError):
+        uids.update(BAR='4')
+    assert uids.pop('BAZ') == '3'
+    assert uids.pop('baz', None) is None
+    with pytest.raises(KeyError):
+        uids.pop('baz')
+    assert uids == {'Foo': '1', 'bar': '2'}
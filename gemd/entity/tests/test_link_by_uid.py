@@ -1,6 +1,12 @@
 """General tests of LinkByUID dynamics."""
-from gemd.json import dumps, loads
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from gemd.json import dumps, loads, GEMDJson
 from gemd.entity.object.material_run import MaterialRun
+from gemd.entity.object.measurement_run import MeasurementRun
 from gemd.entity.object.process_run import ProcessRun
 from gemd.entity.object.ingredient_run import IngredientRun
 from gemd.entity.link_by_uid import LinkByUID
@@ -15,3 +21,57 @@ def test_link_by_uid():
 
     copy = loads(dumps(root))
     assert copy.process.ingredients[0].material == copy.process.ingredients[1].material
+
+
+def test_value_semantics():
+    """Test that links hash and compare by their case-insensitive scope and id."""
+    link = LinkByUID("Scope", "id1")
+    assert link == LinkByUID("scope", "id1")
+    assert hash(link) == hash(LinkByUID("SCOPE", "id1"))
+    assert link != LinkByUID("scope", "id2")
+    assert link != ("scope", "id1")
+    assert link.key == ("scope", "id1")
+    assert len({link, LinkByUID("scope", "id1"), LinkByUID("other", "id1")}) == 2
+
+    # The original case of the scope is preserved
+    assert link.scope == "Scope"
+    assert link.as_dict() == {"type": LinkByUID.typ, "scope": "Scope", "id": "id1"}
+
+
+def test_immutable():
+    """Test that links cannot be modified once created."""
+    link = LinkByUID("scope", "id1")
+    with pytest.raises(AttributeError):
+        link.scope = "other"
+    with pytest.raises(AttributeError):
+        link.id = "id2"
+    with pytest.raises(AttributeError):
+        del link.scope
+    with pytest.raises(AttributeError):
+        link.extra = "value"
+
+    assert pickle.loads(pickle.dumps(link)) == link
+    assert deepcopy(link).scope == "scope"
+
+    for scope in (None, 7, b"scope"):
+        with pytest.raises(TypeError, match="must be a string"):
+            LinkByUID(scope, "id1")
+
+
+def test_interning():
+    """Test that deserialized links with the same scope and id are the same object."""
+    links = GEMDJson().raw_loads(dumps([LinkByUID("scope", "id1"), LinkByUID("scope", "id1"),
+                                        LinkByUID("Scope", "id1")]))
+    assert links["object"][0] is links["object"][1]
+    # Links are only shared with the same case, so each keeps the scope it was written with
+    assert links["object"][2] is not links["object"][0]
+    assert links["object"][2] == links["object"][0]
+    assert [link.scope for link in links["object"]] == ["scope", "scope", "Scope"]
+
+    missing = MaterialRun(name='missing', uids={'scope': 'id1'})
+    meas1 = MeasurementRun(name='one', material=LinkByUID.from_entity(missing, 'scope'))
+    meas2 = MeasurementRun(name='two', material=LinkByUID.from_entity(missing, 'scope'))
+    copies = loads(dumps([meas1, meas2]))
+    assert copies[0].material is copies[1].material
+    assert LinkByUID.from_dict({"scope": "scope", "id": "id1"}) == copies[0].material
+    assert LinkByUID.from_dict(LinkByUID("scope", "id1").as_dict()) == copies[0].material
@@ -1,4 +1,5 @@
 """Tests of the ValidList class."""
+import numpy as np
 import pytest
 
 from gemd.entity.valid_list import ValidList
@@ -59,3 +60,37 @@ def test_invalid_content():
         ValidList(_list=tuple([1, 1]), content_type=1)
     with pytest.raises(TypeError):
         ValidList(_list=tuple([1, 1]), content_type=None)
+
+
+def test_extend_iterables():
+    """Test that extending from one-shot iterables and mixed types validates every value."""
+    lo_strings = ValidList([], str)
+    lo_strings.extend(x for x in 'abc')
+    assert lo_strings == ['a', 'b', 'c']
+
+    with pytest.raises(TypeError):
+        lo_strings.extend(['d'] * 100 + [1])
+    with pytest.raises(TypeError):
+        lo_strings.extend(x for x in [True, 'd'])
+    assert lo_strings == ['a', 'b', 'c']
+
+    class MyStr(str):
+        pass
+
+    lo_strings.extend([MyStr('d'), 'e'])
+    assert lo_strings == ['a', 'b', 'c', 'd', 'e']
+
+    # The constructor also iterates a generator only once
+    seen = []
+    from_generator = ValidList((x for x in 'abc'), str,
+                               trigger=lambda _, value: seen.append(value))
+    assert from_generator == ['a', 'b', 'c'] and seen == ['a', 'b', 'c']
+    with pytest.raises(TypeError):
+        ValidList((x for x in ['a', 1]), str)
+
+
+def test_arrays():
+    """Test that arrays are taken like any other iterable."""
+    floats = ValidList(np.array([1.0, 2.0]), float)
+    assert floats == [1.0, 2.0]
+    assert ValidList(np.array([]), float) == []
@@ -32,8 +32,10 @@ class ValidList(list):
         for elem in self._content_type:
             if not isinstance(elem, type):
                 raise TypeError('Content filters must be types')
-        for value in _list:
-            self._validate(value)
+        if not isinstance(_list, (list, tuple)):
+            # Iterate over generators, arrays and other iterables only once
+            _list = list(_list)
+        self._validate_all(_list)
         self._trigger = None
         if trigger is not None:
             if not callable(trigger):
@@ -66,6 +68,32 @@ class ValidList(list):
             raise TypeError(
                 'Value is not of an accepted type: {} =/= {}'.format(value, self._content_type))
 
+    def _validate_all(self, values):
+        """
+        Validate a sequence of values against the allowed types.
+
+        Each distinct type in the sequence is only checked once, which makes validating a long,
+        homogeneous sequence much cheaper than validating each element.
+
+        Parameters
+        ----------
+        values: Sequence
+            The values to validate.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        TypeError
+            If any value is not one of the allowed types.
+
+        """
+        for typ in set(map(type, values)):
+            if not issubclass(typ, self._content_type):
+                self._validate(next(value for value in values if type(value) is typ))
+
     def __setitem__(self, index, value):
         """
         Called to implement assignment to self[index].
@@ -116,12 +144,13 @@ class ValidList(list):
         """
         Extend the list by appending all the items in the given list; equivalent to a[len(a):] = L.
 
-        Validates that `value` is one of the allowed types.
+        Validates that every value is one of the allowed types, checking each distinct type
+        in `list_` once.
 
         Parameters
         ----------
-        list_: list
-            The list of values to append at the end of the list.
+        list_: Iterable
+            The values to append at the end of the list.
 
         Returns
         -------
@@ -129,11 +158,12 @@ class ValidList(list):
             `list_` is appended at the end of the list, if all its entries are valid.
 
         """
-        if isinstance(list_, Iterable):
-            for value in list_:
-                self._validate(value)
-        else:
+        if not isinstance(list_, Iterable):
             raise TypeError("'{}' object is not iterable".format(type(list_)))
+        if not isinstance(list_, (list, tuple)):
+            # Iterate over generators and other one-shot iterables only once
+            list_ = list(list_)
+        self._validate_all(list_)
         if self._trigger is not None:
             for value in list_:
                 self._trigger(self, value)
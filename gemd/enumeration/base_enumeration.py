@@ -23,11 +23,7 @@ class BaseEnumeration(Enum):
         """
         if name is None:
             return None
-        if any(name == e.value for e in cls):
-            return name
-        if any(name == e for e in cls):
-            return name.value
-        raise ValueError("'{}' is not a valid choice for enumeration {}".format(name, cls))
+        return cls.get_enum(name).value
 
     @classmethod
     def get_enum(cls, name):
@@ -36,11 +32,15 @@ class BaseEnumeration(Enum):
 
         If name is equal to one of the enum members, or to the value
         associated with an enum member, then return the relevant enumeration.
+        Values are looked up in the table from values to members that every
+        enumeration class builds when it is defined, rather than by a scan of the members.
         """
         if name is None:
             return None
-        if any(name == e.value for e in cls):
-            return next(e for e in cls if e.value == name)
-        if any(name == e for e in cls):
+        if isinstance(name, cls):
             return name
-        raise ValueError("'{}' is not a valid choice for enumeration {}".format(name, cls))
+        try:
+            return cls._value2member_map_[name]
+        except (KeyError, TypeError):
+            raise ValueError(
+                "'{}' is not a valid choice for enumeration {}".format(name, cls)) from None
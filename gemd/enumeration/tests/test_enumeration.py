@@ -2,7 +2,7 @@
 import pytest
 
 from gemd.entity.attribute.property import Property
-from gemd.enumeration import Origin
+from gemd.enumeration import Origin, SampleType
 from gemd.enumeration.base_enumeration import BaseEnumeration
 from gemd.json import loads, dumps
 
@@ -24,6 +24,13 @@ def test_values():
     with pytest.raises(ValueError):
         GoodClass.get_enum("Green")
 
+    # Members of other enumerations and unhashable values are not valid choices
+    with pytest.raises(ValueError):
+        Origin.get_value(SampleType.UNKNOWN)
+    with pytest.raises(ValueError):
+        Origin.get_enum(["unknown"])
+    assert Origin.get_enum("unknown") is Origin.UNKNOWN
+
 
 def test_json_serde():
     """Test that values can be ser/de using our custom json loads/dumps."""
@@ -0,0 +1,106 @@
+"""Helpers shared by the ingesters that pass ingested objects between processes or to files."""
+from copy import deepcopy
+from uuid import NAMESPACE_URL, uuid5
+
+from gemd.ingest import material_run_example
+from gemd.ingest.material_run_example import ingest_material_run
+from gemd.json import GEMDJson, TemplateCatalog
+
+# The scope of the unique identifiers given to copies of known templates that have none
+TEMPLATE_SCOPE = "auto"
+
+_KINDS = ("properties", "conditions", "parameters")
+
+# The copies of the known templates in a worker process
+_worker_templates = None
+
+
+class KnownTemplates(object):
+    """
+    Copies of the known templates of the ingester, each with a unique identifier.
+
+    Serializing an object gives each template it refers to a unique identifier if it has none,
+    which would change the ingester's own templates for everything ingested after. Instead,
+    the templates of ingested attributes are swapped for these copies before they are
+    serialized, and back once they are loaded. A copy has the unique identifiers of its
+    template, or one in the TEMPLATE_SCOPE scope derived from its kind and name, so that the
+    copies made by every process and every session have the same identifiers.
+    """
+
+    def __init__(self):
+        self._copies = {}
+        self._originals = {}
+        for kind in _KINDS:
+            for name, template in getattr(material_run_example, "known_" + kind).items():
+                copy = deepcopy(template)
+                if not copy.uids:
+                    copy.add_uid(TEMPLATE_SCOPE, str(uuid5(
+                        NAMESPACE_URL, "gemd.ingest/{}/{}".format(kind, name))))
+                self._copies[id(template)] = copy
+                self._originals[id(copy)] = template
+        self.catalog = TemplateCatalog(self._copies.values())
+
+    def use_copies(self, materials):
+        """Refer the attributes of the measurements of material runs to the copies."""
+        _swap_templates(materials, self._copies)
+
+    def use_originals(self, materials):
+        """Refer the attributes of the measurements of material runs back to the originals."""
+        _swap_templates(materials, self._originals)
+
+
+def _swap_templates(materials, replacements):
+    """Replace the templates of the attributes of the measurements of material runs."""
+    for material in materials:
+        for measurement in material.measurements:
+            for kind in _KINDS:
+                for attribute in getattr(measurement, kind):
+                    replacement = replacements.get(id(attribute.template))
+                    if replacement is not None:
+                        attribute.template = replacement
+
+
+def init_worker():
+    """Make the copies of the known templates of a worker process; the pool's initializer."""
+    global _worker_templates
+    _worker_templates = KnownTemplates()
+
+
+def worker_templates():
+    """Get the copies of the known templates made by :func:`init_worker` in this process."""
+    return _worker_templates
+
+
+def ingest_serialized(records):
+    """
+    Ingest records in a worker process, and serialize the material runs.
+
+    The known templates are left out of the string, and only linked to; see
+    :func:`load_serialized`.
+    """
+    materials = [ingest_material_run(record) for record in records]
+    _worker_templates.use_copies(materials)
+    return GEMDJson().dumps(materials, template_catalog=_worker_templates.catalog)
+
+
+def load_serialized(serialized, templates):
+    """
+    Load the material runs serialized by :func:`ingest_serialized` in a worker process.
+
+    Parameters
+    ----------
+    serialized: str
+        The serialized material runs.
+    templates: KnownTemplates
+        The copies of the known templates of this process, whose catalog resolves the links to
+        them. The attributes are then referred to the known templates of this process.
+
+    Returns
+    -------
+    List[MaterialRun]
+        The material runs.
+
+    """
+    materials = GEMDJson().loads(serialized, trusted=True, template_catalog=templates.catalog)
+    templates.use_originals(materials)
+    return materials
@@ -0,0 +1,151 @@
+"""Ingest a table of measurements, one column at a time."""
+import numpy as np
+
+from gemd.columnar import MeasurementColumns
+from gemd.entity.bounds.real_bounds import RealBounds
+from gemd.entity.template.condition_template import ConditionTemplate
+from gemd.entity.template.parameter_template import ParameterTemplate
+from gemd.entity.template.property_template import PropertyTemplate
+from gemd.units import IncompatibleUnitsError, UndefinedUnitError, UNIT_PARSE_ERRORS, \
+    convert_array, parse_units
+from gemd.validation.values import outside_real_bounds
+
+_template_kinds = [
+    (PropertyTemplate, "properties"),
+    (ConditionTemplate, "conditions"),
+    (ParameterTemplate, "parameters")
+]
+
+# The number of bad rows listed for each column in an error message
+_MAX_ROWS_REPORTED = 10
+
+
+class TableColumn(object):
+    """
+    How a column of a table becomes an attribute of each measurement.
+
+    Parameters
+    ----------
+    template: PropertyTemplate, ConditionTemplate or ParameterTemplate
+        The template of the attribute, which must have real bounds. Its type determines
+        whether the attribute is a property, condition or parameter.
+    units: str, optional
+        The units of the values in the column. Defaults to the units of the template's bounds.
+        Units that aren't recognized raise a ValueError.
+    name: str, optional
+        The name of the attribute. Defaults to the name of the template.
+    origin: str or Origin, optional
+        The origin of the attribute. Defaults to "measured."
+
+    """
+
+    def __init__(self, template, units=None, name=None, origin="measured"):
+        kinds = [kind for typ, kind in _template_kinds if isinstance(template, typ)]
+        if not kinds:
+            raise TypeError("A column's template must be a property, condition or parameter "
+                            "template: {}".format(template))
+        if not isinstance(template.bounds, RealBounds):
+            raise ValueError("Only templates with real bounds can be used for a column, "
+                             "not {}".format(type(template.bounds).__name__))
+        self.kind = kinds[0]
+        self.template = template
+        if units is None:
+            units = template.bounds.default_units
+        else:
+            try:
+                parse_units(units)
+            except UNIT_PARSE_ERRORS as err:
+                raise ValueError("The units '{}' of a column of {} aren't recognized: "
+                                 "{}".format(units, template.name, err))
+        self.units = units
+        self.name = template.name if name is None else name
+        self.origin = origin
+
+
+def ingest_dataframe(table, columns, spec=None, material=None, name_column=None):
+    """
+    Ingest a table of measurements, in which each row is a measurement run.
+
+    Each column is validated and converted as a whole: its values are converted to the units of
+    its template's bounds in one vectorized operation and checked against those bounds.
+    Every problem in every column is collected before raising, so one error describes them all.
+    Empty cells (NaN or None) leave the attribute off of that row's measurement.
+
+    The result is columnar, so a very large table never has to be turned into objects:
+    :meth:`~gemd.columnar.MeasurementColumns.as_dicts` serializes it directly and
+    :meth:`~gemd.columnar.MeasurementColumns.to_runs` builds the measurement runs.
+
+    Requires pandas.
+
+    Parameters
+    ----------
+    table: pandas.DataFrame
+        The table, with a row per measurement.
+    columns: Dict[str, TableColumn or AttributeTemplate]
+        How each column of the table that holds an attribute becomes one, by column name.
+        A template on its own is the same as a :class:`TableColumn` with only that template.
+    spec: MeasurementSpec or LinkByUID, optional
+        The spec of every measurement.
+    material: MaterialRun or LinkByUID, optional
+        The material that every measurement is of.
+    name_column: str, optional
+        The column that holds the name of each measurement. Measurements whose cell is empty
+        have no name.
+
+    Returns
+    -------
+    MeasurementColumns
+        The measurements, with a column for each attribute.
+
+    Raises
+    ------
+    ValueError
+        If any column has values that aren't numbers, have incompatible or unknown units,
+        or are out of the bounds of its template.
+
+    """
+    size = len(table)
+    result = MeasurementColumns(size, spec=spec)
+    if name_column is not None:
+        names = table[name_column]
+        result.names = [None if missing else str(name)
+                        for name, missing in zip(names, names.isna())]
+    if material is not None:
+        result.materials = [material] * size
+    rows = np.asarray(table.index)
+
+    problems = []
+    for column_name, column in columns.items():
+        if not isinstance(column, TableColumn):
+            column = TableColumn(column)
+        bounds = column.template.bounds
+        try:
+            values = np.asarray(table[column_name], dtype=np.float64)
+        except (TypeError, ValueError):
+            problems.append("Column '{}' has values that aren't numbers".format(column_name))
+            continue
+        try:
+            values = convert_array(values, column.units, bounds.default_units)
+        except (IncompatibleUnitsError, UndefinedUnitError):
+            problems.append("Column '{}' is in units '{}', which can't be converted to "
+                            "'{}'".format(column_name, column.units, bounds.default_units))
+            continue
+
+        present = ~np.isnan(values)
+        outside = present & outside_real_bounds(values, values, bounds)
+        if outside.any():
+            bad = rows[outside].tolist()
+            listed = ", ".join(str(row) for row in bad[:_MAX_ROWS_REPORTED])
+            if len(bad) > _MAX_ROWS_REPORTED:
+                listed += ", ... ({} rows in total)".format(len(bad))
+            problems.append("Column '{}' is outside of [{}, {}] {} in rows {}".format(
+                column_name, bounds.lower_bound, bounds.upper_bound, bounds.default_units,
+                listed))
+            continue
+
+        result.add_column(column.kind, column.name, values, units=bounds.default_units,
+                          origin=column.origin, template=column.template, present=present)
+
+    if problems:
+        raise ValueError("Could not ingest the table:\n" + "\n".join(problems))
+    return result
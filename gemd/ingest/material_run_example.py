@@ -1,5 +1,4 @@
 """An example ingest of a material run."""
-from gemd import units
 from gemd.entity.attribute.condition import Condition
 from gemd.entity.attribute.parameter import Parameter
 from gemd.entity.attribute.property import Property
@@ -10,8 +9,8 @@ from gemd.entity.template.condition_template import ConditionTemplate
 from gemd.entity.template.parameter_template import ParameterTemplate
 from gemd.entity.template.property_template import PropertyTemplate
 from gemd.entity.value.discrete_categorical import DiscreteCategorical
-from gemd.entity.value.nominal_real import NominalReal
-from gemd.entity.value.normal_real import NormalReal
+from gemd.entity.value.nominal_categorical import NominalCategorical
+from gemd.ingest.value_parser import ValueParser
 
 known_properties = {
     "density": PropertyTemplate(
@@ -39,44 +38,21 @@ known_parameters = {
 }
 
 
+_parser = ValueParser(strict=False)
+
+
 def _parse_value(val):
-    """Example field-parsing logic."""
-    # If the string is complicated, split it up and try to get uncertainty and/or units
-    if isinstance(val, str) and len(val.split()) > 1:
-        toks = val.split()
-        mean = float(toks[0])
-        std = -1
-        if toks[1] in {"+-", "+/-"}:
-            std = float(toks[2])
-
-        try:
-            unit = units.parse_units(toks[-1])
-        except (ValueError, units.UndefinedUnitError):
-            print("Couldn't find {}".format(toks[-1]))
-            unit = ''
-
-        if std >= 0:
-            return NormalReal(mean=mean, std=std, units=unit)
-        else:
-            return NominalReal(mean, units=unit)
-    # if it is just a number wrap it in a nominal value
-    elif isinstance(val, (float, int)):
-        return NominalReal(val, '')
-    # if it is a single string, its either a single number of a category
-    elif isinstance(val, str):
-        try:
-            num = float(val)
-            return NominalReal(num, '')
-        except ValueError:
-            return DiscreteCategorical(val)
-    else:
-        raise ValueError("Couldn't parse {}".format(val))
+    """Example field-parsing logic, in which categories are discrete and unknown units are ''."""
+    value = _parser.parse(val)
+    if isinstance(value, NominalCategorical):
+        return DiscreteCategorical(value.category)
+    return value
 
 
 def ingest_material_run(data, material_spec=None, process_run=None):
     """Ingest material run with data, a material spec, and an originating process run."""
     if isinstance(data, list):
-        return [ingest_material_run(x, material_spec) for x in data]
+        return [ingest_material_run(x, material_spec, process_run) for x in data]
 
     if not isinstance(data, dict):
         raise ValueError("This ingester operates on dict, but got {}".format(type(data)))
@@ -94,29 +70,21 @@ def ingest_material_run(data, material_spec=None, process_run=None):
     for experiment in data.get("experiments", []):
         measurement = MeasurementRun()
 
-        for name in set(known_properties.keys()).intersection(experiment.keys()):
-            prop = Property(
-                name=name,
-                template=known_properties[name],
-                value=_parse_value(experiment[name])
-            )
-            measurement.properties.append(prop)
-
-        for name in set(known_conditions.keys()).intersection(experiment.keys()):
-            cond = Condition(
-                name=name,
-                template=known_conditions[name],
-                value=_parse_value(experiment[name])
-            )
-            measurement.conditions.append(cond)
-
-        for name in set(known_parameters.keys()).intersection(experiment.keys()):
-            param = Parameter(
-                name=name,
-                template=known_parameters[name],
-                value=_parse_value(experiment[name])
-            )
-            measurement.parameters.append(param)
+        measurement.add_properties(
+            Property(name=name, template=known_properties[name],
+                     value=_parse_value(experiment[name]))
+            for name in known_properties if name in experiment
+        )
+        measurement.add_conditions(
+            Condition(name=name, template=known_conditions[name],
+                      value=_parse_value(experiment[name]))
+            for name in known_conditions if name in experiment
+        )
+        measurement.add_parameters(
+            Parameter(name=name, template=known_parameters[name],
+                      value=_parse_value(experiment[name]))
+            for name in known_parameters if name in experiment
+        )
 
         scan_id = experiment.get("scan_id")
         if scan_id:
@@ -129,7 +97,7 @@ def ingest_material_run(data, material_spec=None, process_run=None):
         measurement.material = material
 
     if material_spec:
-        material.material_spec = material_spec
+        material.spec = material_spec
 
     if process_run:
         material.process = process_run
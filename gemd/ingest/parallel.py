@@ -0,0 +1,66 @@
+"""Ingest many material run records at once, across a pool of processes."""
+from itertools import islice
+from multiprocessing import Pool
+
+from gemd.ingest._common import KnownTemplates, ingest_serialized, init_worker, \
+    load_serialized
+
+
+def ingest_material_runs_parallel(records, processes=None, chunksize=100,
+                                  material_spec=None, process_run=None):
+    """
+    Ingest material run records in parallel, with the same result as :func:`ingest_material_run`.
+
+    The records are split into chunks, and each chunk is ingested by a worker in a pool of
+    processes. A worker sends back each chunk as a single json string written by
+    :meth:`~gemd.json.GEMDJson.dumps`, rather than pickling every object, and leaves the known
+    property, condition and parameter templates out of it.
+    Those are reattached by unique identifier, to copies of the known templates that have one
+    (see :class:`~gemd.ingest._common.KnownTemplates`), and then swapped for the known
+    templates themselves. So every attribute in the result refers to the same template objects
+    in this process, as the serial ingester's do, and the known templates aren't changed.
+    Every object in the result is assigned a unique identifier.
+
+    Parameters
+    ----------
+    records: Iterable[dict]
+        The records to ingest, each in the form taken by :func:`ingest_material_run`.
+        An iterator is consumed a chunk at a time.
+    processes: int, optional
+        The number of worker processes. Defaults to the number of CPUs.
+    chunksize: int, optional
+        The number of records sent to a worker at a time.
+    material_spec: MaterialSpec, optional
+        The spec of every material run.
+    process_run: ProcessRun, optional
+        The process that produced every material run.
+
+    Returns
+    -------
+    List[MaterialRun]
+        A material run for each record, in order.
+
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive, not {}".format(chunksize))
+    templates = KnownTemplates()
+    materials = []
+    with Pool(processes, initializer=init_worker) as pool:
+        for chunk in pool.imap(ingest_serialized, _chunks(records, chunksize)):
+            materials.extend(load_serialized(chunk, templates))
+
+    for material in materials:
+        if material_spec:
+            material.spec = material_spec
+        if process_run:
+            material.process = process_run
+    return materials
+
+
+def _chunks(records, chunksize):
+    """Split records into lists of at most chunksize records."""
+    records = iter(records)
+    chunk = list(islice(records, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(records, chunksize))
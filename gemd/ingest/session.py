@@ -0,0 +1,250 @@
+"""Ingest records incrementally, so that ingesting a record again doesn't duplicate it."""
+from collections import OrderedDict
+from hashlib import sha1
+import json as json_builtin
+
+from gemd.entity.base_entity import BaseEntity
+from gemd.ingest.material_run_example import ingest_material_run
+from gemd.ingest._common import KnownTemplates
+from gemd.json import GEMDEncoder
+from gemd.util import flatten, substitute_links
+from gemd.entity.template_lookup import template_keys
+
+SAMPLE_ID = "given_sample_id"
+SCAN_ID = "given_scan_id"
+
+# The fields of a measurement that don't contribute to its fingerprint
+_UNFINGERPRINTED = {"uids", "material", "type"}
+
+
+class IngestSession(object):
+    """
+    Ingest material run records so that ingesting the same record twice creates nothing new.
+
+    Material runs are identified by their given sample ids, and measurement runs by their given
+    scan ids. A record for a sample that has already been ingested adds its experiments to the
+    existing material run. An experiment whose scan id has been seen updates that measurement
+    run, and moves it to the record's material, unless its content is unchanged, which is
+    decided by comparing fingerprints of the measurements. An experiment without a scan id is
+    only added if its material didn't already have a measurement with the same fingerprint.
+    Records without a sample id always create a new material run.
+
+    The attributes of the material runs that are ingested refer to copies of the known
+    templates, which have unique identifiers that are the same in every session (see
+    :class:`~gemd.ingest._common.KnownTemplates`), so that they can be written out and linked
+    to. The known templates themselves aren't changed.
+
+    The entities that were created or changed are collected, so that only they need to be
+    written out; see :meth:`delta` and :meth:`dumps_delta`.
+
+    Parameters
+    ----------
+    materials: Iterable[MaterialRun], optional
+        Material runs from an earlier ingest, such as ones loaded from a file, to index.
+        They and their measurements aren't part of the delta.
+
+    """
+
+    def __init__(self, materials=()):
+        self._templates = KnownTemplates()
+        self._materials = {}
+        self._measurements = {}
+        # Fingerprints of measurements by scan id, and of those without one by sample id
+        self._fingerprints = {}
+        self._unscanned = {}
+        self._changed = OrderedDict()
+        self._written_templates = set()
+        for material in materials:
+            self._index_material(material)
+            for measurement in material.measurements:
+                for attribute in _attributes(measurement):
+                    self._written_templates.update(_template_keys(attribute.template))
+
+    def ingest(self, data, material_spec=None, process_run=None):
+        """
+        Ingest a record, or a list of them, into the material runs already ingested.
+
+        Parameters
+        ----------
+        data: dict or List[dict]
+            The record(s), in the form taken by :func:`ingest_material_run`.
+        material_spec: MaterialSpec, optional
+            The spec of the material run.
+        process_run: ProcessRun, optional
+            The process that produced the material run.
+
+        Returns
+        -------
+        MaterialRun or List[MaterialRun]
+            The material run of each record, which is an existing one if its sample id has been
+            seen before.
+
+        """
+        if isinstance(data, list):
+            return [self.ingest(x, material_spec, process_run) for x in data]
+        # The spec and process are only given to the material run that is kept, so that the
+        # process's output material isn't left pointing at a run that is thrown away
+        fresh = ingest_material_run(data)
+        self._templates.use_copies([fresh])
+
+        sample_id = fresh.uids.get(SAMPLE_ID)
+        material = self._materials.get(sample_id) if sample_id else None
+        changed = material is None
+        if material is None:
+            material = fresh
+            if sample_id:
+                self._materials[sample_id] = material
+        elif fresh.tags != material.tags:
+            material.tags = list(fresh.tags)
+            changed = True
+        if material_spec is not None and material.spec is not material_spec:
+            material.spec = material_spec
+            changed = True
+        if process_run is not None and process_run.output_material is not material:
+            # The output material is a soft link, which isn't written, so only a new process
+            # changes the material
+            changed = changed or material.process is not process_run
+            material.process = process_run
+        if changed:
+            self._mark(material)
+
+        # Experiments without scan ids are only compared to the measurements from before
+        previous = set()
+        if material is not fresh:
+            previous.update(self._unscanned.get(sample_id, ()))
+            previous.update(self._fingerprints[measurement.uids[SCAN_ID]]
+                            for measurement in material.measurements
+                            if SCAN_ID in measurement.uids)
+        for measurement in list(fresh.measurements):
+            self._merge_measurement(material, measurement, previous)
+        return material
+
+    def delta(self):
+        """
+        Get the entities created or changed since the last call, and start collecting anew.
+
+        Returns
+        -------
+        List[BaseEntity]
+            The material runs and measurement runs that were created or changed, followed by
+            any templates that haven't been in a delta before.
+
+        """
+        entities = list(self._changed.values())
+        self._changed.clear()
+        for entity in entities:
+            for attribute in _attributes(entity):
+                keys = _template_keys(attribute.template)
+                if keys and self._written_templates.isdisjoint(keys):
+                    self._written_templates.update(keys)
+                    entities.append(attribute.template)
+        return entities
+
+    def dumps_delta(self):
+        """
+        Serialize the entities created or changed since the last call, and start collecting anew.
+
+        The string is in the form written by :func:`gemd.json.dumps`, but only the entities in
+        the :meth:`delta` are in its context. Other entities that they refer to are only linked
+        to.
+
+        Returns
+        -------
+        str
+            The serialized delta.
+
+        """
+        entities = self.delta()
+        included = {id(entity) for entity in entities}
+        res = {"object": entities}
+        context = flatten(res, exclude=lambda entity: id(entity) not in included)
+        res = substitute_links(res)
+        res["context"] = context
+        return json_builtin.dumps(res, cls=GEMDEncoder, sort_keys=True)
+
+    def _index_material(self, material):
+        """Remember a material run and its measurement runs."""
+        sample_id = material.uids.get(SAMPLE_ID)
+        if sample_id:
+            self._materials[sample_id] = material
+        for measurement in material.measurements:
+            self._index_measurement(measurement, _fingerprint(measurement), sample_id)
+
+    def _index_measurement(self, measurement, fingerprint, sample_id):
+        """
+        Remember a measurement run and its fingerprint.
+
+        The fingerprint of a measurement without a scan id is only kept if its material has a
+        sample id, since nothing else can be merged into that material.
+        """
+        scan_id = measurement.uids.get(SCAN_ID)
+        if scan_id:
+            self._measurements[scan_id] = measurement
+            self._fingerprints[scan_id] = fingerprint
+        elif sample_id:
+            self._unscanned.setdefault(sample_id, set()).add(fingerprint)
+
+    def _merge_measurement(self, material, measurement, previous):
+        """Add a newly ingested measurement run to a material, unless it is already known."""
+        fingerprint = _fingerprint(measurement)
+        scan_id = measurement.uids.get(SCAN_ID)
+        existing = self._measurements.get(scan_id) if scan_id else None
+        if existing is None:
+            if not scan_id and fingerprint in previous:
+                measurement.material = None
+                return
+            if measurement.material is not material:
+                measurement.material = material
+            self._index_measurement(measurement, fingerprint, material.uids.get(SAMPLE_ID))
+            self._mark(measurement)
+            return
+
+        measurement.material = None
+        if self._fingerprints[scan_id] == fingerprint and existing.material is material:
+            return
+        existing.name = measurement.name
+        existing.tags = list(measurement.tags)
+        existing.properties = list(measurement.properties)
+        existing.conditions = list(measurement.conditions)
+        existing.parameters = list(measurement.parameters)
+        if existing.material is not material:
+            existing.material = material
+        self._fingerprints[scan_id] = fingerprint
+        self._mark(existing)
+
+    def _mark(self, entity):
+        """Add an entity to the delta."""
+        self._changed[id(entity)] = entity
+
+
+def _attributes(entity):
+    """Get the properties, conditions and parameters of an entity."""
+    attributes = []
+    for kind in ("properties", "conditions", "parameters"):
+        attributes.extend(getattr(entity, kind, None) or ())
+    return attributes
+
+
+def _template_keys(template):
+    """Get the lookup keys of a template, or none if it is a link, which isn't written."""
+    if isinstance(template, BaseEntity):
+        return set(template_keys(template))
+    return set()
+
+
+def _fingerprint(measurement):
+    """Hash the content of a measurement run, leaving out its identifiers and material."""
+    content = substitute_links({key: value for key, value in measurement.as_dict().items()
+                                if key not in _UNFINGERPRINTED})
+    # The order of the attributes depends on how they were added, which can differ between
+    # processes, so they are sorted by their names and then by the rest of their content
+    for kind in ("properties", "conditions", "parameters"):
+        if content.get(kind):
+            content[kind] = sorted(content[kind], key=_attribute_key)
+    encoded = json_builtin.dumps(content, cls=GEMDEncoder, sort_keys=True)
+    return sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _attribute_key(attribute):
+    """Get a key to sort attributes by that doesn't depend on the process."""
+    return attribute.name, json_builtin.dumps(attribute, cls=GEMDEncoder, sort_keys=True)
@@ -0,0 +1,182 @@
+"""Ingest an unbounded stream of material run records, a record at a time."""
+from collections import deque
+import json as json_builtin
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+from functools import partial
+
+from gemd.ingest._common import KnownTemplates, ingest_serialized, init_worker, \
+    load_serialized, worker_templates
+from gemd.ingest.material_run_example import ingest_material_run
+from gemd.json import GEMDJson
+
+
+def read_records(source):
+    """
+    Read records lazily, one at a time.
+
+    Parameters
+    ----------
+    source: str, file or Iterable[dict]
+        The path of a file with a json record on each line, an open file of the same, or any
+        iterable of records. Blank lines are skipped.
+
+    Yields
+    ------
+    dict
+        Each record, in order.
+
+    """
+    if isinstance(source, str):
+        with open(source, "r") as fp:
+            for record in _read_lines(fp):
+                yield record
+    elif hasattr(source, "readline"):
+        for record in _read_lines(source):
+            yield record
+    else:
+        for record in source:
+            yield record
+
+
+def ingest_stream(source, workers=0, processes=False, max_pending=None):
+    """
+    Ingest a stream of records lazily, yielding a material run as each record is ingested.
+
+    Records are only read as there is room for them, so however long the stream is, at most
+    `max_pending` records are held at once.
+
+    Parameters
+    ----------
+    source: str, file or Iterable[dict]
+        The records, in any form taken by :func:`read_records`.
+    workers: int, optional
+        The number of threads or processes that ingest records. By default, records are
+        ingested in the calling thread. The material runs are still yielded in the order of
+        their records.
+    processes: bool, optional
+        Whether the workers are processes rather than threads. Each material run is sent back
+        as json without the known templates, and linked to the known templates of this
+        process when it is loaded, as by
+        :func:`~gemd.ingest.parallel.ingest_material_runs_parallel`.
+    max_pending: int, optional
+        The most records that are waiting to be ingested or collected at a time.
+        Defaults to twice the number of workers.
+
+    Yields
+    ------
+    MaterialRun
+        The material run of each record, in order.
+
+    """
+    records = read_records(source)
+    if not workers:
+        for record in records:
+            yield ingest_material_run(record)
+        return
+    if not processes:
+        with ThreadPool(workers) as pool:
+            for material in _bounded_map(pool, ingest_material_run, records,
+                                         max_pending or 2 * workers):
+                yield material
+        return
+
+    templates = KnownTemplates()
+    with Pool(workers, initializer=init_worker) as pool:
+        for serialized in _bounded_map(pool, ingest_serialized,
+                                       ([record] for record in records),
+                                       max_pending or 2 * workers):
+            yield load_serialized(serialized, templates)[0]
+
+
+def write_ndjson(source, fp, workers=0, processes=False, max_pending=None):
+    """
+    Ingest a stream of records, writing each material run to a file as a line of json.
+
+    Each line is a material run and its measurements serialized as by
+    :func:`gemd.json.dumps`, including their templates, and can be read back with
+    :func:`gemd.json.loads`. Known templates that have no unique identifier are written as
+    copies that have one, the same on every line, and aren't changed themselves. Records are
+    read, ingested and written as they go, with at most `max_pending` of them in flight at
+    once, so an unbounded stream is written in constant memory.
+
+    Parameters
+    ----------
+    source: str, file or Iterable[dict]
+        The records, in any form taken by :func:`read_records`.
+    fp: file
+        The open file to write the lines to.
+    workers: int, optional
+        The number of threads or processes that ingest and serialize records. By default,
+        records are handled in the calling thread. Lines are still written in order.
+    processes: bool, optional
+        Whether the workers are processes rather than threads. Only serialized lines pass
+        between processes.
+    max_pending: int, optional
+        The most records that are waiting to be ingested or written at a time.
+        Defaults to twice the number of workers.
+
+    Returns
+    -------
+    int
+        The number of lines written.
+
+    """
+    records = read_records(source)
+    count = 0
+    if not workers:
+        templates = KnownTemplates()
+        for record in records:
+            fp.write(_ingest_line(record, templates))
+            count += 1
+        return count
+
+    if processes:
+        pool = Pool(workers, initializer=init_worker)
+        ingest_line = _ingest_line
+    else:
+        pool = ThreadPool(workers)
+        ingest_line = partial(_ingest_line, templates=KnownTemplates())
+    with pool:
+        for line in _bounded_map(pool, ingest_line, records, max_pending or 2 * workers):
+            fp.write(line)
+            count += 1
+    return count
+
+
+def _read_lines(fp):
+    """Parse each line of a file that isn't blank as json."""
+    for line in fp:
+        if line.strip():
+            yield json_builtin.loads(line)
+
+
+def _ingest_line(record, templates=None):
+    """
+    Ingest a record and serialize it as a line of json.
+
+    The line refers to copies of the known templates, which have the same unique identifiers
+    on every line. By default, they are the copies made by the initializer of a worker process.
+    """
+    if templates is None:
+        templates = worker_templates()
+    material = ingest_material_run(record)
+    templates.use_copies([material])
+    return GEMDJson().dumps(material) + "\n"
+
+
+def _bounded_map(pool, func, items, max_pending):
+    """
+    Apply a function to items in a pool, with a bounded number of them in flight.
+
+    An item is only taken once there is room for it, and results are yielded in order, so the
+    oldest result is waited on whenever the limit is reached.
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(func, (item,)))
+    while pending:
+        yield pending.popleft().get()
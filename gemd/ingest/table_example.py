@@ -1,25 +1,24 @@
 """Ingest a table."""
-from gemd.entity.attribute.condition import Condition
-from gemd.entity.attribute.property import Property
-from gemd.entity.object import MeasurementRun
-from gemd.entity.value.nominal_real import NominalReal
+from gemd.columnar import MeasurementColumns
 
 known_properties = ["vapor pressure"]
 known_conditions = ["temperature"]
 
 
 def ingest_table(material_run, table):
-    """Ingest a material run into an existing table."""
-    for _, row in table.iterrows():
-        exp = MeasurementRun()
-        for prop_name in known_properties:
-            if prop_name in row:
-                exp.properties.append(Property(name=prop_name,
-                                               value=NominalReal(row[prop_name], '')))
-        for cond_name in known_conditions:
-            if cond_name in row:
-                exp.conditions.append(Condition(name=cond_name,
-                                                value=NominalReal(row[cond_name], '')))
-        exp.material = material_run
+    """
+    Ingest a material run into an existing table.
+
+    Each known column becomes an attribute of every row's measurement, one column at a time,
+    as in :func:`~gemd.ingest.dataframe.ingest_dataframe`. Empty cells leave the attribute off
+    of that row's measurement.
+    """
+    columns = MeasurementColumns(len(table))
+    for kind, names in (("properties", known_properties), ("conditions", known_conditions)):
+        for name in names:
+            if name in table:
+                columns.add_column(kind, name, table[name])
+    columns.materials = [material_run] * len(table)
+    columns.to_runs()
 
     return material_run
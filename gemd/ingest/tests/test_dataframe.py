@@ -0,0 +1,91 @@
+"""Test ingesting a table a column at a time."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gemd.entity.bounds import CategoricalBounds, RealBounds
+from gemd.entity.object import MaterialRun, MeasurementSpec
+from gemd.entity.template import ConditionTemplate, MaterialTemplate, ParameterTemplate, \
+    PropertyTemplate
+from gemd.entity.value import NominalReal
+from gemd.ingest.dataframe import ingest_dataframe, TableColumn
+from gemd.json import GEMDJson
+
+density = PropertyTemplate("density", bounds=RealBounds(0, 20, "g/cm^3"))
+temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 1000, "K"))
+speed = ParameterTemplate("speed", bounds=RealBounds(0, 10, "m/s"))
+
+
+def test_ingest_dataframe():
+    """Test that columns are converted to the units of their templates."""
+    table = pd.DataFrame({
+        "sample": ["a", "b", np.nan],
+        "rho": [1000.0, 2500.0, np.nan],
+        "T": [20.0, None, 100.0],
+        "speed": [1, 2, 3]
+    })
+    material = MaterialRun("material")
+    spec = MeasurementSpec("spec")
+    columns = {
+        "rho": TableColumn(density, units="kg/m^3"),
+        "T": TableColumn(temperature, units="degC", name="T", origin="specified"),
+        "speed": speed
+    }
+    result = ingest_dataframe(table, columns, spec=spec, material=material,
+                              name_column="sample")
+    assert len(result) == 3
+    np.testing.assert_allclose(result.column("density").mean, [1.0, 2.5, np.nan])
+    np.testing.assert_allclose(result.column("T").mean, [293.15, np.nan, 373.15])
+
+    dicts = result.as_dicts()
+    runs = result.to_runs()
+    assert [run.name for run in runs] == ["a", "b", None]
+    assert all(run.material is material and run.spec is spec for run in runs)
+    assert runs[0].properties[0].value.nominal == pytest.approx(1.0)
+    assert runs[0].properties[0].value.units == "gram / centimeter ** 3"
+    assert runs[0].properties[0].template is density
+    assert runs[0].conditions[0].origin == "specified"
+    assert runs[1].conditions == [] and runs[2].properties == []
+    assert runs[2].parameters[0].value == NominalReal(3, "m/s")
+    assert len(material.measurements) == 3
+
+    # Serializing the columns directly matches serializing the runs
+    assert dicts == [json.loads(GEMDJson().thin_dumps(run)) for run in runs]
+
+
+def test_bad_columns():
+    """Test that every problem in every column is reported at once."""
+    table = pd.DataFrame({
+        "rho": np.arange(30, dtype=float),
+        "T": [300.0] * 30,
+        "text": ["x"] * 30,
+        "speed": [1.0] * 30
+    }, index=range(100, 130))
+    columns = {
+        "rho": density,
+        "T": TableColumn(temperature, units="m"),
+        "text": density,
+        "speed": TableColumn(speed, units="furlongs")
+    }
+    with pytest.raises(ValueError) as error:
+        ingest_dataframe(table, columns)
+    message = str(error.value)
+    assert "'rho' is outside of [0, 20] gram / centimeter ** 3 in rows 121, 122" in message
+    assert "(9 rows in total)" not in message and "129" in message
+    assert "'T' is in units 'm'" in message
+    assert "'text' has values that aren't numbers" in message
+    assert "'speed' is in units 'furlongs'" in message
+
+    table = pd.DataFrame({"rho": np.arange(40, dtype=float)})
+    with pytest.raises(ValueError, match=r"\(19 rows in total\)"):
+        ingest_dataframe(table, {"rho": density})
+
+    with pytest.raises(TypeError):
+        TableColumn(MaterialTemplate("material"))
+    with pytest.raises(ValueError):
+        TableColumn(PropertyTemplate("color", bounds=CategoricalBounds(["red"])))
+    for bad_units in ("bogus", "kg/", "((m"):
+        with pytest.raises(ValueError, match="aren't recognized"):
+            TableColumn(density, units=bad_units)
@@ -1,6 +1,9 @@
 """Test the ingestion of a material run."""
+import pytest
+
+from gemd.entity.value import DiscreteCategorical, NominalReal, NormalReal
 from gemd.json import dump, load
-from gemd.ingest.material_run_example import ingest_material_run
+from gemd.ingest.material_run_example import _parse_value, ingest_material_run
 import tempfile
 
 # Example data (that could have been loaded from a json file)
@@ -78,3 +81,17 @@ def test_example_with_temp():
 
         # very cursory check that we get out what we'd expect
         assert next(iter(copy.uids.values())) == example["sample_id"]
+
+
+def test_parse_value():
+    """Test the values that fields are parsed into, including the failures."""
+    assert _parse_value("1.0 +- 0.5 g/cm^3") == NormalReal(1.0, 0.5, "g/cm^3")
+    assert _parse_value("300 degF") == NominalReal(300, "degF")
+    assert _parse_value(2) == NominalReal(2, "")
+    # As before the value parser, categories are discrete, and units that aren't recognized
+    # are dimensionless
+    assert _parse_value("low") == DiscreteCategorical("low")
+    assert _parse_value("300 blarg") == NominalReal(300, "")
+    assert _parse_value("2 +- 1 blarg") == NormalReal(2, 1, "")
+    with pytest.raises(ValueError):
+        _parse_value(None)
@@ -0,0 +1,52 @@
+"""Test ingesting material run records across processes."""
+import pytest
+
+from gemd.entity.object import MaterialSpec, ProcessRun
+from gemd.entity.valid_list import ValidList
+from gemd.ingest.material_run_example import ingest_material_run, known_conditions, \
+    known_properties
+from gemd.ingest.parallel import ingest_material_runs_parallel
+from gemd.ingest.tests.test_material_run_example import example
+
+
+def _records(count):
+    """Make records with distinct sample ids."""
+    for i in range(count):
+        record = dict(example)
+        record["sample_id"] = "sample-{}".format(i)
+        yield record
+
+
+def test_parallel_ingest():
+    """Test that the parallel ingest matches the serial one, sharing the known templates."""
+    uids = {name: dict(template.uids) for name, template in known_properties.items()}
+    spec = MaterialSpec("spec")
+    process = ProcessRun("process")
+    materials = ingest_material_runs_parallel(_records(7), processes=2, chunksize=3,
+                                              material_spec=spec, process_run=process)
+    serial = ingest_material_run(list(_records(7)), material_spec=spec, process_run=process)
+
+    assert [m.uids["given_sample_id"] for m in materials] == \
+        [m.uids["given_sample_id"] for m in serial]
+    for material, expected in zip(materials, serial):
+        assert material.spec is spec and material.process is process
+        assert len(material.measurements) == len(expected.measurements)
+        for measurement, other in zip(material.measurements, expected.measurements):
+            assert measurement.material is material
+            assert measurement.tags == other.tags
+            assert {p.name: p.value for p in measurement.properties} == \
+                {p.name: p.value for p in other.properties}
+
+    density = materials[0].measurements[0].properties[0]
+    assert density.template is known_properties[density.name]
+    temperature = materials[-1].measurements[-1].conditions[0]
+    assert temperature.template is known_conditions["temperature"]
+    assert isinstance(materials[0].measurements[0].properties, ValidList)
+    # The known templates are serialized as copies, so they aren't given unique identifiers
+    assert {name: template.uids for name, template in known_properties.items()} == uids
+
+    assert ingest_material_runs_parallel([], processes=1) == []
+    with pytest.raises(ValueError):
+        ingest_material_runs_parallel([example], chunksize=0)
+    with pytest.raises(ValueError):
+        ingest_material_runs_parallel(["not a record"], processes=1)
@@ -0,0 +1,173 @@
+"""Test ingesting records incrementally."""
+import copy
+import os
+import subprocess
+import sys
+
+from gemd.entity.object import MaterialRun, MaterialSpec, ProcessRun
+from gemd.entity.template import PropertyTemplate
+from gemd.ingest.material_run_example import known_properties
+from gemd.ingest.session import IngestSession
+from gemd.ingest.tests.test_material_run_example import example
+from gemd.json import dumps, loads
+
+
+def _record():
+    """Make a copy of the example record, with a scan id for each experiment."""
+    record = copy.deepcopy(example)
+    for i, experiment in enumerate(record["experiments"]):
+        experiment["scan_id"] = "scan-{}".format(i)
+    return record
+
+
+def test_idempotent():
+    """Test that ingesting the same records again changes nothing."""
+    session = IngestSession()
+    material = session.ingest(_record())
+    delta = session.delta()
+    assert delta[0] is material
+    assert sum(isinstance(e, PropertyTemplate) for e in delta) == 2
+    assert len(delta) == 1 + 5 + 4  # and the templates that are used
+
+    assert session.ingest([_record()]) == [material]
+    assert session.delta() == []
+    assert session.dumps_delta().count("measurement_run") == 0
+    assert len(material.measurements) == 5
+
+
+def test_changes():
+    """Test that new, changed and moved experiments are merged into existing materials."""
+    session = IngestSession()
+    material = session.ingest(_record())
+    session.delta()
+
+    record = _record()
+    record["tags"] = ["retagged"]
+    record["experiments"][0]["density"] = "2.0 +- 0.1 g/cm^3"
+    record["experiments"].append({"scan_id": "scan-new", "density": "1 g/cm^3"})
+    record["experiments"].append({"density": "3 g/cm^3"})
+    spec = MaterialSpec("spec")
+    assert session.ingest(record, material_spec=spec) is material
+    assert material.spec is spec and material.tags == ["retagged"]
+    assert len(material.measurements) == 7
+    changed = session.delta()
+    assert changed[0] is material
+    assert [m.uids.get("given_scan_id") for m in changed[1:]] == ["scan-0", "scan-new", None]
+    assert material.measurements[0].properties[0].value.mean == 2.0
+
+    # Experiments without scan ids are matched by their content
+    session.ingest(record)
+    assert session.delta() == []
+
+    # A scan can move to another sample
+    other = _record()
+    other["sample_id"] = "another sample"
+    other["experiments"] = other["experiments"][:1]
+    moved = session.ingest(other)
+    assert moved.measurements[0].uids["given_scan_id"] == "scan-0"
+    assert len(material.measurements) == 6
+
+    # Records without sample ids can't be matched
+    anonymous = _record()
+    del anonymous["sample_id"]
+    assert session.ingest(anonymous) is not session.ingest(anonymous)
+
+
+def test_process_run():
+    """Test that the process of a known sample produces the material run that is kept."""
+    session = IngestSession()
+    process = ProcessRun("mixing")
+    material = session.ingest(_record(), process_run=process)
+    assert process.output_material is material
+    session.delta()
+
+    assert session.ingest(_record(), process_run=process) is material
+    assert material.process is process
+    assert process.output_material is material
+    assert session.delta() == []
+
+    other = ProcessRun("pouring")
+    session.ingest(_record(), process_run=other)
+    assert material.process is other and other.output_material is material
+    assert session.delta() == [material]
+
+
+def test_resume():
+    """Test resuming from materials that were written out, and writing only the delta."""
+    session = IngestSession()
+    session.ingest(_record())
+    saved = loads(session.dumps_delta())
+    assert isinstance(saved, list) and isinstance(saved[0], MaterialRun)
+
+    resumed = IngestSession(materials=[loads(dumps(saved[0]))])
+    resumed.ingest(_record())
+    assert resumed.delta() == []
+
+    record = _record()
+    record["experiments"][1]["tags"] = ["rerun"]
+    material = resumed.ingest(record)
+    written = loads(resumed.dumps_delta())
+    assert [e.typ for e in written] == ["measurement_run"]
+    assert written[0].tags == ["rerun"]
+    # The unchanged material is only linked to
+    assert written[0].material.id == material.uids["given_sample_id"]
+
+
+def test_stable_state():
+    """Test that sessions don't change the known templates, and only remember what they keep."""
+    uids = {name: dict(template.uids) for name, template in known_properties.items()}
+    session = IngestSession()
+    material = session.ingest(_record())
+    density = material.measurements[0].properties[0]
+    assert density.template is not known_properties[density.name]
+    assert {name: template.uids for name, template in known_properties.items()} == uids
+    # Every session refers to the same unique identifiers for the known templates
+    other = IngestSession().ingest(_record())
+    assert other.measurements[0].properties[0].template.uids == density.template.uids
+
+    # Fingerprints are kept by scan id, and for kept materials, by sample id
+    anonymous = _record()
+    del anonymous["sample_id"]
+    for experiment in anonymous["experiments"]:
+        del experiment["scan_id"]
+    for _ in range(3):
+        session.ingest(copy.deepcopy(anonymous))
+    assert sorted(session._fingerprints) == ["scan-{}".format(i) for i in range(5)]
+    assert session._unscanned == {}
+
+    unscanned = copy.deepcopy(anonymous)
+    unscanned["sample_id"] = "unscanned"
+    session.ingest(unscanned)
+    session.ingest(copy.deepcopy(unscanned))
+    assert len(session._materials["unscanned"].measurements) == 5
+    assert list(session._unscanned) == ["unscanned"]
+
+
+_RESUME_SCRIPT = """
+import sys
+from gemd.ingest.session import IngestSession
+from gemd.ingest.tests.test_session import _record
+from gemd.json import loads
+
+if sys.argv[1] == "write":
+    session = IngestSession()
+    session.ingest(_record())
+    print(session.dumps_delta())
+else:
+    saved = loads(sys.stdin.read())
+    session = IngestSession(materials=[saved[0]])
+    session.ingest(_record())
+    print(len(session.delta()))
+"""
+
+
+def test_resume_across_processes():
+    """Test that a session written by one process is idempotent in one with another hash seed."""
+    def run(seed, mode, stdin=None):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        return subprocess.run([sys.executable, "-c", _RESUME_SCRIPT, mode], input=stdin,
+                              env=env, stdout=subprocess.PIPE, universal_newlines=True,
+                              check=True).stdout
+
+    for written, read in (("1", "5"), ("5", "1")):
+        assert run(read, "read", run(written, "write")).strip() == "0"
@@ -0,0 +1,69 @@
+"""Test ingesting a stream of records."""
+from io import StringIO
+import json
+
+from gemd.entity.object import MaterialRun
+from gemd.ingest.material_run_example import known_properties
+from gemd.ingest.stream import ingest_stream, read_records, write_ndjson
+from gemd.ingest.tests.test_parallel import _records
+from gemd.json import loads
+
+
+def test_read_records(tmpdir):
+    """Test reading records from files and iterables."""
+    records = list(_records(3))
+    text = "\n".join(json.dumps(record) for record in records) + "\n\n"
+    assert list(read_records(StringIO(text))) == records
+    path = tmpdir.join("records.ndjson")
+    path.write(text)
+    assert list(read_records(str(path))) == records
+    assert list(read_records(iter(records))) == records
+
+
+def test_ingest_stream():
+    """Test that records are ingested in order, and only read as there is room for them."""
+    uids = {name: dict(template.uids) for name, template in known_properties.items()}
+    read = []
+
+    def source():
+        for record in _records(20):
+            read.append(record["sample_id"])
+            yield record
+
+    stream = ingest_stream(source(), workers=2, max_pending=3)
+    first = next(stream)
+    assert first.uids["given_sample_id"] == "sample-0"
+    assert len(read) <= 4
+    rest = list(stream)
+    assert [m.uids["given_sample_id"] for m in rest] == \
+        ["sample-{}".format(i) for i in range(1, 20)]
+
+    serial = list(ingest_stream(_records(2)))
+    assert len(serial) == 2 and len(serial[1].measurements) == 5
+
+    # Processes send back each material run, which is linked to the known templates here
+    processed = list(ingest_stream(_records(4), workers=2, processes=True, max_pending=2))
+    assert [m.uids["given_sample_id"] for m in processed] == \
+        ["sample-{}".format(i) for i in range(4)]
+    density = processed[3].measurements[0].properties[0]
+    assert density.template is known_properties[density.name]
+    assert density.template.uids == uids[density.name]
+
+
+def test_write_ndjson():
+    """Test that each material run is written as a line that loads on its own."""
+    uids = {name: dict(template.uids) for name, template in known_properties.items()}
+    for workers, processes in [(0, False), (2, False), (2, True)]:
+        fp = StringIO()
+        assert write_ndjson(_records(5), fp, workers=workers, processes=processes) == 5
+        lines = fp.getvalue().splitlines()
+        materials = [loads(line) for line in lines]
+        assert all(isinstance(material, MaterialRun) for material in materials)
+        assert [m.uids["given_sample_id"] for m in materials] == \
+            ["sample-{}".format(i) for i in range(5)]
+        assert len(materials[4].measurements) == 5
+        # Every line uses the same unique identifiers for the known templates
+        templates = [{p.template.uids["auto"] for meas in m.measurements
+                      for p in meas.properties} for m in materials]
+        assert all(t == templates[0] for t in templates)
+    assert {name: template.uids for name, template in known_properties.items()} == uids
@@ -9,6 +9,7 @@ from gemd.ingest.table_example import ingest_table
 data = [
     {"vapor pressure": 2.0, "temperature": 300},
     {"vapor pressure": 3.0, "temperature": 400},
+    {"temperature": 500},
 ]
 
 
@@ -19,6 +20,9 @@ def test_table():
     result = ingest_table(material, df)
     assert isinstance(result, MaterialRun)
     assert len(result.measurements) == len(data)
+    assert [m.properties[0].value.nominal for m in result.measurements[:2]] == [2.0, 3.0]
+    assert result.measurements[2].properties == []
+    assert result.measurements[2].conditions[0].value.nominal == 500
 
     filename = "/tmp/table_example.json"
 
@@ -0,0 +1,68 @@
+"""Test parsing values from strings."""
+import numpy as np
+import pytest
+
+from gemd.entity.value import NominalCategorical, NominalReal, NormalReal, UniformReal
+from gemd.ingest.value_parser import ValueParseError, ValueParser
+from gemd.units import clear_parse_units_cache, parse_units_cache_info
+
+
+def test_parse():
+    """Test each form of value."""
+    parser = ValueParser(aliases={"C": "degC"})
+    assert parser.parse("1.0 +- 0.5 g/cm^3") == NormalReal(1.0, 0.5, "g/cm^3")
+    assert parser.parse("3 ± 1") == NormalReal(3, 1, "")
+    assert parser.parse("-2.5e-1 +/- .1 m") == NormalReal(-0.25, 0.1, "m")
+    assert parser.parse("10-20 m") == UniformReal(10, 20, "m")
+    assert parser.parse("1..2") == UniformReal(1, 2, "")
+    assert parser.parse("-5 to -1 K") == UniformReal(-5, -1, "K")
+    assert parser.parse(" 300 degF ") == NominalReal(300, "degF")
+    assert parser.parse("5 C") == NominalReal(5, "degC")
+    assert parser.parse("1.") == NominalReal(1, "")
+    assert parser.parse(7) == NominalReal(7, "")
+    assert parser.parse("medium") == NominalCategorical("medium")
+    assert parser.parse("warm up") == NominalCategorical("warm up")
+
+    assert parser.parse(np.int64(3)) == NominalReal(3, "")
+    assert parser.parse(np.float32(2.5)) == NominalReal(2.5, "")
+
+    # Units must be set apart by whitespace, so codes that start with a digit are categories
+    assert parser.parse("4H") == NominalCategorical("4H")
+    assert parser.parse("1A") == NominalCategorical("1A")
+    assert parser.parse("100C") == NominalCategorical("100C")
+    assert parser.parse("5 mm") == NominalReal(5, "mm")
+
+    # C and F are temperatures unless the aliases say otherwise
+    assert ValueParser().parse("100 C") == NominalReal(100, "degC")
+    assert ValueParser().parse("32 F") == NominalReal(32, "degF")
+    assert ValueParser(aliases={"C": "coulomb"}).parse("100 C") == NominalReal(100, "coulomb")
+
+    for bad in ["5 bogus units", "3 - 1 m", "", None, True]:
+        with pytest.raises(ValueParseError):
+            parser.parse(bad)
+    with pytest.raises(ValueError, match="unknown units 'q'"):
+        parser.parse("1 q")
+
+
+def test_parse_column():
+    """Test that a column is parsed with missing entries skipped and errors collected."""
+    parser = ValueParser()
+    clear_parse_units_cache()
+    values, errors = parser.parse_column(
+        ["1 m", None, float("nan"), " ", "2 q", "red", "3 q", "4 m"])
+    assert values == [NominalReal(1, "m"), None, None, None, None, NominalCategorical("red"),
+                      None, NominalReal(4, "m")]
+    assert [(error.index, error.text) for error in errors] == [(4, "2 q"), (6, "3 q")]
+    assert "in row 6" in str(errors[1])
+    # Each unit string is only parsed once, even when it isn't defined
+    misses = parse_units_cache_info().misses
+    parser.parse_column(["5 m", "6 q"] * 10)
+    assert parse_units_cache_info().misses == misses
+
+
+def test_unit_errors():
+    """Test that units that can't be parsed are errors, unless the parser isn't strict."""
+    for units in ("q", "kg/", "((m"):
+        with pytest.raises(ValueParseError, match="unknown units"):
+            ValueParser().parse("1 " + units)
+        assert ValueParser(strict=False).parse("1 " + units) == NominalReal(1, "")
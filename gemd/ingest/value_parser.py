@@ -0,0 +1,193 @@
+"""Parse the values of attributes from strings."""
+from functools import lru_cache
+import numbers
+import re
+
+from gemd.entity.value.nominal_categorical import NominalCategorical
+from gemd.entity.value.nominal_real import NominalReal
+from gemd.entity.value.normal_real import NormalReal
+from gemd.entity.value.uniform_real import UniformReal
+from gemd.units import UNIT_PARSE_ERRORS, parse_units
+
+# A trailing decimal point can't be the start of a ".." range separator
+_UNSIGNED = r"(?:\d+(?:\.(?!\.)\d*)?|\.\d+)(?:[eE][-+]?\d+)?"
+_NUMBER = r"[-+]?" + _UNSIGNED
+
+# A number, optionally followed by an uncertainty or the upper end of a range, and then units.
+# The units must be set apart by whitespace, so that tokens such as "4H" are categories.
+_VALUE = re.compile(r"""
+    (?P<first>{number})
+    (?:
+        \s*(?:\+/?-|±)\s*(?P<std>{unsigned})
+      | \s*(?:to|\.\.|[-–])\s*(?P<upper>{number})
+    )?
+    (?:\s+(?P<units>.+))?
+    $
+    """.format(number=_NUMBER, unsigned=_UNSIGNED), re.VERBOSE)
+
+# Unit tokens that mean something else in pint than they usually do in tables of data
+DEFAULT_ALIASES = {"C": "degC", "F": "degF"}
+
+# The number of distinct strings whose matches against the grammar are remembered
+MATCH_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=MATCH_CACHE_SIZE)
+def _match(text):
+    """Split a string into the first number, the deviation, the upper end and the unit token."""
+    match = _VALUE.match(text)
+    if match is None:
+        return None
+    std, upper = match.group("std", "upper")
+    return (float(match.group("first")), None if std is None else float(std),
+            None if upper is None else float(upper), match.group("units") or "")
+
+
+class ValueParseError(ValueError):
+    """
+    A string that couldn't be parsed as a value.
+
+    Parameters
+    ----------
+    text: str
+        The string.
+    message: str
+        What is wrong with it.
+    index: int, optional
+        The position of the string in the column it came from.
+
+    """
+
+    def __init__(self, text, message, index=None):
+        if index is None:
+            description = "Couldn't parse {!r}: {}".format(text, message)
+        else:
+            description = "Couldn't parse {!r} in row {}: {}".format(text, index, message)
+        ValueError.__init__(self, description)
+        self.text = text
+        self.message = message
+        self.index = index
+
+
+class ValueParser(object):
+    """
+    Parse strings such as ``"1.2 +/- 0.1 g/cm^3"`` into values.
+
+    A string is matched against a precompiled grammar, and becomes
+
+    * a :class:`NormalReal` if it is a mean and a standard deviation, separated by
+      ``+/-``, ``+-`` or ``±``,
+    * a :class:`UniformReal` if it is a range, with ends separated by ``to``, ``..`` or ``-``,
+    * a :class:`NominalReal` if it is a single number, and
+    * a :class:`NominalCategorical` otherwise, such as ``"medium"`` or ``"4H"``.
+
+    Any of the real values may be followed by units, after whitespace, and are dimensionless
+    if there are none. ``"C"`` and ``"F"`` are taken to be degrees Celsius and Fahrenheit
+    rather than coulombs and farads, unless the aliases say otherwise.
+    The matches of recent strings against the grammar are remembered in a bounded cache, so
+    a column of repeated strings is only matched once per distinct string. Unit strings are
+    parsed by :func:`~gemd.units.parse_units`, which remembers recent parses, including of
+    units that aren't defined.
+    Numbers that aren't strings, including numpy numbers, become dimensionless nominal reals.
+
+    Parameters
+    ----------
+    aliases: Dict[str, str], optional
+        Unit tokens to replace before parsing, such as ``{"deg": "degree"}``, in addition to
+        (and taking precedence over) DEFAULT_ALIASES.
+    strict: bool, optional
+        Whether units that aren't recognized are an error. If not, values with such units are
+        dimensionless. Defaults to True.
+
+    """
+
+    def __init__(self, aliases=None, strict=True):
+        self.aliases = dict(DEFAULT_ALIASES)
+        self.aliases.update(aliases or {})
+        self.strict = strict
+
+    def parse(self, text):
+        """
+        Parse a single value.
+
+        Parameters
+        ----------
+        text: str or number
+            The value to parse.
+
+        Returns
+        -------
+        BaseValue
+            The value.
+
+        Raises
+        ------
+        ValueParseError
+            If the value can't be parsed, or its units aren't recognized.
+
+        """
+        if isinstance(text, numbers.Real) and not isinstance(text, bool):
+            if isinstance(text, numbers.Integral):
+                return NominalReal(nominal=int(text), units='')
+            return NominalReal(nominal=float(text), units='')
+        if not isinstance(text, str):
+            raise ValueParseError(text, "expected a string or a number, not {}".format(
+                type(text).__name__))
+        stripped = text.strip()
+        if not stripped:
+            raise ValueParseError(text, "it is empty")
+
+        match = _match(stripped)
+        if match is None:
+            return NominalCategorical(stripped)
+        first, std, upper, token = match
+        units = self._parse_units(text, token)
+        if std is not None:
+            return NormalReal(mean=first, std=std, units=units)
+        if upper is not None:
+            if upper < first:
+                raise ValueParseError(text, "the range is from {} down to {}".format(
+                    first, upper))
+            return UniformReal(lower_bound=first, upper_bound=upper, units=units)
+        return NominalReal(nominal=first, units=units)
+
+    def parse_column(self, texts):
+        """
+        Parse a column of values, collecting the strings that can't be parsed.
+
+        Missing entries, which are None, NaN or blank strings, become None.
+
+        Parameters
+        ----------
+        texts: Iterable[str or number]
+            The values to parse.
+
+        Returns
+        -------
+        values: List[BaseValue]
+            The value of each entry, or None if it is missing or couldn't be parsed.
+        errors: List[ValueParseError]
+            An error for each entry that couldn't be parsed, with its index.
+
+        """
+        values = []
+        errors = []
+        for index, text in enumerate(texts):
+            if text is None or text != text or (isinstance(text, str) and not text.strip()):
+                values.append(None)
+                continue
+            try:
+                values.append(self.parse(text))
+            except ValueParseError as err:
+                values.append(None)
+                errors.append(ValueParseError(err.text, err.message, index))
+        return values, errors
+
+    def _parse_units(self, text, token):
+        """Look up the standard form of a unit token."""
+        try:
+            return parse_units(self.aliases.get(token, token))
+        except UNIT_PARSE_ERRORS as err:
+            if not self.strict:
+                return ''
+            raise ValueParseError(text, "unknown units {!r} ({})".format(token, err))
@@ -10,19 +10,20 @@ This module provides the four main python json methods:
 These methods should provide drop-in support for serialization and deserialization of
 gemd-containing data structures by replacing imports of ``json`` with those of ``gemd.json``.
 
-It also provides convenience imports of :class:`~gemd_encoder.GEMDEncoder`
-and :class:`~gemd_json.GEMDJson`.
+It also provides convenience imports of :class:`~gemd_encoder.GEMDEncoder`,
+:class:`~gemd_json.GEMDJson` and :class:`~template_catalog.TemplateCatalog`.
 These classes can be used by developers to integrate gemd with other tools by extending the
 JSON support provided here to those tools.
 """
 
 from .gemd_encoder import GEMDEncoder  # noqa: F401
 from .gemd_json import GEMDJson
+from .template_catalog import TemplateCatalog  # noqa: F401
 
 __default = GEMDJson()
 
 
-def loads(json_str, **kwargs):
+def loads(json_str, trusted=False, template_catalog=None, **kwargs):
     """
     Deserialize a json-formatted string into a gemd object.
 
@@ -30,6 +31,12 @@ def loads(json_str, **kwargs):
     ----------
     json_str: str
         A string representing the serialized objects, such as what is produced by :func:`dumps`.
+    trusted: bool, optional
+        Whether the objects were written by gemd and so are already valid, in which case they
+        are built directly from their fields without validation. Default: False
+    template_catalog: TemplateCatalog, optional
+        Templates that were left out of `json_str` by :func:`dumps`, which links to them are
+        resolved to.
     **kwargs: keyword args, optional
         Optional keyword arguments to pass to `json.loads()`.
 
@@ -40,10 +47,11 @@ def loads(json_str, **kwargs):
         back into python object references.
 
     """
-    return __default.loads(json_str, **kwargs)
+    return __default.loads(json_str, trusted=trusted, template_catalog=template_catalog,
+                           **kwargs)
 
 
-def dumps(obj, **kwargs):
+def dumps(obj, template_catalog=None, **kwargs):
     """
     Serialize a gemd object, or container of them, into a json-formatting string.
 
@@ -51,6 +59,8 @@ def dumps(obj, **kwargs):
     ----------
     obj: DictSerializable or List[DictSerializable]
         The object(s) to serialize to a string.
+    template_catalog: TemplateCatalog, optional
+        Templates to leave out of the string, and refer to only with links.
     **kwargs: keyword args, optional
         Optional keyword arguments to pass to `json.dumps()`.
 
@@ -60,10 +70,10 @@ def dumps(obj, **kwargs):
         A string version of the serialized objects.
 
     """
-    return __default.dumps(obj, **kwargs)
+    return __default.dumps(obj, template_catalog=template_catalog, **kwargs)
 
 
-def load(fp, **kwargs):
+def load(fp, trusted=False, template_catalog=None, **kwargs):
     """
     Load serialized string representation of an object from a file.
 
@@ -71,6 +81,11 @@ def load(fp, **kwargs):
     ----------
     fp: file
         File to read.
+    trusted: bool, optional
+        Whether the objects were written by gemd and can be loaded without validation.
+        Default: False
+    template_catalog: TemplateCatalog, optional
+        Templates that were left out of the file, which links to them are resolved to.
     **kwargs: keyword args, optional
         Optional keyword arguments to pass to `json.loads()`.
 
@@ -80,10 +95,10 @@ def load(fp, **kwargs):
         Deserialized object(s).
 
     """
-    return __default.load(fp, **kwargs)
+    return __default.load(fp, trusted=trusted, template_catalog=template_catalog, **kwargs)
 
 
-def dump(obj, fp, **kwargs):
+def dump(obj, fp, template_catalog=None, **kwargs):
     """
     Dump an object to a file, as a serialized string.
 
@@ -93,6 +108,8 @@ def dump(obj, fp, **kwargs):
         Object(s) to dump
     fp: file
         File to write to.
+    template_catalog: TemplateCatalog, optional
+        Templates to leave out of the file, and refer to only with links.
     **kwargs: keyword args, optional
         Optional keyword arguments to pass to `json.dumps()`.
 
@@ -101,4 +118,4 @@ def dump(obj, fp, **kwargs):
     None
 
     """
-    return __default.dump(obj, fp, **kwargs)
+    return __default.dump(obj, fp, template_catalog=template_catalog, **kwargs)
@@ -1,3 +1,4 @@
+from collections import ChainMap
 import inspect
 
 from gemd.entity.attribute.condition import Condition
@@ -71,7 +72,7 @@ class GEMDJson(object):
         for clazz in self._clazzes:
             self._clazz_index[clazz.typ] = clazz
 
-    def dumps(self, obj, **kwargs):
+    def dumps(self, obj, template_catalog=None, **kwargs):
         """
         Serialize a gemd object, or container of them, into a json-formatting string.
 
@@ -79,6 +80,10 @@ class GEMDJson(object):
         ----------
         obj: DictSerializable or List[DictSerializable]
             The object(s) to serialize to a string.
+        template_catalog: TemplateCatalog, optional
+            Templates that are kept outside of the serialized string. Templates with a unique
+            identifier in the catalog are left out of the string, so references to them are
+            only links, which :meth:`loads` resolves with the same catalog.
         **kwargs: keyword args, optional
             Optional keyword arguments to pass to `json.dumps()`.
 
@@ -90,12 +95,15 @@ class GEMDJson(object):
         """
         # create a top level list of [flattened_objects, link-i-fied return value]
         res = {"object": obj}
-        additional = flatten(res)
+        if template_catalog is None:
+            additional = flatten(res)
+        else:
+            additional = flatten(res, exclude=template_catalog.__contains__)
         res = substitute_links(res)
         res["context"] = additional
         return json_builtin.dumps(res, cls=GEMDEncoder, sort_keys=True, **kwargs)
 
-    def loads(self, json_str, **kwargs):
+    def loads(self, json_str, trusted=False, template_catalog=None, **kwargs):
         """
         Deserialize a json-formatted string into a gemd object.
 
@@ -103,6 +111,15 @@ class GEMDJson(object):
         ----------
         json_str: str
             A string representing the serialized objects, like what is produced by :func:`dumps`.
+        trusted: bool, optional
+            Whether the objects were written by gemd and so are already valid, in which case
+            they are built directly from their fields, without running the checks and
+            conversions of their constructors and setters. See
+            :meth:`~gemd.entity.dict_serializable.DictSerializable.from_trusted_dict`.
+            Default: False
+        template_catalog: TemplateCatalog, optional
+            Templates that were left out of the serialized string by :meth:`dumps`, which links
+            to them are resolved to.
         **kwargs: keyword args, optional
             Optional keyword arguments to pass to `json.loads()`.
 
@@ -116,12 +133,19 @@ class GEMDJson(object):
         # Create an index to hold the objects by their uid reference
         # so we can replace links with pointers
         index = {}
+        if template_catalog is not None:
+            # New objects are indexed in front of the catalog, which is shared and not copied
+            index = ChainMap(index, template_catalog._index)
+        # Links that can't be resolved are interned so repeats share a single object
+        links = {}
         raw = json_builtin.loads(
-            json_str, object_hook=lambda x: self._load_and_index(x, index, True), **kwargs)
+            json_str,
+            object_hook=lambda x: self._load_and_index(x, index, True, links, trusted),
+            **kwargs)
         # the return value is in the 2nd position.
         return raw["object"]
 
-    def load(self, fp, **kwargs):
+    def load(self, fp, trusted=False, template_catalog=None, **kwargs):
         """
         Load serialized string representation of an object from a file.
 
@@ -129,6 +153,11 @@ class GEMDJson(object):
         ----------
         fp: file
             File to read.
+        trusted: bool, optional
+            Whether the objects were written by gemd and can be loaded without validation.
+            Default: False
+        template_catalog: TemplateCatalog, optional
+            Templates that were left out of the file, which links to them are resolved to.
         **kwargs: keyword args, optional
             Optional keyword arguments to pass to `json.loads()`.
 
@@ -138,9 +167,10 @@ class GEMDJson(object):
             Deserialized object(s).
 
         """
-        return self.loads(fp.read(), **kwargs)
+        return self.loads(fp.read(), trusted=trusted, template_catalog=template_catalog,
+                          **kwargs)
 
-    def dump(self, obj, fp, **kwargs):
+    def dump(self, obj, fp, template_catalog=None, **kwargs):
         """
         Dump an object to a file, as a serialized string.
 
@@ -150,6 +180,8 @@ class GEMDJson(object):
             Object(s) to dump
         fp: file
             File to write to.
+        template_catalog: TemplateCatalog, optional
+            Templates to leave out of the file, and refer to with links.
         **kwargs: keyword args, optional
             Optional keyword arguments to pass to `json.dumps()`.
 
@@ -158,7 +190,7 @@ class GEMDJson(object):
         None
 
         """
-        fp.write(self.dumps(obj, **kwargs))
+        fp.write(self.dumps(obj, template_catalog=template_catalog, **kwargs))
         return
 
     def copy(self, obj):
@@ -238,8 +270,11 @@ class GEMDJson(object):
         # Create an index to hold the objects by their uid reference
         # so we can replace links with pointers
         index = {}
+        links = {}
         return json_builtin.loads(
-            json_str, object_hook=lambda x: self._load_and_index(x, index), **kwargs)
+            json_str,
+            object_hook=lambda x: self._load_and_index(x, index, link_index=links),
+            **kwargs)
 
     def register_classes(self, classes):
         """
@@ -266,7 +301,8 @@ class GEMDJson(object):
 
         self._clazz_index.update(classes)
 
-    def _load_and_index(self, d, object_index, substitute=False):
+    def _load_and_index(self, d, object_index, substitute=False, link_index=None,
+                        trusted=False):
         """
         Load the class based on the type string and index it, if a BaseEntity.
 
@@ -275,6 +311,8 @@ class GEMDJson(object):
         :param d: dictionary to try to load into a registered class instance
         :param object_index: to add the object to if it is a BaseEntity
         :param substitute: whether to substitute LinkByUIDs when they are found in the index
+        :param link_index: to intern LinkByUIDs by scope and id so that identical links are shared
+        :param trusted: whether to build objects from their fields without validating them
         :return: the deserialized object, or the input dict if it wasn't recognized
         """
         if "type" not in d:
@@ -283,11 +321,14 @@ class GEMDJson(object):
 
         if typ in self._clazz_index:
             clz = self._clazz_index[typ]
-            obj = clz.from_dict(d)
+            obj = clz.from_trusted_dict(d) if trusted else clz.from_dict(d)
         elif typ == self._link_type.typ:
             obj = self._link_type.from_dict(d)
-            if substitute and (obj.scope.lower(), obj.id) in object_index:
-                return object_index[(obj.scope.lower(), obj.id)]
+            if substitute and obj.key in object_index:
+                return object_index[obj.key]
+            if link_index is not None:
+                # Links are shared by their exact scope, so each keeps the case it was written in
+                obj = link_index.setdefault((obj.scope, obj.id), obj)
             return obj
         else:
             raise TypeError("Unexpected base object type: {}".format(typ))
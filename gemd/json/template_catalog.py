@@ -0,0 +1,75 @@
+"""A shared collection of templates that serialized documents can refer to by link."""
+from gemd.entity.template.attribute_template import AttributeTemplate
+from gemd.entity.template.base_template import BaseTemplate
+from gemd.util import recursive_foreach
+
+_TEMPLATE_TYPES = (BaseTemplate, AttributeTemplate)
+
+
+class TemplateCatalog(object):
+    """
+    An in-memory collection of templates, indexed by their unique identifiers.
+
+    Many documents serialized with the same catalog can leave out the templates it contains,
+    referring to them with links instead, and documents loaded with the catalog have those
+    links resolved to the templates in it. Every document loaded with a catalog shares its
+    template objects.
+
+    Parameters
+    ----------
+    templates: Iterable[BaseTemplate or AttributeTemplate], optional
+        Templates to add to the catalog.
+
+    """
+
+    def __init__(self, templates=()):
+        self._index = {}
+        self._templates = []
+        for template in templates:
+            self.add(template)
+
+    def add(self, template):
+        """
+        Add a template, and the attribute templates that it refers to, to the catalog.
+
+        Parameters
+        ----------
+        template: BaseTemplate or AttributeTemplate
+            The template to add. It, and every template it refers to, must have a unique
+            identifier, which is how documents refer to it.
+
+        Returns
+        -------
+        None
+
+        """
+        if not isinstance(template, _TEMPLATE_TYPES):
+            raise TypeError("Only templates can be added to a catalog: {}".format(template))
+
+        # Templates that share a unique identifier with one already in the catalog are skipped
+
+        def add_template(entity):
+            if not isinstance(entity, _TEMPLATE_TYPES) or entity in self:
+                return
+            if len(entity.uids) == 0:
+                raise ValueError("Templates in a catalog must have uids: {}".format(entity.name))
+            self._templates.append(entity)
+            for scope, uid in entity.uids.items():
+                self._index[(scope.lower(), uid)] = entity
+
+        recursive_foreach(template, add_template)
+
+    def get(self, scope, uid):
+        """Get the template with a unique identifier, or None if it is not in the catalog."""
+        return self._index.get((scope.lower(), uid))
+
+    def __contains__(self, entity):
+        """Whether entity is a template that shares a unique identifier with one in the catalog."""
+        return isinstance(entity, _TEMPLATE_TYPES) and \
+            any((scope.lower(), uid) in self._index for scope, uid in entity.uids.items())
+
+    def __iter__(self):
+        return iter(self._templates)
+
+    def __len__(self):
+        return len(self._templates)
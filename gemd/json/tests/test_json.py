@@ -1,22 +1,29 @@
 """Test serialization and deserialization of gemd objects."""
 import json
 from copy import deepcopy
+from io import StringIO
 
 import pytest
 
-from gemd.json import dumps, loads, GEMDJson
+from gemd.demo.cake import make_cake
+from gemd.json import dumps, loads, load, GEMDJson
 from gemd.entity.attribute.property import Property
+from gemd.entity.bounds import CategoricalBounds, CompositionBounds
 from gemd.entity.bounds.real_bounds import RealBounds
 from gemd.entity.dict_serializable import DictSerializable
-from gemd.entity.case_insensitive_dict import CaseInsensitiveDict
+from gemd.entity.case_insensitive_dict import CompactCaseInsensitiveDict
 from gemd.entity.attribute.condition import Condition
 from gemd.entity.attribute.parameter import Parameter
+from gemd.entity.file_link import FileLink
 from gemd.entity.link_by_uid import LinkByUID
 from gemd.entity.object import MeasurementRun, MaterialRun, ProcessRun
 from gemd.entity.object import MeasurementSpec, MaterialSpec, ProcessSpec
 from gemd.entity.object.ingredient_run import IngredientRun
 from gemd.entity.object.ingredient_spec import IngredientSpec
+from gemd.entity.source.performed_source import PerformedSource
 from gemd.entity.template.property_template import PropertyTemplate
+from gemd.entity.valid_list import ValidList
+from gemd.entity.value import DiscreteCategorical, NominalComposition, InChI
 from gemd.entity.value.nominal_integer import NominalInteger
 from gemd.entity.value.nominal_real import NominalReal
 from gemd.entity.value.normal_real import NormalReal
@@ -112,11 +119,11 @@ def test_thin_dumps():
 
 
 def test_uid_deser():
-    """Test that uids continue to be a CaseInsensitiveDict after deserialization."""
+    """Test that uids continue to be case-insensitive after deserialization."""
     material = MaterialRun("Input material", tags="input", uids={'Sample ID': '500-B'})
     ingredient = IngredientRun(material=material)
     ingredient_copy = loads(dumps(ingredient))
-    assert isinstance(ingredient_copy.uids, CaseInsensitiveDict)
+    assert isinstance(ingredient_copy.uids, CompactCaseInsensitiveDict)
     assert ingredient_copy.material == material
     assert ingredient_copy.material.uids['sample id'] == material.uids['Sample ID']
 
@@ -636,3 +643,46 @@ def test_deeply_nested_rehydration():
     copied = loads(dumps(material_history))
     assert isinstance(copied.process.ingredients[1].spec, IngredientSpec)
     assert isinstance(copied.measurements[0], MeasurementRun)
+
+
+def test_trusted_loads(caplog):
+    """Test that trusted loading builds the same objects, links included, as validating."""
+    cake = make_cake(seed=42)
+    extras = [RealBounds(0, 1, "kg"), CategoricalBounds(["a", "b"]), CompositionBounds(["C"]),
+              DiscreteCategorical({"a": 0.5, "b": 0.5}), NominalComposition({"C": 1}),
+              InChI("InChI=1S/CH4/h1H4"), FileLink("a.txt", "http://x"),
+              PerformedSource("me", "2020-01-01")]
+    serialized = dumps([cake] + extras)
+    validated = loads(serialized)
+    trusted = load(StringIO(serialized), trusted=True)
+    assert trusted == validated
+    assert dumps(trusted) == serialized
+
+    trusted_cake = trusted[0]
+    assert isinstance(trusted_cake.uids, CompactCaseInsensitiveDict)
+    assert trusted_cake.process.output_material is trusted_cake
+    assert trusted_cake.spec.process.output_material is trusted_cake.spec
+    assert sorted(i.name for i in trusted_cake.process.ingredients) == \
+        sorted(i.name for i in cake.process.ingredients)
+    assert all(m.material is trusted_cake for m in trusted_cake.measurements)
+    assert len(trusted_cake.measurements) == len(cake.measurements)
+    assert trusted[1].contains(RealBounds(0, 500, "g"))
+    assert trusted[2].categories == {"a", "b"}
+
+    # Lists are still checked once they are loaded
+    measurement = trusted_cake.measurements[0]
+    assert type(measurement.properties) is ValidList
+    assert measurement.properties == cake.measurements[0].properties
+    with pytest.raises(TypeError):
+        measurement.properties.append("garbage")
+    with pytest.raises(TypeError):
+        trusted_cake.spec.properties.append(measurement.properties[0])
+    with pytest.raises(TypeError):
+        trusted_cake.file_links.append("garbage")
+    for ingredient in trusted_cake.process.ingredients:
+        assert type(ingredient.labels) is ValidList
+    assert trusted[2].categories == {"a", "b"}
+
+    json_data = '{"context": [], "object": {"nominal": 5, "type": "nominal_integer", "x": 1}}'
+    assert loads(json_data, trusted=True) == NominalInteger(5)
+    assert "Ignoring unexpected keyword argument" in caplog.text
@@ -0,0 +1,86 @@
+"""Tests of serializing documents against a shared catalog of templates."""
+from io import StringIO
+
+import pytest
+
+from gemd.entity.attribute import Condition, Property
+from gemd.entity.bounds import RealBounds
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import MeasurementRun, MeasurementSpec
+from gemd.entity.template import ConditionTemplate, MeasurementTemplate, PropertyTemplate
+from gemd.entity.value import NominalReal
+from gemd.json import dump, dumps, load, loads, TemplateCatalog
+
+
+def _templates():
+    """Make a measurement template that refers to several attribute templates."""
+    properties = [PropertyTemplate("property {}".format(i), bounds=RealBounds(0, 10, "m"),
+                                   uids={"id": "property {}".format(i)}) for i in range(10)]
+    temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 500, "K"),
+                                    uids={"id": "temperature"})
+    template = MeasurementTemplate("measurement", properties=properties,
+                                   conditions=[temperature], uids={"ID": "measurement"})
+    return template, properties, temperature
+
+
+def _sample(i, template, properties, temperature):
+    """Make a single measurement of one sample."""
+    return MeasurementRun(
+        "sample {}".format(i), uids={"id": "sample {}".format(i)},
+        spec=MeasurementSpec("spec", template=template, uids={"id": "spec {}".format(i)}),
+        properties=[Property(p.name, value=NominalReal(i, "m"), template=p) for p in properties],
+        conditions=[Condition("T", value=NominalReal(300, "K"), template=temperature)])
+
+
+def test_catalog():
+    """Test adding templates to a catalog."""
+    template, properties, temperature = _templates()
+    catalog = TemplateCatalog([template])
+    assert len(catalog) == 12
+    assert set(catalog) == {template, temperature, *properties}
+    assert catalog.get("Id", "measurement") is template
+    assert catalog.get("id", "missing") is None
+    assert properties[0] in catalog
+
+    # Templates with a known unique identifier are not added again
+    catalog.add(PropertyTemplate("copy", bounds=RealBounds(0, 1, "m"),
+                                 uids={"id": "property 0"}))
+    assert len(catalog) == 12
+    assert catalog.get("id", "property 0") is properties[0]
+
+    with pytest.raises(TypeError):
+        catalog.add(MeasurementRun("not a template"))
+    with pytest.raises(ValueError):
+        catalog.add(PropertyTemplate("no uids", bounds=RealBounds(0, 1, "m")))
+
+
+def test_dumps_with_catalog():
+    """Test that templates in the catalog are only linked to, and are shared when loaded."""
+    template, properties, temperature = _templates()
+    catalog = TemplateCatalog([template])
+    samples = [_sample(i, template, properties, temperature) for i in range(3)]
+
+    full = dumps(samples[0])
+    thin = dumps(samples[0], template_catalog=catalog)
+    assert len(thin) < len(full) / 2
+    assert "property_template" not in thin and "measurement_template" not in thin
+
+    loaded = [loads(dumps(s, template_catalog=catalog), template_catalog=catalog)
+              for s in samples]
+    assert loaded[0] == loads(full)
+    assert all(x.template is template for x in loaded)
+    assert all(x.properties[3].template is properties[3] for x in loaded)
+
+    # Without the catalog, templates are left as links
+    assert isinstance(loads(thin).template, LinkByUID)
+
+    # Templates that aren't in the catalog are still written out
+    extra = PropertyTemplate("extra", bounds=RealBounds(0, 1, "m"), uids={"id": "extra"})
+    samples[1].properties.append(Property("extra", value=NominalReal(0, "m"), template=extra))
+    fp = StringIO()
+    dump(samples[1], fp, template_catalog=catalog)
+    assert '"extra"' in fp.getvalue()
+    fp.seek(0)
+    reloaded = load(fp, template_catalog=catalog)
+    assert reloaded.properties[-1].template == extra
+    assert catalog.get("id", "extra") is None
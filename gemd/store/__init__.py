@@ -0,0 +1,7 @@
+"""Stores that resolve links into entities lazily, on first use."""
+# flake8: noqa
+from .lazy_link import LazyLinkByUID
+from .base_store import EntityStore
+from .memory_store import MemoryStore
+from .file_store import FileStore
+from .sqlite_store import SQLiteStore
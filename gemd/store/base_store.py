@@ -0,0 +1,220 @@
+"""Base class for stores that lazily resolve links into entities."""
+from abc import ABC, abstractmethod
+import json as json_builtin
+from weakref import WeakValueDictionary
+
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.json import GEMDJson
+from gemd.store.lazy_link import LazyLinkByUID
+from gemd.util import flatten
+
+
+class _LazyJson(GEMDJson):
+    """A GEMDJson that turns every link it reads into a lazy link bound to a store."""
+
+    def __init__(self, store):
+        GEMDJson.__init__(self)
+        self._store = store
+
+    def _load_and_index(self, d, object_index, substitute=False, link_index=None,
+                        trusted=False):
+        if d.get("type") == LinkByUID.typ:
+            return self._store.link(d["scope"], d["id"])
+        return GEMDJson._load_and_index(self, d, object_index, substitute, link_index, trusted)
+
+
+class EntityStore(ABC):
+    """
+    A collection of serialized entities that are only deserialized when they are needed.
+
+    Entities are added in their thin form, with references to other entities replaced by links.
+    When an entity is read from the store, every link it contains is a
+    :class:`~gemd.store.lazy_link.LazyLinkByUID` that fetches its target from this store on
+    first attribute access.
+    Fetched entities are cached, so every reference to an entity resolves to the same object.
+    The cache only holds entities, and links, weakly: an entity that nothing else refers to any
+    more is dropped, and read again if it is needed, so the memory that a store uses is bounded
+    by what is in use rather than by everything it has ever read.
+
+    Since lazy links are links, the soft side of bi-directional links is not populated:
+    e.g., a lazily-loaded ``MaterialRun`` does not list the measurements that point to it.
+    """
+
+    def __init__(self):
+        self._json = _LazyJson(self)
+        self._entities = WeakValueDictionary()
+        self._links = WeakValueDictionary()
+
+    @abstractmethod
+    def _fetch(self, key):
+        """
+        Get the serialized form of an entity.
+
+        Parameters
+        ----------
+        key: tuple (str, str)
+            The (lower-case scope, id) pair of one of the entity's uids.
+
+        Returns
+        -------
+        str or None
+            The entity as a JSON string, or None if it is not in the store.
+
+        """
+
+    @abstractmethod
+    def _put(self, keys, serialized):
+        """
+        Save the serialized form of an entity under each of its keys.
+
+        Parameters
+        ----------
+        keys: List[tuple (str, str)]
+            The (lower-case scope, id) pairs of all of the entity's uids.
+        serialized: str
+            The entity as a JSON string.
+
+        Returns
+        -------
+        None
+
+        """
+
+    def add(self, obj):
+        """
+        Add an entity, and every entity it references, to the store.
+
+        Any entity without a uid is assigned one, as in :func:`~gemd.json.dumps`.
+
+        Parameters
+        ----------
+        obj: BaseEntity or List[BaseEntity]
+            The entities to add.
+
+        Returns
+        -------
+        None
+
+        """
+        if not isinstance(obj, (list, tuple)):
+            obj = [obj]
+        for entity in flatten(obj):
+            self._add_dict(json_builtin.loads(self._json.raw_dumps(entity)))
+
+    def add_serialized(self, json_str):
+        """
+        Add every entity in a serialized document, such as what is produced by :func:`dumps`.
+
+        Parameters
+        ----------
+        json_str: str
+            A document with a "context" list of thin entities.
+
+        Returns
+        -------
+        None
+
+        """
+        for d in json_builtin.loads(json_str)["context"]:
+            self._add_dict(d)
+
+    def _add_dict(self, d):
+        """Save a thin entity, given as a dictionary, replacing any entity already read."""
+        keys = [(scope.lower(), uid) for scope, uid in d["uids"].items()]
+        self._put(keys, json_builtin.dumps(d, sort_keys=True))
+        forgotten = set(keys)
+        for key in keys:
+            stale = self._entities.pop(key, None)
+            if stale is not None:
+                # Forget it under its other uids as well, so that it is read again
+                for scope, uid in stale.uids.items():
+                    self._entities.pop((scope.lower(), uid), None)
+                    forgotten.add((scope.lower(), uid))
+        # Links that already resolved to the replaced entity resolve again on next access
+        for key in forgotten:
+            link = self._links.get(key)
+            if link is not None:
+                link._forget()
+
+    def link(self, scope, id):
+        """
+        Get a lazy link to an entity in this store.
+
+        Parameters
+        ----------
+        scope: str
+            The scope of the unique identifier.
+        id: str
+            The unique identifier.
+
+        Returns
+        -------
+        LazyLinkByUID
+            A link bound to this store. Repeated calls return the same link, whatever the case
+            of the scope, for as long as it is in use.
+
+        """
+        key = (scope.lower(), id)
+        link = self._links.get(key)
+        if link is None:
+            link = LazyLinkByUID(scope, id, self)
+            self._links[key] = link
+        return link
+
+    def get(self, scope, id):
+        """
+        Get an entity from the store, whose own references are lazy links.
+
+        Parameters
+        ----------
+        scope: str
+            The scope of the unique identifier.
+        id: str
+            The unique identifier.
+
+        Returns
+        -------
+        BaseEntity
+            The entity with uid `id` in scope `scope`.
+
+        Raises
+        ------
+        KeyError
+            If the store does not contain the entity.
+
+        """
+        return self.resolve(LinkByUID(scope, id))
+
+    def resolve(self, link):
+        """
+        Get the entity that a link references.
+
+        Parameters
+        ----------
+        link: LinkByUID
+            A link to an entity in this store.
+
+        Returns
+        -------
+        BaseEntity
+            The referenced entity.
+
+        Raises
+        ------
+        KeyError
+            If the store does not contain the entity.
+
+        """
+        key = link.key
+        entity = self._entities.get(key)
+        if entity is None:
+            serialized = self._fetch(key)
+            if serialized is None:
+                raise KeyError("No entity with uid {}".format(link))
+            entity = self._json.raw_loads(serialized)
+            for scope, uid in entity.uids.items():
+                self._entities[(scope.lower(), uid)] = entity
+        return entity
+
+    def __contains__(self, link):
+        return link.key in self._entities or self._fetch(link.key) is not None
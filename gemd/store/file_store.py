@@ -0,0 +1,90 @@
+"""An entity store backed by a memory-mapped file."""
+import json as json_builtin
+import mmap
+import os
+
+from gemd.store.base_store import EntityStore
+
+
+class FileStore(EntityStore):
+    """
+    An entity store backed by a newline-delimited JSON file with one thin entity per line.
+
+    The file is memory-mapped and indexed by byte offset when the store is opened, so an entity
+    is only read from disk and deserialized when it is resolved.
+    Entities added to the store are appended to the file, unless the file already holds the
+    same entity under the same uids.
+
+    Parameters
+    ----------
+    path: str
+        The file to read from and append to. It is created if it doesn't exist.
+
+    """
+
+    def __init__(self, path):
+        EntityStore.__init__(self)
+        self._file = open(path, "a+b")
+        self._map = None
+        self._offsets = {}
+        self._index()
+
+    def _index(self):
+        """Record the byte range of every entity in the file."""
+        mapped = self._mapped()
+        if mapped is None:
+            return
+        start = 0
+        for line in iter(mapped.readline, b""):
+            end = start + len(line)
+            if line.strip():
+                for scope, uid in json_builtin.loads(line.decode("utf-8"))["uids"].items():
+                    self._offsets[(scope.lower(), uid)] = (start, end)
+            start = end
+
+    def _mapped(self):
+        """Get a memory map of the whole file."""
+        if self._map is None:
+            self._file.flush()
+            if os.fstat(self._file.fileno()).st_size == 0:
+                return None
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _fetch(self, key):
+        offsets = self._offsets.get(key)
+        if offsets is None:
+            return None
+        start, end = offsets
+        return self._mapped()[start:end].decode("utf-8")
+
+    def _put(self, keys, serialized):
+        line = serialized.encode("utf-8") + b"\n"
+        stored = {self._offsets.get(key) for key in keys}
+        if len(stored) == 1 and None not in stored:
+            start, end = stored.pop()
+            if self._mapped()[start:end] == line:
+                # It is already in the file, under every one of its uids
+                return
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.seek(0, os.SEEK_END)
+        start = self._file.tell()
+        self._file.write(line)
+        end = self._file.tell()
+        for key in keys:
+            self._offsets[key] = (start, end)
+
+    def close(self):
+        """Close the underlying file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,69 @@
+"""A link that resolves the entity it references on demand."""
+from gemd.entity.link_by_uid import LinkByUID
+
+
+class LazyLinkByUID(LinkByUID):
+    """
+    A link that stands in for an entity until one of the entity's attributes is read.
+
+    On first access to an attribute that a link doesn't have (e.g., ``name`` or ``properties``),
+    the referenced entity is fetched from the backing store and cached on the link.
+    Since it is still a :class:`~gemd.entity.link_by_uid.LinkByUID`, a lazy link is accepted
+    wherever a link is, and it is serialized as a plain link.
+
+    Parameters
+    ----------
+    scope: str
+        The scope of the unique identifier. Scopes are case-insensitive.
+    id: str
+        The unique identifier.
+    store: EntityStore
+        The store from which to resolve the referenced entity.
+
+    """
+
+    # Stores only hold their links weakly
+    __slots__ = ("_store", "_entity", "__weakref__")
+
+    def __init__(self, scope, id, store):
+        LinkByUID.__init__(self, scope, id)
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_entity", None)
+
+    @property
+    def resolved(self):
+        """Whether the referenced entity has already been fetched."""
+        return self._entity is not None
+
+    def resolve(self):
+        """
+        Get the referenced entity, fetching it from the store if necessary.
+
+        Returns
+        -------
+        BaseEntity
+            The entity that this link references.
+
+        Raises
+        ------
+        KeyError
+            If the store does not contain the referenced entity.
+
+        """
+        if self._entity is None:
+            object.__setattr__(self, "_entity", self._store.resolve(self))
+        return self._entity
+
+    def _forget(self):
+        """Drop the cached entity, so that it is fetched from the store again."""
+        object.__setattr__(self, "_entity", None)
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails; private and special names are never forwarded,
+        # so that copying and pickling don't trigger a fetch
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return str({"scope": self.scope, "uid": self.id, "resolved": self.resolved})
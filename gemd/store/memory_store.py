@@ -0,0 +1,22 @@
+"""An entity store held in memory."""
+from gemd.store.base_store import EntityStore
+
+
+class MemoryStore(EntityStore):
+    """
+    An entity store that keeps each serialized entity as a string in memory.
+
+    This is much more compact than the equivalent graph of python objects, and only the
+    entities that are actually read are deserialized.
+    """
+
+    def __init__(self):
+        EntityStore.__init__(self)
+        self._serialized = {}
+
+    def _fetch(self, key):
+        return self._serialized.get(key)
+
+    def _put(self, keys, serialized):
+        for key in keys:
+            self._serialized[key] = serialized
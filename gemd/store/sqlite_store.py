@@ -0,0 +1,71 @@
+"""An entity store backed by a SQLite database."""
+import sqlite3
+
+from gemd.store.base_store import EntityStore
+
+
+class SQLiteStore(EntityStore):
+    """
+    An entity store backed by a local SQLite database.
+
+    Each serialized entity is stored once, with a separate table mapping every one of its uids
+    to it. Adding an entity again replaces the row of the entity that had any of its uids, and
+    rows that no uid maps to any more are removed.
+
+    Parameters
+    ----------
+    path: str, optional
+        The database file. Defaults to an in-memory database.
+
+    """
+
+    def __init__(self, path=":memory:"):
+        EntityStore.__init__(self)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entities (id INTEGER PRIMARY KEY, body TEXT NOT NULL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS uids (scope TEXT NOT NULL, uid TEXT NOT NULL, "
+            "entity INTEGER NOT NULL, PRIMARY KEY (scope, uid))")
+        self._connection.commit()
+
+    def _fetch(self, key):
+        row = self._connection.execute(
+            "SELECT body FROM entities JOIN uids ON entities.id = uids.entity "
+            "WHERE uids.scope = ? AND uids.uid = ?", key).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def _put(self, keys, serialized):
+        with self._connection:
+            previous = set()
+            for key in keys:
+                row = self._connection.execute(
+                    "SELECT entity FROM uids WHERE scope = ? AND uid = ?", key).fetchone()
+                if row is not None:
+                    previous.add(row[0])
+            if previous:
+                entity = min(previous)
+                self._connection.execute(
+                    "UPDATE entities SET body = ? WHERE id = ?", (serialized, entity))
+            else:
+                entity = self._connection.execute(
+                    "INSERT INTO entities (body) VALUES (?)", (serialized,)).lastrowid
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO uids (scope, uid, entity) VALUES (?, ?, ?)",
+                [(scope, uid, entity) for scope, uid in keys])
+            self._connection.executemany(
+                "DELETE FROM entities WHERE id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM uids WHERE uids.entity = entities.id)",
+                [(other,) for other in previous - {entity}])
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
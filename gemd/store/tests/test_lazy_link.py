@@ -0,0 +1,38 @@
+"""Tests of lazy links."""
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import ProcessSpec, MaterialSpec
+from gemd.store import MemoryStore
+
+
+def test_lazy_link():
+    """Test that a lazy link behaves as a link until its target is read."""
+    spec = MaterialSpec(name="material", process=ProcessSpec(name="process"),
+                        uids={"id": "material"})
+    store = MemoryStore()
+    store.add(spec)
+
+    link = store.link("ID", "material")
+    assert link is store.link("ID", "material") is store.link("id", "material")
+    assert link == LinkByUID("id", "material")
+    assert "'resolved': False" in repr(link)
+
+    # Copies and pickles are plain links that never resolve
+    assert type(pickle.loads(pickle.dumps(link))) is LinkByUID
+    assert deepcopy(link) == link
+    with pytest.raises(AttributeError):
+        link._not_an_attribute
+    assert not link.resolved
+
+    assert link.process.name == "process"
+    assert "'resolved': True" in repr(link)
+    with pytest.raises(AttributeError):
+        link.name = "A new name"
+
+    missing = store.link("id", "missing")
+    with pytest.raises(KeyError):
+        missing.name
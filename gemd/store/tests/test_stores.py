@@ -0,0 +1,152 @@
+"""Tests of the entity stores."""
+import gc
+import os
+import tempfile
+
+import pytest
+
+from gemd.demo.cake import make_cake
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import MaterialRun, MeasurementRun, MaterialSpec
+from gemd.json import dumps, loads
+from gemd.store import MemoryStore, FileStore, SQLiteStore
+
+
+def _check_store(store):
+    """Add a cake to a store and read a measurement back lazily."""
+    cake = make_cake(seed=42)
+    store.add(cake)
+    measurement = next(msr for msr in cake.measurements if msr.spec.template is not None)
+
+    lazy = store.get(*next(iter(measurement.uids.items())))
+    assert isinstance(lazy, MeasurementRun)
+    assert lazy.name == measurement.name
+
+    # References are not resolved until they are read
+    assert isinstance(lazy.material, LinkByUID)
+    assert not lazy.material.resolved
+    assert lazy.material.name == cake.name
+    assert lazy.material.resolved
+    assert isinstance(lazy.material.resolve(), MaterialRun)
+    assert lazy.spec.template.name == measurement.spec.template.name
+
+    # Every reference to an entity resolves to the same object
+    assert store.resolve(lazy.material) is lazy.material.resolve()
+    assert store.get(*next(iter(measurement.uids.items()))) is lazy
+
+    # A lazily-loaded entity serializes its references as links
+    assert loads(dumps(lazy)).material == LinkByUID.from_entity(cake)
+
+    assert LinkByUID.from_entity(cake) in store
+    assert LinkByUID("missing", "nothing") not in store
+    with pytest.raises(KeyError):
+        store.get("missing", "nothing")
+
+
+def test_memory_store():
+    """Test resolving entities from memory."""
+    _check_store(MemoryStore())
+
+
+def test_sqlite_store():
+    """Test resolving entities from a SQLite database."""
+    with SQLiteStore() as store:
+        _check_store(store)
+
+
+def test_sqlite_store_replaces():
+    """Test that adding an entity again replaces its row rather than leaving the old one."""
+    with SQLiteStore() as store:
+        store.add(MaterialSpec(name="first", uids={"a": "1"}))
+        store.add(MaterialSpec(name="second", uids={"b": "2"}))
+        store.add(MaterialSpec(name="merged", uids={"a": "1", "b": "2"}))
+        assert store._connection.execute("SELECT COUNT(*) FROM entities").fetchone() == (1,)
+        assert store.get("b", "2").name == "merged"
+
+        store.add(MaterialSpec(name="renamed", uids={"A": "1", "b": "2"}))
+        assert store._connection.execute("SELECT COUNT(*) FROM entities").fetchone() == (1,)
+        assert '"renamed"' in store._fetch(("a", "1"))
+
+
+def test_add_replaces_read_entities():
+    """Test that adding an entity again replaces a copy that was already read."""
+    for store in (MemoryStore(), SQLiteStore()):
+        store.add(MaterialSpec(name="first", uids={"a": "1", "c": "3"}))
+        assert store.get("A", "1").name == "first"
+        assert store.get("c", "3").name == "first"
+
+        store.add(MaterialSpec(name="second", uids={"a": "1"}))
+        assert store.get("a", "1").name == "second"
+        assert ("c", "3") not in store._entities
+
+        store.add_serialized(dumps(MaterialSpec(name="third", uids={"A": "1"})))
+        assert store.get("a", "1").name == "third"
+
+
+def test_add_replaces_resolved_links():
+    """Test that links that were already resolved resolve to an entity that is added again."""
+    store = MemoryStore()
+    store.add(MeasurementRun("x", uids={"id": "m"}, material=MaterialRun("a", uids={"id": "1"})))
+    measurement = store.get("id", "m")
+    assert measurement.material.name == "a"
+    assert store.link("ID", "1").name == "a"
+
+    store.add(MaterialRun("b", uids={"id": "1"}))
+    assert store.get("id", "1").name == "b"
+    assert measurement.material.name == "b"
+    assert store.link("ID", "1").name == "b"
+
+
+def test_weak_cache():
+    """Test that the store only keeps the entities and links that are still in use."""
+    store = MemoryStore()
+    store.add(MeasurementRun("x", uids={"id": "m"}, material=MaterialRun("a", uids={"id": "1"})))
+    measurement = store.get("id", "m")
+    assert store.get("id", "m") is measurement
+    assert measurement.material.resolve() is store.get("id", "1")
+    assert store.link("id", "1") is measurement.material
+
+    del measurement
+    gc.collect()
+    assert len(store._entities) == 0 and len(store._links) == 0
+    measurement = store.get("id", "m")
+    assert measurement.material.name == "a"
+    assert len(store._entities) == 2
+
+
+def test_file_store():
+    """Test resolving entities from a memory-mapped file, including after reopening it."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "entities.ndjson")
+        with FileStore(path) as store:
+            _check_store(store)
+        # a blank line shouldn't confuse the indexing
+        with open(path, "a") as f:
+            f.write("\n")
+
+        with FileStore(path) as store:
+            cake = store.get("citrine-demo", "Abstract Cake")
+            assert isinstance(cake, MaterialSpec)
+            assert cake.process.name == "Icing Cake, in General"
+            store.add(MaterialSpec(name="Extra", uids={"extra": "1"}))
+            assert store.get("extra", "1").name == "Extra"
+            assert store.get("citrine-demo", "Abstract Frosting").name == "Abstract Frosting"
+
+            # Adding entities that are already in the file doesn't append them again
+            size = os.path.getsize(path)
+            store.add(MaterialSpec(name="Extra", uids={"extra": "1"}))
+            store.add(make_cake(seed=42))
+            store._file.flush()
+            assert os.path.getsize(path) == size
+            store.add(MaterialSpec(name="Changed", uids={"extra": "1"}))
+            assert store.get("extra", "1").name == "Changed"
+            assert os.path.getsize(path) > size
+
+
+def test_add_serialized():
+    """Test that a serialized document can be loaded into a store."""
+    cake = make_cake(seed=42)
+    store = MemoryStore()
+    store.add_serialized(dumps(cake))
+    copy = store.get(*next(iter(cake.uids.items())))
+    assert copy.process.spec.name == cake.process.spec.name
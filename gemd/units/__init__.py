@@ -1,2 +1,4 @@
 # flake8: noqa
 from .impl import *
+from .registry import set_registry_cache_dir, CACHE_DIR_VARIABLE
+from .dimensionality_index import DimensionalityIndex
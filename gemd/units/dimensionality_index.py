@@ -0,0 +1,67 @@
+"""An index of attribute templates by the dimensionality of their units."""
+from gemd.units.impl import dimensionality
+
+
+class DimensionalityIndex(object):
+    """
+    An index of attribute templates by the dimensionality of the units of their bounds.
+
+    Templates are indexed by the :func:`~gemd.units.dimensionality` signature of the
+    ``default_units`` of their bounds, so finding the templates that a value in some units could
+    be converted into is a dictionary lookup. Templates whose bounds have no units, such as
+    categorical bounds, are not indexed.
+
+    Parameters
+    ----------
+    templates: Iterable[AttributeTemplate], optional
+        The templates to index.
+
+    """
+
+    def __init__(self, templates=()):
+        self._templates = {}
+        self._size = 0
+        for template in templates:
+            self.add(template)
+
+    def add(self, template):
+        """
+        Add a template to the index.
+
+        Parameters
+        ----------
+        template: AttributeTemplate
+            The template to add.
+
+        Returns
+        -------
+        bool
+            Whether the template was indexed, which it is if its bounds have units.
+
+        """
+        units = getattr(getattr(template, "bounds", None), "default_units", None)
+        if units is None:
+            return False
+        self._templates.setdefault(dimensionality(units), []).append(template)
+        self._size += 1
+        return True
+
+    def compatible(self, units):
+        """
+        Get the templates whose bounds are in units that are compatible with the given units.
+
+        Parameters
+        ----------
+        units: str
+            The units of a value.
+
+        Returns
+        -------
+        List[AttributeTemplate]
+            The compatible templates, in the order they were added.
+
+        """
+        return list(self._templates.get(dimensionality(units), ()))
+
+    def __len__(self):
+        return self._size
@@ -1,13 +1,13 @@
 """Implementation of units."""
+from fractions import Fraction
+from functools import lru_cache
+
 import pint
-import pkg_resources
-from pint import UnitRegistry
+from pint.compat.tokenize import TokenError
 from pint.quantity import _Quantity
 from pint.unit import _Unit
 
-
-# use the default unit registry for now
-_ureg = UnitRegistry(filename=pkg_resources.resource_filename("gemd.units", "citrine_en.txt"))
+from gemd.units.registry import _get_registry, _set_definitions_file
 
 
 # alias the error that is thrown when units are incompatible
@@ -15,6 +15,11 @@ _ureg = UnitRegistry(filename=pkg_resources.resource_filename("gemd.units", "cit
 IncompatibleUnitsError = pint.errors.DimensionalityError
 UndefinedUnitError = pint.errors.UndefinedUnitError
 
+# the errors that parse_units raises for strings that aren't units, which are undefined units
+# and strings that pint can't tokenize or evaluate
+UNIT_PARSE_ERRORS = (UndefinedUnitError, pint.errors.DefinitionSyntaxError, TokenError,
+                     ZeroDivisionError)
+
 
 def _unit_to_str(unit):
     """Helper that pulls a string representation of the unit from a quantity."""
@@ -23,26 +28,209 @@ def _unit_to_str(unit):
     return str(unit.units)
 
 
+# The number of distinct unit strings whose parse results are remembered
+PARSE_CACHE_SIZE = 1024
+
+# What the caches remember for a unit string that isn't defined
+_UNDEFINED = object()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_unit_str(units):
+    """
+    Parse a unit string into its standard representation, or _UNDEFINED if it isn't defined.
+
+    Undefined units are remembered as a sentinel rather than as the error they caused, so that
+    the cache doesn't hold on to exceptions, and each call raises an error of its own.
+    """
+    try:
+        return _unit_to_str(_get_registry()(units))
+    except UndefinedUnitError:
+        return _UNDEFINED
+
+
 def parse_units(units):
-    """Parse a string or _Unit into a standard string representation of the unit."""
+    """
+    Parse a string or _Unit into a standard string representation of the unit.
+
+    The results of parsing strings, including whether they are undefined, are memoized in a
+    bounded least-recently-used cache, which is described by :func:`parse_units_cache_info`.
+    """
     if units is None:
         return None
     elif units == '':
         return 'dimensionless'
     elif isinstance(units, str):
-        return _unit_to_str(_ureg(units))
+        result = _parse_unit_str(units)
+        if result is _UNDEFINED:
+            raise UndefinedUnitError(units)
+        return result
     elif isinstance(units, _Unit):
         return units
     else:
         raise UndefinedUnitError("Units must be given as a recognized unit string or Units object")
 
 
+def parse_units_cache_info():
+    """
+    Get statistics about the cache of parsed unit strings.
+
+    :return: a named tuple of the cache's hits, misses, maxsize and currsize
+    """
+    return _parse_unit_str.cache_info()
+
+
+def clear_parse_units_cache():
+    """Empty the cache of parsed unit strings and reset its statistics."""
+    _parse_unit_str.cache_clear()
+
+
+def change_definitions_file(filename=None):
+    """
+    Change the file that the units are defined in.
+
+    The unit registry is built again from the file the next time that units are used, and the
+    memoized parses, conversion plans and dimensionalities are forgotten. Entities that were
+    made before keep the units they were given.
+
+    :param filename: the path to a pint definition file, or None for gemd's own definitions
+    """
+    _set_definitions_file(filename)
+    _parse_unit_str.cache_clear()
+    _conversion_plan.cache_clear()
+    _dimensionality.cache_clear()
+
+
+# The number of distinct pairs of units whose conversion plans are remembered
+CONVERSION_CACHE_SIZE = 1024
+
+
+def _exact(magnitude):
+    """
+    Remove the floating point error that pint picks up by converting through the base units.
+
+    A magnitude within a hair of a fraction with a small denominator, such as the 9/5 between
+    degC and degF, is taken to be that fraction.
+    """
+    fraction = float(Fraction(magnitude).limit_denominator(10 ** 4))
+    return fraction if abs(fraction - magnitude) <= 1e-13 * abs(magnitude) else magnitude
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def _conversion_plan(starting_unit, final_unit):
+    """
+    Work out the scale and offset that convert from starting_unit to final_unit.
+
+    Every supported conversion is affine, so it is determined by where pint sends 0 and 1,
+    less the rounding error of pint's arithmetic.
+    An impossible conversion returns the class and arguments of the error to raise instead,
+    so that the cache remembers it without holding on to an exception.
+    """
+    registry = _get_registry()
+    try:
+        offset = registry.Quantity(0.0, starting_unit).to(final_unit).magnitude
+        scale = registry.Quantity(1.0, starting_unit).to(final_unit).magnitude - offset
+        return (_exact(float(scale)), _exact(float(offset))), None
+    except UndefinedUnitError as err:
+        return None, (UndefinedUnitError, (err.unit_names,))
+    except IncompatibleUnitsError:
+        return None, (IncompatibleUnitsError, (starting_unit, final_unit))
+
+
+def conversion_plan(starting_unit, final_unit):
+    """
+    Get the scale and offset that convert magnitudes from one unit to another.
+
+    A magnitude ``x`` in starting_unit is ``scale * x + offset`` in final_unit. The offset is
+    only non-zero for affine units such as degC and degF. Plans, and the errors for
+    conversions that are impossible, are memoized for the most recently used pairs of units.
+
+    :param starting_unit: unit to convert from (str)
+    :param final_unit: unit to convert to (str)
+    :return: a tuple of (scale, offset)
+    """
+    plan, error = _conversion_plan(starting_unit, final_unit)
+    if error is not None:
+        error_class, args = error
+        raise error_class(*args)
+    return plan
+
+
 def convert_units(value, starting_unit, final_unit):
     """
     Convert the value from the starting_unit to the final_unit.
 
+    Numbers are converted with the memoized :func:`conversion_plan`, so that, e.g., 100 degC
+    is exactly 212 degF; other values are converted by pint.
+
     :param value: magnitude to convert (number)
     :param starting_unit: unit that the magnitude is currently in (str)
     :param final_unit: unit that the magnitude should be returned in (str)
     """
-    return _ureg.Quantity(value, starting_unit).to(final_unit).magnitude
+    scale, offset = conversion_plan(starting_unit, final_unit)
+    if isinstance(value, (int, float)):
+        if offset == 0.0:
+            return value if scale == 1.0 else value * scale
+        return value * scale + offset
+    return _get_registry().Quantity(value, starting_unit).to(final_unit).magnitude
+
+
+def convert_array(values, starting_unit, final_unit, difference=False):
+    """
+    Convert an array of magnitudes from the starting_unit to the final_unit at once.
+
+    The conversion is a single vectorized multiply-add with the memoized
+    :func:`conversion_plan`. Requires numpy.
+
+    :param values: magnitudes to convert (array_like of numbers)
+    :param starting_unit: unit that the magnitudes are currently in (str)
+    :param final_unit: unit that the magnitudes should be returned in (str)
+    :param difference: whether the magnitudes are differences, such as the standard deviation
+        of a NormalReal, which are scaled but not offset (bool)
+    :return: the converted magnitudes (numpy.ndarray of floats)
+    """
+    import numpy as np
+    scale, offset = conversion_plan(starting_unit, final_unit)
+    result = np.multiply(values, scale, dtype=np.float64)
+    if offset != 0.0 and not difference:
+        result += offset
+    return result
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _dimensionality(units):
+    """
+    Work out the dimensionality signature of a unit string, or _UNDEFINED if it isn't defined.
+
+    Undefined units are remembered as a sentinel, as in :func:`_parse_unit_str`.
+    """
+    try:
+        dimensions = _get_registry()(units).dimensionality
+    except UndefinedUnitError:
+        return _UNDEFINED
+    signature = []
+    for dimension, exponent in dimensions.items():
+        exponent = float(exponent)
+        signature.append((dimension, int(exponent) if exponent.is_integer() else exponent))
+    return tuple(sorted(signature))
+
+
+def dimensionality(units):
+    """
+    Get a signature of the physical dimensions of a unit, shared by all compatible units.
+
+    The signature is a sorted tuple of (dimension, exponent) pairs, such as
+    ``(("[length]", -3), ("[mass]", 1))`` for ``g / cm^3``, and is empty for dimensionless units.
+    Because two units can be converted into each other exactly when their signatures are equal,
+    signatures can be used as dictionary keys to group compatible units. Signatures, and the
+    errors for undefined units, are memoized for the most recently used unit strings.
+
+    :param units: unit to describe (str)
+    :return: the dimensionality signature (tuple of (str, number) pairs)
+    """
+    if units == '':
+        return ()
+    result = _dimensionality(units)
+    if result is _UNDEFINED:
+        raise UndefinedUnitError(units)
+    return result
@@ -0,0 +1,215 @@
+"""Lazy construction of the unit registry, optionally from a precompiled cache."""
+import copyreg
+import hashlib
+import io
+import os
+import pickle
+import stat
+import sys
+import tempfile
+from logging import getLogger
+from threading import Lock
+
+import pint
+import pkg_resources
+from pint import UnitRegistry
+from pint.util import ParserHelper
+
+logger = getLogger(__name__)
+
+# The definition files, in the order that their contents are hashed
+_DEFINITION_FILES = ("citrine_en.txt", "constants_en.txt")
+
+# Registry attributes that hold only plain data and can be restored as they were pickled
+_PLAIN_STATE = ("_defaults", "_dimensions", "_units", "_units_casei", "_prefixes", "_suffixes",
+                "_dimensional_equivalents", "_root_units_cache", "_dimensionality_cache")
+
+# The environment variable that names a directory to keep the precompiled registry in
+CACHE_DIR_VARIABLE = "GEMD_UNITS_CACHE_DIR"
+
+_registry = None
+_registry_lock = Lock()
+_cache_dir = os.environ.get(CACHE_DIR_VARIABLE) or None
+# A definition file to build the registry from instead of the packaged ones
+_definitions_file = None
+
+
+def set_registry_cache_dir(directory):
+    """
+    Set the directory in which to keep a precompiled copy of the unit registry.
+
+    Building the unit registry from its definition files is the slowest part of using units.
+    If a cache directory is set, the registry is loaded from a precompiled file in that
+    directory when one matches the current definition files and version of pint, and one is
+    written there otherwise. The directory can also be set with the environment variable
+    ``GEMD_UNITS_CACHE_DIR``.
+
+    The precompiled file is a pickle, so it is only loaded if it and the directory belong to
+    the current user and can't be written by anyone else. Use a directory that only you can
+    write to. If the registry can't be cached with the installed version of pint, it is built
+    from the definition files as usual.
+
+    This only affects how the registry is built, so it must be called before units are first
+    used.
+
+    Parameters
+    ----------
+    directory: str or None
+        The directory to keep the precompiled registry in, or None to always build the
+        registry from the definition files.
+
+    """
+    global _cache_dir
+    _cache_dir = directory
+
+
+def _set_definitions_file(filename):
+    """Build the registry from another definition file, or None for the packaged ones."""
+    global _registry, _definitions_file
+    with _registry_lock:
+        _definitions_file = filename
+        _registry = None
+
+
+def _get_registry():
+    """Get the unit registry, building it the first time it is needed."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = _load_registry(_cache_dir)
+    return _registry
+
+
+def _definition_path(name):
+    """Get the path to one of the definition files."""
+    return pkg_resources.resource_filename("gemd.units", name)
+
+
+def _cache_path(directory):
+    """Get the path of the precompiled registry for the current definitions and environment."""
+    digest = hashlib.sha256()
+    digest.update("pint {} python {}.{}".format(
+        pint.__version__, *sys.version_info[:2]).encode("utf-8"))
+    for name in _DEFINITION_FILES:
+        with open(_definition_path(name), "rb") as f:
+            digest.update(f.read())
+    return os.path.join(directory, "gemd-units-{}.pickle".format(digest.hexdigest()[:16]))
+
+
+def _load_registry(cache_dir=None):
+    """
+    Build the unit registry, going through the precompiled registry in cache_dir if given.
+
+    Registries built from a definition file other than the packaged ones aren't precompiled.
+    """
+    if cache_dir is None or _definitions_file is not None:
+        return _build_registry()
+
+    path = _cache_path(cache_dir)
+    if os.path.exists(path):
+        if not _is_private(path):
+            logger.warning("Ignoring unit registry cache {}, which other users could have "
+                           "written".format(path))
+            return _build_registry()
+        try:
+            with open(path, "rb") as f:
+                return _restore_registry(pickle.load(f))
+        except Exception as err:
+            logger.warning("Rebuilding unusable unit registry cache {}: {}".format(path, err))
+
+    registry = _build_registry()
+    try:
+        # The state is read from pint's internals, which another version of pint may lack
+        _write_cache(path, _registry_state(registry))
+    except Exception as err:
+        logger.warning("Could not write unit registry cache {}: {}".format(path, err))
+    return registry
+
+
+def _is_private(path):
+    """Check that only the current user could have written a file, before unpickling it."""
+    if not hasattr(os, "getuid"):  # pragma: no cover
+        return True  # pragma: no cover
+    for checked in (path, os.path.dirname(path)):
+        status = os.stat(checked)
+        if status.st_uid != os.getuid() or status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            return False
+    return True
+
+
+def _build_registry():
+    """Build the unit registry from the definition files."""
+    return UnitRegistry(filename=_definitions_file or _definition_path(_DEFINITION_FILES[0]))
+
+
+def _context_lines():
+    """Get the definition lines of every context, which are parsed again on restoring."""
+    lines = []
+    for name in _DEFINITION_FILES:
+        in_context = False
+        with open(_definition_path(name), encoding="utf-8") as f:
+            for line in f:
+                in_context = in_context or line.startswith("@context")
+                if in_context:
+                    lines.append(line)
+                    in_context = line.strip() != "@end"
+    return lines
+
+
+def _registry_state(registry):
+    """
+    Extract the state of a registry that is expensive to compute.
+
+    Contexts hold functions compiled from their definitions and can't be pickled, so only the
+    lines that define them are kept. Groups and systems are kept as their attributes, since
+    their classes are created for each registry.
+    """
+    state = {name: getattr(registry, name) for name in _PLAIN_STATE}
+    state["groups"] = {name: vars(group) for name, group in registry._groups.items()}
+    state["systems"] = {name: vars(system) for name, system in registry._systems.items()}
+    state["default_system"] = registry._default_system
+    state["contexts"] = _context_lines()
+    return state
+
+
+def _restore_registry(state):
+    """Restore the state extracted by _registry_state onto a registry without definitions."""
+    registry = UnitRegistry(filename=None)
+    for name in _PLAIN_STATE:
+        setattr(registry, name, state[name])
+    for attribute, cls, key in (("_groups", registry.Group, "groups"),
+                                ("_systems", registry.System, "systems")):
+        restored = {}
+        for name, attributes in state[key].items():
+            restored[name] = cls.__new__(cls)
+            restored[name].__dict__.update(attributes)
+        setattr(registry, attribute, restored)
+    registry._default_system = state["default_system"]
+    registry.load_definitions(state["contexts"])
+    return registry
+
+
+def _reduce_parser_helper(helper):
+    """Pickle a ParserHelper including its scale, which its own pickling leaves out."""
+    return ParserHelper, (helper.scale, dict(helper))
+
+
+def _write_cache(path, state):
+    """Atomically write the pickled registry state to path."""
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[ParserHelper] = _reduce_parser_helper
+    pickler.dump(state)
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(temporary, path)
+    except OSError:
+        os.remove(temporary)
+        raise
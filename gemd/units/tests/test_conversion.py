@@ -0,0 +1,73 @@
+"""Tests of unit conversion."""
+import numpy as np
+import pytest
+
+from gemd.units.impl import _get_registry
+
+from gemd.entity.bounds import RealBounds
+from gemd.units import convert_units, convert_array, conversion_plan, \
+    IncompatibleUnitsError, UndefinedUnitError
+
+
+def test_convert_scalars():
+    """Test converting single magnitudes."""
+    assert convert_units(1.5, "kg", "g") == 1500.0
+    assert convert_units(3, "m", "m") == 3
+    assert convert_units(100, "degC", "degF") == pytest.approx(212)
+    errors = []
+    for _ in range(2):
+        with pytest.raises(IncompatibleUnitsError) as err:
+            convert_units(1, "kg", "m")
+        errors.append(err.value)
+    # Impossible conversions are remembered, but each raises an error of its own
+    assert errors[0] is not errors[1]
+    assert "'kg'" in str(errors[1]) and "'m'" in str(errors[1])
+    with pytest.raises(UndefinedUnitError, match="gibberish"):
+        convert_units(1, "kg", "gibberish")
+
+
+def test_conversion_plan():
+    """Test that conversions are described by a scale and an offset."""
+    assert conversion_plan("inch", "cm") == pytest.approx((2.54, 0))
+    scale, offset = conversion_plan("degC", "degF")
+    assert scale == pytest.approx(1.8)
+    assert offset == pytest.approx(32)
+    assert conversion_plan("degC", "degF") == (scale, offset)
+
+
+def test_exact_conversion():
+    """Test that plans agree with pint, without the rounding error of its arithmetic."""
+    assert conversion_plan("degC", "degF") == (1.8, 32.0)
+    assert conversion_plan("degF", "degC") == (5 / 9, -160 / 9)
+    assert conversion_plan("g / cm^3", "kg / m^3") == (1000.0, 0.0)
+    assert convert_units(100, "degC", "degF") == 212.0
+    assert convert_units(-40.0, "degF", "degC") == -40.0
+
+    registry = _get_registry()
+    for start, final in [("degC", "degF"), ("degF", "K"), ("kPa", "psi"), ("inch", "cm"),
+                         ("g / cm^3", "kg / m^3"), ("degR", "degC"), ("lb", "kg")]:
+        scale, offset = conversion_plan(start, final)
+        for value in [-40.0, 0.0, 1.0, 37.5, 1000.0]:
+            expected = registry.Quantity(value, start).to(final).magnitude
+            assert scale * value + offset == pytest.approx(expected, rel=1e-13, abs=1e-12)
+
+    # The same bounds in different units contain each other
+    celsius = RealBounds(0, 100, "degC")
+    fahrenheit = RealBounds(32, 212, "degF")
+    assert celsius.contains(fahrenheit) and fahrenheit.contains(celsius)
+
+
+def test_convert_array():
+    """Test that arrays convert the same as each of their elements."""
+    values = np.linspace(-50.0, 500.0, 101)
+    for start, final in [("degC", "degF"), ("K", "degC"), ("g / cm^3", "kg / m^3"),
+                         ("kPa", "psi"), ("degF", "degF")]:
+        expected = [convert_units(float(x), start, final) for x in values]
+        np.testing.assert_allclose(convert_array(values, start, final), expected, atol=1e-9)
+
+    # Differences, such as a standard deviation, only scale
+    np.testing.assert_allclose(convert_array([1, 2], "degC", "degF", difference=True),
+                               [1.8, 3.6])
+    np.testing.assert_allclose(convert_array([[1], [2]], "m", "mm"), [[1000], [2000]])
+    with pytest.raises(IncompatibleUnitsError):
+        convert_array(values, "kg", "m")
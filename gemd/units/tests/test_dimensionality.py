@@ -0,0 +1,43 @@
+"""Tests of the dimensionality of units."""
+import pytest
+
+from gemd.entity.bounds import CategoricalBounds, RealBounds
+from gemd.entity.template import ConditionTemplate, PropertyTemplate
+from gemd.units import dimensionality, DimensionalityIndex, UndefinedUnitError
+
+
+def test_dimensionality():
+    """Test that compatible units, and only they, have the same signature."""
+    assert dimensionality("g / cm^3") == (("[length]", -3), ("[mass]", 1))
+    assert dimensionality("g / cm^3") == dimensionality("kilogram / meter ** 3")
+    assert dimensionality("degC") == dimensionality("K") != dimensionality("kg")
+    assert dimensionality("") == dimensionality("dimensionless") == dimensionality("m / mm") == ()
+    assert dimensionality("m^0.5") == (("[length]", 0.5),)
+    with pytest.raises(UndefinedUnitError, match="gibberish") as first:
+        dimensionality("gibberish")
+    # Undefined units are remembered, but each call raises an error of its own
+    with pytest.raises(UndefinedUnitError) as second:
+        dimensionality("gibberish")
+    assert first.value is not second.value
+
+
+def test_index():
+    """Test finding the templates that values in some units could be converted into."""
+    density = PropertyTemplate("density", bounds=RealBounds(0, 10, "g/cm^3"))
+    mass_density = PropertyTemplate("mass density", bounds=RealBounds(0, 1e4, "kg/m^3"))
+    temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 1000, "K"))
+    fraction = PropertyTemplate("fraction", bounds=RealBounds(0, 1, ""))
+    color = PropertyTemplate("color", bounds=CategoricalBounds(["red"]))
+
+    index = DimensionalityIndex([density, temperature, fraction, color])
+    assert len(index) == 3
+    assert index.add(mass_density)
+    assert not index.add(color)
+    assert len(index) == 4
+
+    assert index.compatible("lb / ft^3") == [density, mass_density]
+    assert index.compatible("degF") == [temperature]
+    assert index.compatible("dimensionless") == [fraction]
+    assert index.compatible("m") == []
+    with pytest.raises(UndefinedUnitError):
+        index.compatible("gibberish")
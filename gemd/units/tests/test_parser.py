@@ -1,7 +1,10 @@
+import traceback
+
 import pytest
 import pkg_resources
 from pint import UnitRegistry
-from gemd.units import parse_units, UndefinedUnitError
+from gemd.units import parse_units, UndefinedUnitError, parse_units_cache_info, \
+    clear_parse_units_cache
 
 # use the default unit registry for now
 _ureg = UnitRegistry(filename=pkg_resources.resource_filename("gemd.units", "citrine_en.txt"))
@@ -36,3 +39,23 @@ def test_parse_unexpected():
 def test_parse_none():
     """Test that None parses as None."""
     assert parse_units(None) is None
+
+
+def test_parse_cache():
+    """Test that parsed units and parsing errors are memoized."""
+    clear_parse_units_cache()
+    assert parse_units("kg / m^3") == parse_units("kg / m^3")
+    errors = []
+    for _ in range(3):
+        with pytest.raises(UndefinedUnitError) as err:
+            parse_units("gibberish")
+        assert "gibberish" in str(err.value)
+        assert len(list(traceback.walk_tb(err.value.__traceback__))) <= 2
+        errors.append(err.value)
+    # each call raises an error of its own, rather than one that is memoized
+    assert len({id(error) for error in errors}) == 3
+
+    info = parse_units_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 2, 2)
+    clear_parse_units_cache()
+    assert parse_units_cache_info().currsize == 0
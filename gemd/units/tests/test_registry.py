@@ -0,0 +1,120 @@
+"""Tests of building the unit registry."""
+import os
+import pickle
+import tempfile
+
+import pytest
+
+import gemd.units.registry as registry
+from gemd.units import set_registry_cache_dir, parse_units, convert_units, \
+    change_definitions_file, dimensionality, parse_units_cache_info, UndefinedUnitError
+
+
+def test_lazy_registry():
+    """Test that there is one registry, which is used for parsing and converting."""
+    assert registry._get_registry() is registry._get_registry()
+    assert parse_units("degC") == "degree_Celsius"
+    assert convert_units(100, "degC", "degF") == convert_units(100, "degC", "degF")
+
+
+def test_registry_cache(caplog, monkeypatch):
+    """Test that a precompiled registry behaves the same as one built from definitions."""
+    built = registry._build_registry()
+    with tempfile.TemporaryDirectory() as directory:
+        cache_dir = os.path.join(directory, "cache")
+        registry._load_registry(cache_dir)
+        path = registry._cache_path(cache_dir)
+        assert os.path.exists(path)
+
+        cached = registry._load_registry(cache_dir)
+        for unit in ("g/cm^3", "degF", "inch", "kPa", "mol / L", "kWh"):
+            assert str(cached(unit).units) == str(built(unit).units)
+            assert cached.Quantity(3, unit).to_base_units() == \
+                built.Quantity(3, unit).to_base_units()
+        assert cached.Quantity(100, "degC").to("degF").magnitude == \
+            built.Quantity(100, "degC").to("degF").magnitude
+        assert set(cached._contexts) == set(built._contexts)
+        assert cached.Quantity(500, "nm").to("THz", "sp") == \
+            built.Quantity(500, "nm").to("THz", "sp")
+        assert cached.get_system("cgs").base_units == built.get_system("cgs").base_units
+
+        # A corrupt cache is replaced
+        with open(path, "wb") as f:
+            f.write(b"not a pickle")
+        assert str(registry._load_registry(cache_dir)("kg").units) == "kilogram"
+        assert "Rebuilding" in caplog.text
+        assert registry._load_registry(cache_dir)._contexts
+
+        # A cache that other users could have written isn't unpickled
+        os.chmod(path, 0o666)
+        monkeypatch.setattr(pickle, "load", lambda f: pytest.fail("Unpickled a shared cache"))
+        assert str(registry._load_registry(cache_dir)("kg").units) == "kilogram"
+        assert "Ignoring" in caplog.text
+        os.chmod(path, 0o600)
+        os.chmod(cache_dir, 0o777)
+        assert str(registry._load_registry(cache_dir)("kg").units) == "kilogram"
+        monkeypatch.undo()
+
+        # A version of pint whose internals differ still builds the registry
+        def missing(*args):
+            raise AttributeError("'UnitRegistry' object has no attribute '_units_casei'")
+
+        other = os.path.join(directory, "pint")
+        monkeypatch.setattr(registry, "_registry_state", missing)
+        assert str(registry._load_registry(other)("kg").units) == "kilogram"
+        assert "_units_casei" in caplog.text
+        monkeypatch.undo()
+
+        # A cache that can't be written doesn't stop the registry from being built
+        blocked = os.path.join(directory, "file")
+        with open(blocked, "w") as f:
+            f.write("A file, not a directory")
+        assert str(registry._load_registry(blocked)("kg").units) == "kilogram"
+        assert "Could not write" in caplog.text
+
+        # Nor does failing to move it into place, which leaves nothing behind
+        def fail(*args):
+            raise OSError("No space left on device")
+
+        other = os.path.join(directory, "other")
+        monkeypatch.setattr(os, "replace", fail)
+        assert str(registry._load_registry(other)("kg").units) == "kilogram"
+        assert os.listdir(other) == []
+
+
+def test_set_cache_dir(monkeypatch):
+    """Test that the cache directory is used when the registry is built."""
+    monkeypatch.setattr(registry, "_registry", None)
+    with tempfile.TemporaryDirectory() as directory:
+        set_registry_cache_dir(directory)
+        try:
+            assert registry._get_registry() is registry._get_registry()
+            assert os.listdir(directory)
+        finally:
+            set_registry_cache_dir(None)
+
+
+def test_change_definitions_file():
+    """Test that changing the definition file forgets what was parsed with the old one."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "units.txt")
+        with open(path, "w") as f:
+            f.write("@import {}\nblorp = 3 * meter\n".format(
+                registry._definition_path("citrine_en.txt")))
+        with pytest.raises(UndefinedUnitError):
+            parse_units("blorp")
+        with pytest.raises(UndefinedUnitError):
+            dimensionality("blorp")
+        assert convert_units(1, "km", "m") == 1000
+
+        change_definitions_file(path)
+        try:
+            assert parse_units_cache_info().currsize == 0
+            assert parse_units("blorp") == "blorp"
+            assert dimensionality("blorp") == dimensionality("m")
+            assert convert_units(1, "blorp", "m") == pytest.approx(3)
+        finally:
+            change_definitions_file()
+        with pytest.raises(UndefinedUnitError):
+            parse_units("blorp")
+        assert registry._definitions_file is None
@@ -40,6 +40,16 @@ def _substitute(thing,
     """
     if visited is None:
         visited = {}
+    if isinstance(thing, LinkByUID):
+        # Links equal to each other can differ in the case of their scopes, so they aren't
+        # looked up among the visited objects. They are immutable and contain no other
+        # objects, so one that isn't substituted is shared.
+        if not applies(thing):
+            return thing
+        replacement = sub(thing)
+        if replacement is thing:
+            return thing
+        return _substitute(replacement, sub, applies, visited)
     if thing.__hash__ is not None and thing in visited:
         return visited[thing]
     if applies(thing):
@@ -101,11 +111,11 @@ def substitute_objects(obj, index):
     :param index: containing the objects that the uids point to
     """
     return _substitute(obj,
-                       sub=lambda l: index.get((l.scope.lower(), l.id), l),
+                       sub=lambda l: index.get(l.key, l),
                        applies=lambda o: isinstance(o, LinkByUID))
 
 
-def flatten(obj):
+def flatten(obj, exclude=None):
     """
     Flatten a BaseEntity into a list of objects connected by LinkByUID objects.
 
@@ -120,6 +130,8 @@ def flatten(obj):
     This supports the flattening of entire material histories.
 
     :param obj: defining the scope of the flatten
+    :param exclude: predicate for entities to leave out of the result, such as those that are
+        kept elsewhere; their contents are still flattened (default: None)
     :return: a list of BaseEntity with LinkByUIDs to any BaseEntity members
     """
     # The ids should be set in the actual object so they are consistent
@@ -137,7 +149,8 @@ def flatten(obj):
         uids = list(base_obj.uids.items())
 
         # if none of the uids are known, then its a new object and we should return it
-        if not any(uid in known_uids for uid in uids):
+        if not any(uid in known_uids for uid in uids) \
+                and (exclude is None or not exclude(base_obj)):
             to_return = [base_obj]
 
         # add all of the uids of this object into the known uid list
@@ -181,7 +194,7 @@ def recursive_foreach(obj, func, apply_first=False, seen=None):
     elif isinstance(obj, dict):
         for x in concatv(obj.keys(), obj.values()):
             recursive_foreach(x, func, apply_first, seen)
-    elif isinstance(obj, DictSerializable):
+    elif isinstance(obj, DictSerializable) and not isinstance(obj, LinkByUID):
         for k, x in obj.__dict__.items():
             recursive_foreach(x, func, apply_first, seen)
 
@@ -225,7 +238,7 @@ def recursive_flatmap(obj, func, seen=None, unidirectional=True):
                 res.extend(func(x))
             else:
                 res.extend(recursive_flatmap(x, func, seen, unidirectional))
-    elif isinstance(obj, DictSerializable):
+    elif isinstance(obj, DictSerializable) and not isinstance(obj, LinkByUID):
         for k, x in sorted(obj.__dict__.items()):
             if unidirectional and isinstance(obj, BaseEntity) and k in obj.skip:
                 continue
@@ -0,0 +1,5 @@
+"""Validation of GEMD objects against their templates."""
+# flake8: noqa
+from .report import Violation, ValidationReport
+from .values import validate_values
+from .conformance import check_conformance
@@ -0,0 +1,119 @@
+"""Checking that objects only use what their templates allow."""
+from gemd.entity.attribute.property_and_conditions import PropertyAndConditions
+from gemd.entity.base_entity import BaseEntity
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import IngredientRun, IngredientSpec
+from gemd.entity.object.base_object import BaseObject
+from gemd.entity.template.base_template import BaseTemplate
+from gemd.entity.template.process_template import ProcessTemplate
+from gemd.util import recursive_foreach
+from gemd.entity.template_lookup import template_keys, template_tables
+from gemd.validation.report import Violation, ValidationReport
+
+_KIND_NAMES = {"properties": "Property", "conditions": "Condition", "parameters": "Parameter"}
+
+
+def check_conformance(obj):
+    """
+    Check that every object in a history only uses what its template allows.
+
+    An attribute with a template conforms if the template of its object lists that attribute
+    template among the templates for its kind of attribute. The attribute templates of
+    process templates are conditions and parameters, of measurement templates properties,
+    conditions and parameters, and of material templates properties. The conditions of a
+    material spec's properties aren't constrained by its template.
+
+    An ingredient conforms if its name is among the `allowed_names` and each of its labels is
+    among the `allowed_labels` of the template of its process, where those are given.
+
+    The graph is walked once, and the allowed attribute templates of each object template are
+    looked up in a table that is built the first time the object template is seen. Objects
+    whose templates are links are checked against the template with that unique identifier,
+    if it is in the graph. Attributes without templates, and objects whose templates can't be
+    found, can't be checked.
+
+    Parameters
+    ----------
+    obj: BaseEntity or List[BaseEntity]
+        The objects to check, along with every object reachable from them.
+
+    Returns
+    -------
+    ValidationReport
+        A violation for each attribute or ingredient that its template doesn't allow.
+
+    """
+    entities = []
+    _collect(obj, entities)
+
+    templates = {}
+    for entity in entities:
+        if isinstance(entity, BaseTemplate):
+            for scope, uid in entity.uids.items():
+                templates[(scope.lower(), uid)] = entity
+
+    report = ValidationReport()
+    cache = {}
+    for entity in entities:
+        if isinstance(entity, (IngredientSpec, IngredientRun)):
+            process = entity.process
+            object_template = _resolve(getattr(process, "template", None), templates)
+            if isinstance(object_template, ProcessTemplate):
+                report.extend(_check_ingredient(entity, object_template))
+        elif isinstance(entity, BaseObject):
+            object_template = _resolve(getattr(entity, "template", None), templates)
+            tables = template_tables(object_template, cache)
+            for kind, table in tables.items():
+                for attribute in getattr(entity, kind, None) or ():
+                    if isinstance(attribute, PropertyAndConditions):
+                        attribute = attribute.property
+                    if attribute.template is None:
+                        continue
+                    if not any(key in table for key in template_keys(attribute.template)):
+                        message = "{} template {} is not allowed by {} '{}'".format(
+                            _KIND_NAMES[kind], _describe(attribute.template),
+                            type(object_template).__name__, object_template.name)
+                        report.append(Violation(message, entity, attribute))
+    return report
+
+
+def _collect(obj, entities):
+    """Gather every entity reachable from the objects to check."""
+    items = obj if isinstance(obj, (list, tuple)) else [obj]
+    for item in items:
+        if not isinstance(item, BaseEntity):
+            raise TypeError(
+                "Can only check the conformance of entities, not {}".format(type(item)))
+    recursive_foreach(list(items), entities.append)
+
+
+def _resolve(template, templates):
+    """Replace a link to a template with the template, if it is known."""
+    if isinstance(template, LinkByUID):
+        return templates.get(template.key, template)
+    return template
+
+
+def _describe(template):
+    """Describe an attribute template, or a link to one, for a message."""
+    if isinstance(template, LinkByUID):
+        return "with {} '{}'".format(template.scope, template.id)
+    return "'{}'".format(template.name)
+
+
+def _check_ingredient(ingredient, process_template):
+    """Check the name and labels of an ingredient against the template of its process."""
+    violations = []
+    allowed_names = process_template.allowed_names
+    if allowed_names is not None and ingredient.name not in allowed_names:
+        message = "Name '{}' is not allowed by {} '{}'".format(
+            ingredient.name, type(process_template).__name__, process_template.name)
+        violations.append(Violation(message, ingredient))
+    allowed_labels = process_template.allowed_labels
+    if allowed_labels is not None:
+        extra = set(ingredient.labels or ()) - set(allowed_labels)
+        if extra:
+            message = "Labels {} are not allowed by {} '{}'".format(
+                sorted(extra), type(process_template).__name__, process_template.name)
+            violations.append(Violation(message, ingredient))
+    return violations
@@ -0,0 +1,48 @@
+"""Reports of the problems found by validation."""
+
+
+class Violation(object):
+    """
+    A single problem found while validating.
+
+    Parameters
+    ----------
+    message: str
+        A description of the problem.
+    entity: BaseEntity, optional
+        The object or template with the problem, if known.
+    attribute: BaseAttribute, optional
+        The attribute with the problem, if the problem is with an attribute.
+    bounds: BaseBounds, optional
+        The bounds the attribute was checked against, if any.
+
+    """
+
+    def __init__(self, message, entity=None, attribute=None, bounds=None):
+        self.message = message
+        self.entity = entity
+        self.attribute = attribute
+        self.bounds = bounds
+
+    def __repr__(self):
+        parts = []
+        if self.entity is not None:
+            parts.append("{} '{}'".format(type(self.entity).__name__, self.entity.name))
+        if self.attribute is not None:
+            parts.append("{} '{}'".format(type(self.attribute).__name__, self.attribute.name))
+        return "<Violation {}: {}>".format(", ".join(parts) or "-", self.message)
+
+
+class ValidationReport(list):
+    """A list of every :class:`Violation` found by a validation, which is empty if it passed."""
+
+    @property
+    def valid(self):
+        """Whether nothing was found to be wrong."""
+        return len(self) == 0
+
+    def __str__(self):
+        if self.valid:
+            return "No violations"
+        return "{} violation{}:\n{}".format(
+            len(self), "" if len(self) == 1 else "s", "\n".join(repr(v) for v in self))
@@ -0,0 +1,98 @@
+"""Tests of checking that objects only use what their templates allow."""
+import pytest
+
+from gemd.demo.cake import make_cake
+from gemd.entity.attribute import Condition, Parameter, Property, PropertyAndConditions
+from gemd.entity.bounds import RealBounds
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import IngredientRun, IngredientSpec, MaterialRun, MaterialSpec, \
+    MeasurementRun, MeasurementSpec, ProcessRun, ProcessSpec
+from gemd.entity.template import ConditionTemplate, MaterialTemplate, MeasurementTemplate, \
+    ParameterTemplate, ProcessTemplate, PropertyTemplate
+from gemd.entity.value import NominalReal
+from gemd.validation import check_conformance
+import gemd.validation.conformance as conformance
+
+
+def _history():
+    """Build a small history, with an attribute template that isn't allowed for each kind."""
+    bounds = RealBounds(0, 100, "")
+    temperature = ConditionTemplate("temperature", bounds=bounds, uids={"id": "temperature"})
+    pressure = ConditionTemplate("pressure", bounds=bounds, uids={"id": "pressure"})
+    speed = ParameterTemplate("speed", bounds=bounds, uids={"id": "speed"})
+    mass = PropertyTemplate("mass", bounds=bounds, uids={"id": "mass"})
+    volume = PropertyTemplate("volume", bounds=bounds, uids={"id": "volume"})
+
+    process_template = ProcessTemplate("mixing", conditions=[temperature],
+                                       parameters=[[LinkByUID("ID", "speed"), bounds]],
+                                       allowed_names=["flour"], allowed_labels=["dry"],
+                                       uids={"id": "mixing"})
+    process = ProcessRun("mix", spec=ProcessSpec("mix", template=process_template))
+    process.spec.conditions = [Condition("T", value=NominalReal(1, ""), template=temperature),
+                               Condition("P", value=NominalReal(1, ""), template=pressure)]
+    process.parameters = [Parameter("v", value=NominalReal(1, ""), template=speed),
+                          Parameter("linked", value=NominalReal(1, ""),
+                                    template=LinkByUID("id", "temperature")),
+                          Parameter("free", value=NominalReal(1, ""))]
+
+    material = MaterialRun("batter", process=process, spec=MaterialSpec(
+        "batter", process=process.spec,
+        template=MaterialTemplate("batter", properties=[mass], uids={"id": "batter"})))
+    material.spec.properties = [
+        PropertyAndConditions(Property("m", value=NominalReal(1, ""), template=mass),
+                              [Condition("P", value=NominalReal(1, ""), template=pressure)]),
+        PropertyAndConditions(Property("V", value=NominalReal(1, ""), template=volume))]
+
+    measurement = MeasurementRun("weighing", material=material, spec=MeasurementSpec(
+        "weighing", template=MeasurementTemplate("weighing", properties=[mass],
+                                                 uids={"id": "weighing"})))
+    measurement.properties = [Property("m", value=NominalReal(1, ""), template=mass),
+                              Property("V", value=NominalReal(1, ""), template=volume)]
+
+    flour = IngredientSpec(name="flour", labels=["dry"], process=process.spec)
+    IngredientRun(spec=flour, process=process)
+    IngredientSpec(name="eggs", labels=["dry", "wet"], process=process.spec)
+    return material
+
+
+def test_conformance():
+    """Test that every attribute and ingredient that isn't allowed is found in one pass."""
+    report = check_conformance(_history())
+    found = sorted((type(v.entity).__name__, v.attribute.name if v.attribute else None)
+                   for v in report)
+    assert found == [("IngredientSpec", None), ("IngredientSpec", None),
+                     ("MaterialSpec", "V"), ("MeasurementRun", "V"),
+                     ("ProcessRun", "linked"), ("ProcessSpec", "P")]
+    messages = [v.message for v in report]
+    assert "Parameter template with id 'temperature' is not allowed by " \
+           "ProcessTemplate 'mixing'" in messages
+    assert "Name 'eggs' is not allowed by ProcessTemplate 'mixing'" in messages
+    assert "Labels ['wet'] are not allowed by ProcessTemplate 'mixing'" in messages
+
+    # The demo cake uses a few attribute templates that its object templates don't list
+    cake = check_conformance(make_cake(seed=42))
+    assert sorted(v.attribute.template.name for v in cake) == \
+        ["Cooking time", "Cooking time", "Molecular Structure"]
+    with pytest.raises(TypeError):
+        check_conformance(["not an entity"])
+
+
+def test_linked_templates(monkeypatch):
+    """Test that templates that are links are found in the graph, and looked up once."""
+    material = _history()
+    process_template = material.process.template
+    material.process.spec.template = LinkByUID("id", "mixing")
+    # Templates that aren't reachable can't be checked
+    assert len(check_conformance(material)) == 2
+
+    built = []
+    original = conformance.template_tables
+
+    def counting(object_template, cache):
+        if id(object_template) not in cache:
+            built.append(object_template)
+        return original(object_template, cache)
+
+    monkeypatch.setattr(conformance, "template_tables", counting)
+    assert len(check_conformance([material, process_template])) == 6
+    assert sorted(t.name for t in built if t is not None) == ["batter", "mixing", "weighing"]
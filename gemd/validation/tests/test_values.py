@@ -0,0 +1,118 @@
+"""Tests of checking values against the bounds of their templates."""
+import pytest
+
+from gemd.demo.cake import make_cake
+from gemd.entity.attribute import Condition, Parameter, Property, PropertyAndConditions
+from gemd.entity.bounds import CategoricalBounds, CompositionBounds, IntegerBounds, \
+    MolecularStructureBounds, RealBounds
+from gemd.entity.link_by_uid import LinkByUID
+from gemd.entity.object import MaterialSpec, MeasurementRun, MeasurementSpec, ProcessRun, \
+    ProcessSpec
+from gemd.entity.template import ConditionTemplate, MaterialTemplate, \
+    ParameterTemplate, ProcessTemplate, PropertyTemplate
+from gemd.entity.value import NominalReal, NormalReal, UniformReal, NominalInteger, \
+    UniformInteger, NominalCategorical, DiscreteCategorical, NominalComposition, \
+    EmpiricalFormula, Smiles
+from gemd.validation import validate_values, ValidationReport, Violation
+
+
+def test_real_values():
+    """Test that real values are checked in the units of their bounds."""
+    temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 100, "degC"))
+    values = [NominalReal(50, "degC"), NominalReal(150, "degC"), NominalReal(212, "degF"),
+              NominalReal(213, "degF"), NormalReal(273.15, 10, "K"), UniformReal(-1, 5, "degC"),
+              UniformReal(0, 1, "m")]
+    conditions = [Condition("T{}".format(i), value=value, template=temperature)
+                  for i, value in enumerate(values)]
+    report = validate_values(conditions)
+    assert {violation.attribute.name for violation in report} == {"T1", "T3", "T5", "T6"}
+    assert all(violation.bounds is temperature.bounds for violation in report)
+    assert not report.valid
+    assert "4 violations" in str(report)
+    assert "incompatible" in next(v.message for v in report if v.attribute.name == "T6")
+
+
+def test_other_values():
+    """Test checking integer, categorical, composition and molecular values."""
+    count = ParameterTemplate("count", bounds=IntegerBounds(1, 10))
+    color = PropertyTemplate("color", bounds=CategoricalBounds(["red", "blue"]))
+    makeup = PropertyTemplate("makeup", bounds=CompositionBounds(["C", "H", "water"]))
+    molecule = PropertyTemplate("molecule", bounds=MolecularStructureBounds())
+    attributes = {
+        "good int": Parameter("count", value=NominalInteger(5), template=count),
+        "bad int": Parameter("count", value=NominalInteger(11), template=count),
+        "bad range": Parameter("count", value=UniformInteger(0, 5), template=count),
+        "good category": Property("color", value=NominalCategorical("red"), template=color),
+        "bad category": Property("color", value=NominalCategorical("green"), template=color),
+        "good distribution": Property("color", template=color, value=DiscreteCategorical(
+            {"red": 0.5, "blue": 0.5, "green": 0.0})),
+        "bad distribution": Property("color", template=color, value=DiscreteCategorical(
+            {"red": 0.5, "green": 0.5})),
+        "good composition": Property("makeup", template=makeup,
+                                     value=NominalComposition({"water": 1})),
+        "bad composition": Property("makeup", template=makeup,
+                                    value=NominalComposition({"salt": 1})),
+        "good formula": Property("makeup", value=EmpiricalFormula("CH4"), template=makeup),
+        "bad formula": Property("makeup", value=EmpiricalFormula("NaCl"), template=makeup),
+        "molecule": Property("molecule", value=Smiles("CC"), template=molecule),
+        "mismatch": Property("color", value=NominalInteger(1), template=color),
+        "molecular mismatch": Property("molecule", value=NominalInteger(1), template=molecule),
+        "integer mismatch": Parameter("count", value=NominalCategorical("1"), template=count),
+        "composition mismatch": Property("makeup", value=NominalInteger(1), template=makeup),
+        "string": Property("color", value="red", template=color),
+        "no template": Property("color", value=NominalCategorical("green")),
+        "no value": Property("color", template=color),
+    }
+    report = validate_values(list(attributes.values()))
+    bad = {name for name, attribute in attributes.items()
+           if any(violation.attribute is attribute for violation in report)}
+    assert bad == {"bad int", "bad range", "bad category", "bad distribution",
+                   "bad composition", "bad formula", "mismatch", "molecular mismatch",
+                   "integer mismatch", "composition mismatch", "string"}
+
+
+def test_object_templates():
+    """Test that the bounds narrowed by object templates are used for objects in a graph."""
+    temperature = ConditionTemplate("temperature", bounds=RealBounds(0, 1000, "K"),
+                                    uids={"id": "temperature"})
+    speed = ParameterTemplate("speed", bounds=RealBounds(0, 100, "m/s"))
+    process_template = ProcessTemplate(
+        "process", conditions=[[LinkByUID("id", "temperature"), RealBounds(0, 500, "K")]],
+        parameters=[[speed, RealBounds(0, 10, "m/s")]])
+    process = ProcessRun("process", spec=ProcessSpec("process", template=process_template))
+    process.conditions = [Condition("hot", value=NominalReal(600, "K"), template=temperature),
+                          Condition("link", value=NominalReal(700, "K"),
+                                    template=LinkByUID("ID", "temperature"))]
+    process.parameters = [Parameter("fast", value=NominalReal(20, "m/s"), template=speed)]
+
+    # Links to templates can only be checked through the object template
+    unknown = Condition("unknown", value=NominalReal(2000, "K"), template=LinkByUID("id", "x"))
+    measurement = MeasurementRun("measurement", spec=MeasurementSpec(
+        "spec", template=LinkByUID("id", "measurement template")))
+    measurement.conditions = [unknown]
+
+    density = PropertyTemplate("density", bounds=RealBounds(0, 10, "g/cm^3"))
+    material = MaterialSpec("material", process=process.spec, template=MaterialTemplate(
+        "material", properties=[[density, RealBounds(0, 5, "g/cm^3")]]))
+    material.properties = [PropertyAndConditions(
+        property=Property("density", value=NominalReal(6, "g/cm^3"), template=density),
+        conditions=[Condition("cold", value=NominalReal(-1, "K"), template=temperature)])]
+
+    report = validate_values([process, measurement, material])
+    assert {v.attribute.name for v in report} == {"hot", "link", "fast", "density", "cold"}
+    assert next(v for v in report if v.attribute.name == "cold").entity is material
+    assert validate_values(make_cake(seed=42)).valid
+
+    with pytest.raises(TypeError):
+        validate_values("not an entity")
+
+
+def test_report():
+    """Test the description of reports and violations."""
+    assert str(ValidationReport()) == "No violations"
+    color = PropertyTemplate("color", bounds=CategoricalBounds(["red"]))
+    report = validate_values(Property("color", value=NominalCategorical("blue"), template=color))
+    assert str(report).startswith("1 violation:")
+    assert "Property 'color'" in repr(report[0])
+    assert repr(Violation("A problem")) == "<Violation -: A problem>"
+    assert "MaterialSpec 'x'" in repr(Violation("A problem", entity=MaterialSpec("x")))
@@ -0,0 +1,219 @@
+"""Checking that attribute values lie within the bounds of their templates."""
+import re
+
+import numpy as np
+
+from gemd.entity.attribute.base_attribute import BaseAttribute
+from gemd.entity.attribute.property_and_conditions import PropertyAndConditions
+from gemd.entity.base_entity import BaseEntity
+from gemd.entity.bounds import CategoricalBounds, CompositionBounds, IntegerBounds, \
+    MolecularStructureBounds, RealBounds
+from gemd.entity.object.base_object import BaseObject
+from gemd.entity.template.attribute_template import AttributeTemplate
+from gemd.entity.value import NominalReal, NormalReal, UniformReal, NominalInteger, \
+    UniformInteger, NominalCategorical, DiscreteCategorical, NominalComposition, \
+    EmpiricalFormula
+from gemd.entity.value.molecular_value import MolecularValue
+from gemd.units import IncompatibleUnitsError, conversion_plan
+from gemd.util import recursive_foreach
+from gemd.entity.template_lookup import ATTRIBUTE_KINDS, template_keys, template_tables
+from gemd.validation.report import Violation, ValidationReport
+
+# Relative tolerance for real values at an endpoint, to allow for rounding in unit conversion
+_TOLERANCE = 1e-9
+
+_ELEMENT = re.compile("[A-Z][a-z]?")
+
+
+def validate_values(obj):
+    """
+    Check that attribute values lie within the bounds of their templates.
+
+    Every attribute with both a value and a template is checked. If the attribute belongs to an
+    object whose template narrows the bounds of the attribute template, the narrower bounds
+    are used. Attributes whose templates are only links can only be checked if the object
+    template provides bounds for them.
+
+    Real values are checked together for each combination of bounds and units, with one unit
+    conversion for the whole group. A nominal or normal value is in bounds if its nominal
+    value or mean is, and a uniform value if both of its endpoints are.
+
+    Parameters
+    ----------
+    obj: BaseEntity, BaseAttribute or List[BaseEntity or BaseAttribute]
+        The attributes to check, or objects whose histories include the attributes to check.
+        For objects, the attributes of every object reachable from them are checked.
+
+    Returns
+    -------
+    ValidationReport
+        A violation for each value that is out of bounds or can't be compared to its bounds.
+
+    """
+    checks = []
+    _collect(obj, checks)
+
+    report = ValidationReport()
+    real_groups = {}
+    for entity, attribute, bounds in checks:
+        value = attribute.value
+        if isinstance(value, (NominalReal, NormalReal, UniformReal)) \
+                and isinstance(bounds, RealBounds):
+            real_groups.setdefault((id(bounds), value.units), []).append(
+                (entity, attribute, bounds))
+        else:
+            message = _check_value(value, bounds)
+            if message is not None:
+                report.append(Violation(message, entity, attribute, bounds))
+
+    for (_, units), group in real_groups.items():
+        report.extend(_check_reals(group, units))
+    return report
+
+
+def _collect(obj, checks):
+    """Gather the (entity, attribute, bounds) triples to check."""
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            _collect(item, checks)
+    elif isinstance(obj, (BaseAttribute, PropertyAndConditions)):
+        _collect_attribute(None, obj, {}, checks)
+    elif isinstance(obj, BaseEntity):
+        cache = {}
+
+        def collect_entity(entity):
+            if not isinstance(entity, BaseObject):
+                return
+            lookup = template_tables(getattr(entity, "template", None), cache)
+            for kind in ATTRIBUTE_KINDS:
+                for attribute in getattr(entity, kind, None) or ():
+                    _collect_attribute(entity, attribute, lookup.get(kind, {}), checks)
+
+        recursive_foreach(obj, collect_entity)
+    else:
+        raise TypeError("Can only validate entities and attributes, not {}".format(type(obj)))
+
+
+def _collect_attribute(entity, attribute, lookup, checks):
+    """Gather the check of one attribute, and of the conditions of a property-and-conditions."""
+    if isinstance(attribute, PropertyAndConditions):
+        for condition in attribute.conditions:
+            _collect_attribute(entity, condition, {}, checks)
+        attribute = attribute.property
+    template = attribute.template
+    if attribute.value is None or template is None:
+        return
+    bounds = next((lookup[key] for key in template_keys(template) if key in lookup), None)
+    if bounds is None and isinstance(template, AttributeTemplate):
+        bounds = template.bounds
+    if bounds is not None:
+        checks.append((entity, attribute, bounds))
+
+
+def _check_reals(group, units):
+    """Check a group of real values that share bounds and units."""
+    bounds = group[0][2]
+    try:
+        scale, offset = conversion_plan(units, bounds.default_units)
+    except IncompatibleUnitsError:
+        message = "Units '{}' are incompatible with bounds in '{}'".format(
+            units, bounds.default_units)
+        return [Violation(message, entity, attribute, bounds)
+                for entity, attribute, bounds in group]
+
+    lows, highs = [], []
+    for _, attribute, _ in group:
+        value = attribute.value
+        if isinstance(value, NominalReal):
+            lows.append(value.nominal)
+            highs.append(value.nominal)
+        elif isinstance(value, NormalReal):
+            lows.append(value.mean)
+            highs.append(value.mean)
+        else:
+            lows.append(value.lower_bound)
+            highs.append(value.upper_bound)
+
+    lows = np.multiply(lows, scale, dtype=np.float64) + offset
+    highs = np.multiply(highs, scale, dtype=np.float64) + offset
+    outside = np.flatnonzero(outside_real_bounds(lows, highs, bounds)).tolist()
+
+    violations = []
+    for i in outside:
+        entity, attribute, _ = group[i]
+        message = "Value from {} to {} {} is outside of [{}, {}] {}".format(
+            lows[i], highs[i], bounds.default_units,
+            bounds.lower_bound, bounds.upper_bound, bounds.default_units)
+        violations.append(Violation(message, entity, attribute, bounds))
+    return violations
+
+
+def outside_real_bounds(lows, highs, bounds):
+    """
+    Find which ranges of real values extend outside of real bounds.
+
+    The bounds are widened by a relative tolerance, so that values at an endpoint stay inside
+    of it after a unit conversion. NaNs are never outside.
+
+    Parameters
+    ----------
+    lows: numpy.ndarray
+        The lower end of each range, in the units of the bounds.
+    highs: numpy.ndarray
+        The upper end of each range, in the units of the bounds.
+    bounds: RealBounds
+        The bounds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Whether each range is outside of the bounds, as booleans.
+
+    """
+    tolerance = _TOLERANCE * max(abs(bounds.lower_bound), abs(bounds.upper_bound), 1.0)
+    return (lows < bounds.lower_bound - tolerance) | (highs > bounds.upper_bound + tolerance)
+
+
+def _check_value(value, bounds):
+    """Check a value that isn't real; return a description of the problem, or None."""
+    if isinstance(bounds, IntegerBounds):
+        if isinstance(value, NominalInteger):
+            low = high = value.nominal
+        elif isinstance(value, UniformInteger):
+            low, high = value.lower_bound, value.upper_bound
+        else:
+            low = None
+        if low is not None:
+            if low < bounds.lower_bound or high > bounds.upper_bound:
+                return "Value from {} to {} is outside of [{}, {}]".format(
+                    low, high, bounds.lower_bound, bounds.upper_bound)
+            return None
+    elif isinstance(bounds, CategoricalBounds):
+        if isinstance(value, NominalCategorical):
+            categories = {value.category}
+        elif isinstance(value, DiscreteCategorical):
+            categories = {c for c, p in (value.probabilities or {}).items() if p > 0}
+        else:
+            categories = None
+        if categories is not None:
+            extra = categories - bounds.categories
+            if extra:
+                return "Categories {} are not allowed".format(sorted(extra))
+            return None
+    elif isinstance(bounds, CompositionBounds):
+        if isinstance(value, NominalComposition):
+            components = set(value.quantities)
+        elif isinstance(value, EmpiricalFormula):
+            components = set(_ELEMENT.findall(value.formula or ""))
+        else:
+            components = None
+        if components is not None:
+            extra = components - bounds.components
+            if extra:
+                return "Components {} are not allowed".format(sorted(extra))
+            return None
+    elif isinstance(bounds, MolecularStructureBounds):
+        if isinstance(value, MolecularValue):
+            return None
+    return "A {} can't be checked against {}".format(
+        type(value).__name__, type(bounds).__name__)
@@ -36,7 +36,7 @@ class PostDevelopCommand(develop):
 
 
 setup(name='gemd',
-      version='0.7.3',
+      version='0.8.0',
       url='http://github.com/CitrineInformatics/gemd-python',
       description="Python binding for Citrine's GEMD data model",
       author='Max Hutchinson',
@@ -56,6 +56,7 @@ setup(name='gemd',
           "pytest>=4.3",
           "enum34",
           "pint>=0.9",
+          "numpy>=1.13",
           "strip-hints>=0.1.5",
           "deprecation>=2.0.7,<3"
       ],